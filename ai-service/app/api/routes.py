@@ -3,11 +3,42 @@ FastAPI AI Service Routes
 Handles all API endpoints for scoring, batch scoring, and health checks
 """
 
-from fastapi import APIRouter, HTTPException
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-from app.schemas import ScoreRequest, ScoreResponse, HealthResponse
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from app.schemas import (
+    ScoreRequest,
+    ScoreResponse,
+    HealthResponse,
+    ReadinessResponse,
+    ProfileRequest,
+    ProfileResponse,
+    IndexDocumentRequest,
+    IndexDocumentResponse,
+    SearchRequest,
+    SearchResponse,
+)
 from app.core import ScoringEngine, get_cache
-from app.core.batch import BatchScoreRequest, score_batch
+from app.core.batch import (
+    BatchScoreRequest,
+    RankRequest,
+    RankResponse,
+    rank_candidates,
+    resolve_profiles,
+    score_batch,
+    stream_batch,
+)
+from app.core.batch_jobs import BatchJobCreated, BatchJobStatus, get_job_manager
+from app.core.embedding_store import get_embedding_store
+from app.core.profiles import DocumentProfile, ProfileNotFoundError, get_profile_store
+from app.core.resilience import CircuitOpenError
+from app.core.result_cache import get_experience_cache
+from app.core.score_cache import (
+    etag_matches, get_score_cache, is_cacheable, make_entry, normalize_text, score_cache_key
+)
+from app.core.vector_index import get_vector_index
+from app.core.warmup import get_warm_up
+from typing import AsyncIterator, Dict, List, Literal, Optional
+import json
 import logging
 import time
 
@@ -37,8 +68,74 @@ async def health_check():
     }
 
 
+@router.get("/health/live", response_model=HealthResponse)
+async def liveness():
+    """
+    Liveness probe
+    The process is up and serving requests - restart only if this fails
+    """
+    return {
+        "status": "alive",
+        "version": "1.0.0",
+        "service": "Match-Line AI Service",
+    }
+
+
+@router.get("/health/ready", response_model=ReadinessResponse)
+async def readiness(response: Response):
+    """
+    Readiness probe
+    200 once providers, models and caches are warm; 503 (with per-component
+    state) while the background warm-up is still running or retrying
+    """
+    warm_up = get_warm_up()
+    state = warm_up.status()
+    ready = state.pop("ready") and scoring_engine is not None
+    if not ready:
+        response.status_code = 503
+    return {
+        "status": "ready" if ready else "starting",
+        "version": "1.0.0",
+        "service": "Match-Line AI Service",
+        **state,
+    }
+
+
+def _score_response(entry: Dict[str, str], if_none_match: Optional[str], cache_status: str) -> Response:
+    """Cached or fresh /score body with its ETag - 304 without a body if the client has it"""
+    headers = {"ETag": entry["etag"], "X-Cache": cache_status}
+    if etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+def _registered(ids: List[str], kind: str) -> List[DocumentProfile]:
+    """Registered profiles for ids - 404 if one is unknown"""
+    try:
+        return get_profile_store().get_many(ids, kind)
+    except ProfileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+def _profile_response(profile: DocumentProfile, changed: Optional[bool] = None) -> ProfileResponse:
+    return ProfileResponse(
+        id=profile.id,
+        kind=profile.kind,
+        content_hash=profile.content_hash,
+        skills=sorted(profile.skills),
+        keywords=sorted(profile.keywords),
+        embedding_model=profile.embedding_model,
+        registered_at=profile.registered_at,
+        changed=changed,
+    )
+
+
 @router.post("/score", response_model=ScoreResponse)
-async def score_match(request: ScoreRequest) -> ScoreResponse:
+async def score_match(
+    request: ScoreRequest,
+    if_none_match: Optional[str] = Header(None),
+    cache_control: Optional[str] = Header(None),
+) -> ScoreResponse:
     """
     Score a resume against a job description
     Uses LLM + Embeddings for intelligent matching
@@ -46,28 +143,59 @@ async def score_match(request: ScoreRequest) -> ScoreResponse:
     Scoring Formula:
     ---------------
     Match Score = (0.40 × Skills) + (0.30 × Semantic) + (0.20 × Experience) + (0.10 × Keywords)
+
+    Identical inputs under the same scoring config are answered from the result
+    cache (X-Cache: HIT). Responses carry an ETag; If-None-Match returns 304,
+    Cache-Control: no-cache re-scores and refreshes the cached result.
+    resume_id / job_id score registered profiles (POST /profiles) instead of texts.
     """
     if not scoring_engine:
         logger.error("Scoring engine not initialized")
         raise HTTPException(status_code=503, detail="AI service not initialized")
 
+    resume = _registered([request.resume_id], "resume")[0] if request.resume_id else None
+    job = _registered([request.job_id], "job")[0] if request.job_id else None
+    # Texts are scored (and cached) in the same normalized form registered profiles store
+    resume_text = resume.text if resume else normalize_text(request.resume_text)
+    job_description = job.text if job else normalize_text(request.job_description)
+    job_requirements = job.requirements if job else normalize_text(request.job_requirements)
+
+    cache = get_score_cache()
+    key = None
+    if cache is not None:
+        key = score_cache_key(scoring_engine.config_version, resume_text, job_description, job_requirements)
+        if "no-cache" not in (cache_control or ""):
+            entry = cache.get(key)
+            if entry is not None:
+                return _score_response(entry, if_none_match, "HIT")
+
     try:
         start = time.time()
         logger.info("Processing scoring request...")
 
-        result = scoring_engine.score_match(
-            resume_text=request.resume_text,
-            job_description=request.job_description,
-            job_requirements=request.job_requirements or "",
-        )
+        if resume or job:
+            result = await scoring_engine.score_documents_async(
+                resume or resume_text, job or job_description, job_requirements
+            )
+        else:
+            result = await scoring_engine.score_match_async(
+                resume_text=resume_text,
+                job_description=job_description,
+                job_requirements=job_requirements,
+            )
 
         elapsed = time.time() - start
         logger.info(f"[OK] Scoring completed with score: {result['match_score']} ({elapsed:.2f}s)")
-        return result
+        entry = make_entry(ScoreResponse(**result).model_dump_json())
+        if key is not None and is_cacheable(result):
+            cache.set(key, entry)
+        return _score_response(entry, if_none_match, "MISS")
 
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=f"Provider unavailable: {e}")
     except Exception as e:
         logger.error(f"Scoring error: {e}")
         raise HTTPException(status_code=500, detail=f"Scoring failed: {str(e)}")
@@ -86,27 +214,253 @@ async def batch_score(request: BatchScoreRequest):
         raise HTTPException(status_code=503, detail="AI service not initialized")
 
     try:
-        logger.info(f"[START] Batch scoring {len(request.resumes)} resumes x {len(request.jobs)} jobs")
-        result = score_batch(scoring_engine, request)
+        logger.info(f"[START] Batch scoring {request.resume_count} resumes x {request.job_count} jobs")
+        result = await score_batch(scoring_engine, request)
         logger.info(f"[OK] Batch scoring completed: {result.total_comparisons} comparisons in {result.processing_time_seconds}s")
         return result
 
+    except ProfileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=f"Provider unavailable: {e}")
     except Exception as e:
         logger.error(f"Batch scoring error: {e}")
         raise HTTPException(status_code=500, detail=f"Batch scoring failed: {str(e)}")
 
 
-@router.get("/metrics")
-async def metrics():
-    """Prometheus metrics endpoint"""
-    return generate_latest()
+@router.post("/batch-score/stream")
+async def batch_score_stream(
+    request: BatchScoreRequest,
+    format: Literal["ndjson", "sse"] = Query("ndjson", description="ndjson or sse (server-sent events)"),
+):
+    """
+    Streaming batch scoring - each pair is emitted as soon as it is scored
+    Interleaves periodic progress records and ends with a "done" record,
+    so large batches never hit client timeouts waiting for the full response
+    """
+    if not scoring_engine:
+        logger.error("Scoring engine not initialized")
+        raise HTTPException(status_code=503, detail="AI service not initialized")
+
+    try:
+        request = resolve_profiles(request)
+    except ProfileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    logger.info(f"[START] Streaming batch {len(request.resumes)} resumes x {len(request.jobs)} jobs")
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            async for record in stream_batch(scoring_engine, request):
+                payload = json.dumps(record)
+                yield f"event: {record['type']}\ndata: {payload}\n\n" if format == "sse" else payload + "\n"
+        except Exception as e:
+            logger.error(f"Streaming batch error: {e}")
+            error = json.dumps({"type": "error", "detail": f"Batch scoring failed: {str(e)}"})
+            yield f"event: error\ndata: {error}\n\n" if format == "sse" else error + "\n"
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type)
+
+
+@router.post("/batch-jobs", response_model=BatchJobCreated, status_code=202)
+async def create_batch_job(request: BatchScoreRequest):
+    """
+    Submit a batch as a durable background job
+    Returns immediately; poll GET /batch-jobs/{id} for progress and results
+    """
+    if not scoring_engine:
+        logger.error("Scoring engine not initialized")
+        raise HTTPException(status_code=503, detail="AI service not initialized")
+
+    try:
+        request = resolve_profiles(request)
+        job_id = await get_job_manager().submit(request)
+    except ProfileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    total = len(request.resumes) * len(request.jobs)
+    logger.info(f"[OK] Batch job {job_id} queued with {total} comparisons")
+    return {"id": job_id, "status": "queued", "total_comparisons": total}
+
+
+@router.get("/batch-jobs/{job_id}", response_model=BatchJobStatus)
+async def get_batch_job(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="First result to return"),
+    limit: int = Query(100, ge=1, le=1000, description="Results per page"),
+):
+    """Job progress plus a page of completed results ordered by resume/job index"""
+    status = await get_job_manager().status(job_id, offset=offset, limit=limit)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Batch job not found: {job_id}")
+    return status
+
+
+@router.post("/rank", response_model=RankResponse)
+async def rank(request: RankRequest):
+    """
+    Rank many resumes for one job and return the top-N finalists
+    Cheap components (skills, semantic, keywords) are computed for everyone;
+    the LLM experience check only runs for candidates that can still make the cut
+    """
+    if not scoring_engine:
+        logger.error("Scoring engine not initialized")
+        raise HTTPException(status_code=503, detail="AI service not initialized")
+
+    try:
+        logger.info(f"[START] Ranking {request.resume_count} resumes for top {request.top_n}")
+        result = await rank_candidates(scoring_engine, request)
+        logger.info(
+            f"[OK] Ranking completed with {result.llm_calls} LLM assessments "
+            f"for {result.total_candidates} candidates in {result.processing_time_seconds}s"
+        )
+        return result
+
+    except ProfileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=f"Provider unavailable: {e}")
+    except Exception as e:
+        logger.error(f"Ranking error: {e}")
+        raise HTTPException(status_code=500, detail=f"Ranking failed: {str(e)}")
+
+
+@router.post("/profiles", response_model=ProfileResponse)
+async def register_profile(request: ProfileRequest):
+    """
+    Register or update a resume/job for scoring by id (/score, /batch-score, /rank)
+    Skills, keywords and the embedding are computed once here; re-registering
+    unchanged content returns the stored profile with changed=false
+    """
+    if not scoring_engine:
+        logger.error("Scoring engine not initialized")
+        raise HTTPException(status_code=503, detail="AI service not initialized")
+
+    try:
+        profile, changed = await scoring_engine.register_profile_async(
+            request.id, request.kind, request.text, request.requirements
+        )
+        if changed:
+            logger.info(f"[OK] Registered {profile.kind} profile {profile.id}")
+        return _profile_response(profile, changed)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=f"Provider unavailable: {e}")
+    except Exception as e:
+        logger.error(f"Profile registration error: {e}")
+        raise HTTPException(status_code=500, detail=f"Profile registration failed: {str(e)}")
+
+
+@router.get("/profiles/{doc_id}", response_model=ProfileResponse)
+async def get_profile(doc_id: str):
+    """A registered profile's features"""
+    profile = get_profile_store().get(doc_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile not registered: {doc_id}")
+    return _profile_response(profile)
+
+
+@router.delete("/profiles/{doc_id}")
+async def remove_profile(doc_id: str):
+    """Remove a registered profile"""
+    if not get_profile_store().remove(doc_id):
+        raise HTTPException(status_code=404, detail=f"Profile not registered: {doc_id}")
+    return {"id": doc_id, "removed": True}
+
+
+@router.post("/index/documents", response_model=IndexDocumentResponse)
+async def index_document(request: IndexDocumentRequest):
+    """
+    Add or replace a resume/job in the vector index used by /search
+    The text is embedded once (cached) and stored under the caller's id
+    """
+    if not scoring_engine:
+        logger.error("Scoring engine not initialized")
+        raise HTTPException(status_code=503, detail="AI service not initialized")
+
+    try:
+        embedding = await scoring_engine.embeddings_service.get_embedding_async(request.text)
+        index = get_vector_index()
+        index.upsert(request.id, embedding, request.kind)
+        return {"id": request.id, "kind": request.kind, "indexed_documents": len(index)}
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=f"Provider unavailable: {e}")
+    except Exception as e:
+        logger.error(f"Indexing error: {e}")
+        raise HTTPException(status_code=500, detail=f"Indexing failed: {str(e)}")
+
+
+@router.delete("/index/documents/{doc_id}")
+async def remove_indexed_document(doc_id: str):
+    """Remove a document from the vector index"""
+    if not get_vector_index().remove(doc_id):
+        raise HTTPException(status_code=404, detail=f"Document not indexed: {doc_id}")
+    return {"id": doc_id, "removed": True}
+
+
+@router.post("/search", response_model=SearchResponse)
+async def search(request: SearchRequest):
+    """
+    Top-K most similar indexed documents for a query text or indexed id
+    e.g. best resumes for a job: {"query_id": "job-42", "kind": "resume"}
+    """
+    if not scoring_engine:
+        logger.error("Scoring engine not initialized")
+        raise HTTPException(status_code=503, detail="AI service not initialized")
+
+    index = get_vector_index()
+    start = time.perf_counter()
+    try:
+        if request.query_id is not None:
+            query = index.get_vector(request.query_id)
+            if query is None:
+                raise HTTPException(status_code=404, detail=f"Document not indexed: {request.query_id}")
+        else:
+            query = await scoring_engine.embeddings_service.get_embedding_async(request.query_text)
+
+        hits, mode = index.search(
+            query, k=request.k, kind=request.kind, mode=request.mode, exclude=request.query_id
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=f"Provider unavailable: {e}")
+    except Exception as e:
+        logger.error(f"Search error: {e}")
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+    return {
+        "results": [{"id": doc_id, "kind": kind, "score": round(score, 2)} for doc_id, kind, score in hits],
+        "total_indexed": len(index),
+        "mode": mode,
+        "took_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
 
 
 @router.get("/cache-stats")
 async def cache_stats():
     """Get embedding cache statistics"""
     cache = get_cache()
-    return cache.stats()
+    stats = cache.stats()
+    store = get_embedding_store()
+    if store:
+        stats["store"] = store.stats()
+    stats["experience_gap"] = get_experience_cache().stats()
+    score_cache = get_score_cache()
+    if score_cache is not None:
+        stats["score"] = score_cache.stats()
+    stats["profiles"] = get_profile_store().stats()
+    return stats
 
 
 @router.get("/")
@@ -117,8 +471,16 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
+            "liveness": "/health/live",
+            "readiness": "/health/ready",
             "score": "/score (POST)",
             "batch_score": "/batch-score (POST)",
+            "batch_score_stream": "/batch-score/stream (POST, ?format=ndjson|sse)",
+            "batch_jobs": "/batch-jobs (POST), /batch-jobs/{id} (GET)",
+            "rank": "/rank (POST)",
+            "profiles": "/profiles (POST), /profiles/{id} (GET, DELETE)",
+            "index_documents": "/index/documents (POST, DELETE /{id})",
+            "search": "/search (POST)",
             "metrics": "/metrics",
             "cache_stats": "/cache-stats",
             "docs": "/docs",
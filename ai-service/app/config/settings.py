@@ -25,10 +25,11 @@ class Settings(BaseSettings):
     OPENAI_BASE_URL: Optional[str] = None  # For custom OpenAI-compatible APIs
 
     # Ollama Configuration (if using Ollama - FREE LOCAL LLM)
+    # Comma-separated for several servers, e.g. "http://gpu1:11434,http://gpu2:11434"
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama3.1"  # or mistral, codellama, etc.
 
-    # Custom LLM Configuration
+    # Custom LLM Configuration (CUSTOM_API_URL may be comma-separated like OLLAMA_BASE_URL)
     CUSTOM_API_URL: Optional[str] = None
     CUSTOM_API_KEY: Optional[str] = None
 
@@ -37,8 +38,45 @@ class Settings(BaseSettings):
     LLM_MAX_TOKENS: int = 500
     LLM_TIMEOUT: int = 30
 
-    # Embeddings Provider: "openai", "ollama", "sentence-transformers" (local)
-    EMBEDDING_PROVIDER: Literal["openai", "ollama", "local"] = "ollama"
+    # Experience gap: "llm" (always ask), "heuristic" (parse years/titles only),
+    # "hybrid" (parse, ask the LLM only when the texts are ambiguous; faster, but verdicts
+    # and so scores differ from "llm" for pairs the parser settles - opt in)
+    EXPERIENCE_MODE: Literal["heuristic", "llm", "hybrid"] = "llm"
+
+    # Experience-gap verdict cache (LLM results); unset path = memory only
+    EXPERIENCE_CACHE_MAX_ENTRIES: int = 10_000
+    EXPERIENCE_CACHE_PATH: Optional[str] = "data/experience_gap.sqlite3"
+    # Full /score results keyed by inputs + scoring config (0 entries = off); unset path = memory only
+    SCORE_CACHE_MAX_ENTRIES: int = 10_000
+    SCORE_CACHE_PATH: Optional[str] = None
+    # Registered resume/job profiles for scoring by id; unset path = memory only (lost on restart)
+    PROFILE_STORE_PATH: Optional[str] = "data/profiles.sqlite3"
+    # Decoded profiles kept in memory (LRU); without a store path this caps the registered profiles
+    PROFILE_CACHE_MAX_ENTRIES: int = 10_000
+    # Uncached pairs packed into one experience-gap prompt in batch work (1 = per pair)
+    EXPERIENCE_BATCH_SIZE: int = 8
+
+    # Pooled HTTP connections to LLM/embedding providers
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+
+    # Vector index (/search): approximate (IVF) mode kicks in above this size
+    VECTOR_INDEX_IVF_MIN_SIZE: int = 10_000
+    VECTOR_INDEX_NPROBE: int = 8
+
+    # Batch scoring: max resume×job pairs scored concurrently
+    BATCH_MAX_CONCURRENCY: int = 8
+    # Streaming batch: seconds between progress records (0 = off)
+    BATCH_STREAM_PROGRESS_SECONDS: float = 2.0
+
+    # Durable batch jobs (/batch-jobs)
+    BATCH_JOBS_DB_PATH: str = "data/batch_jobs.sqlite3"
+    BATCH_JOB_WORKERS: int = 2
+    # A running job whose owner has not heartbeated for this long is taken over by another worker
+    BATCH_JOB_LEASE_SECONDS: float = 60.0
+
+    # Embeddings Provider: "openai", "ollama", "sentence-transformers" (local), "hashed" (lexical)
+    EMBEDDING_PROVIDER: Literal["openai", "ollama", "local", "hashed"] = "ollama"
     
     # OpenAI Embeddings
     OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-small"
@@ -49,6 +87,60 @@ class Settings(BaseSettings):
     # Local Sentence Transformers (completely free, no API)
     LOCAL_EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
 
+    # Hashed lexical embeddings: buckets, word n-gram order, char n-gram range,
+    # optional per-bucket IDF (.npy from python -m app.utils.fit_idf)
+    HASHED_EMBEDDING_DIM: int = 4096
+    HASHED_EMBEDDING_WORD_NGRAMS: int = 2
+    HASHED_EMBEDDING_CHAR_MIN: int = 3
+    HASHED_EMBEDDING_CHAR_MAX: int = 5
+    HASHED_EMBEDDING_IDF_PATH: Optional[str] = None
+
+    # Texts per provider request for batched embedding calls
+    EMBEDDING_BATCH_SIZE: int = 64
+
+    # Worker processes for CPU-bound work (local embeddings, skill extraction);
+    # 0 = run in-process. Set to the core count with EMBEDDING_PROVIDER=local
+    CPU_POOL_WORKERS: int = 0
+
+    # Micro-batching of concurrent single-text embedding requests (window 0 = off)
+    EMBEDDING_MICROBATCH_WINDOW_MS: float = 5.0
+    EMBEDDING_MICROBATCH_MAX_SIZE: int = 32
+
+    # Embedding cache: LRU sized by bytes (float32 vectors), optional TTL
+    EMBEDDING_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    EMBEDDING_CACHE_TTL_SECONDS: Optional[float] = None  # None = never expire
+
+    # Persistent memory-mapped embedding store (unset to disable)
+    EMBEDDING_STORE_PATH: Optional[str] = "data/embeddings"
+
+    # Provider call resilience (LLM_* for the LLM, EMBEDDING_* for remote embeddings):
+    # in-flight limit per backend endpoint (0 = unlimited), retries of transient errors with full-jitter
+    # backoff, hedging after this latency quantile (None = off), circuit breaker that
+    # opens after N consecutive transient failures for RESET seconds (0 = never)
+    LLM_MAX_CONCURRENCY: int = 4
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BACKOFF_SECONDS: float = 0.5
+    LLM_HEDGE_QUANTILE: Optional[float] = None
+    LLM_CIRCUIT_FAILURES: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+    EMBEDDING_MAX_CONCURRENCY: int = 16
+    EMBEDDING_MAX_RETRIES: int = 2
+    EMBEDDING_RETRY_BACKOFF_SECONDS: float = 0.1
+    EMBEDDING_HEDGE_QUANTILE: Optional[float] = None
+    EMBEDDING_CIRCUIT_FAILURES: int = 5
+    EMBEDDING_CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Backend pool (several OLLAMA_BASE_URL / CUSTOM_API_URL endpoints): routing by
+    # fewest calls in flight or by EWMA latency; an endpoint is ejected for
+    # EJECT_SECONDS after EJECT_FAILURES consecutive transient failures
+    BACKEND_ROUTING: Literal["least_outstanding", "ewma"] = "least_outstanding"
+    BACKEND_EJECT_FAILURES: int = 3
+    BACKEND_EJECT_SECONDS: float = 30.0
+
+    # Background warm-up: seconds between retries of components that failed
+    # (e.g. Ollama not up yet); /health/ready is 503 until all are warm
+    WARMUP_RETRY_SECONDS: float = 5.0
+
     class Config:
         env_file = ".env"
         case_sensitive = True
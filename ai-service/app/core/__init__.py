@@ -2,6 +2,7 @@
 from .llm_client import LLMClient
 from .embeddings import EmbeddingsService
 from .scoring import ScoringEngine
+from .skills import SkillMatcher, SkillMatch
 from .cache import get_cache
 from .logger import get_logger, timer_log
 from .metrics import track_latency, record_cache_hit, record_cache_miss
@@ -10,6 +11,8 @@ __all__ = [
     "LLMClient",
     "EmbeddingsService",
     "ScoringEngine",
+    "SkillMatcher",
+    "SkillMatch",
     "get_cache",
     "get_logger",
     "timer_log",
@@ -0,0 +1,249 @@
+"""
+Backend pool: several inference servers behind one provider
+Least-outstanding or EWMA-latency routing with passive health checks (failing endpoints are ejected)
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+import random
+import threading
+import time
+from app.config import settings
+from app.core.metrics import (
+    backend_ejections,
+    backend_healthy,
+    backend_in_flight,
+    backend_latency,
+    backend_requests,
+)
+from app.core.resilience import is_retryable
+
+logger = logging.getLogger(__name__)
+
+
+def parse_endpoints(value: Optional[str]) -> List[str]:
+    """Comma-separated base URLs -> list (trailing slashes dropped, duplicates removed)"""
+    endpoints: List[str] = []
+    for url in (value or "").split(","):
+        url = url.strip().rstrip("/")
+        if url and url not in endpoints:
+            endpoints.append(url)
+    return endpoints
+
+
+class Endpoint:
+    """One backend URL and its live routing state"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.ewma: Optional[float] = None  # seconds; None until the first success
+        self.failures = 0  # consecutive transient failures
+        self.ejected_until = 0.0
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+class BackendPool:
+    """
+    Why a backend pool?
+    -------------------
+    OLLAMA_BASE_URL / CUSTOM_API_URL used to name one server, so LLM and embedding
+    throughput stopped at whatever that box could serve. Both now take a
+    comma-separated list and every provider call picks one endpoint:
+
+      - least_outstanding: fewest calls in flight (ties broken at random)
+      - ewma: lowest EWMA latency × (in flight + 1), so a slow box gets less work
+        even when queues are equal; endpoints without samples are tried first
+
+    Each consecutive failure counts as one more call in flight, so a retry usually
+    lands elsewhere while a flaky endpoint still gets its share under load.
+    Passive health checks: `eject_failures` consecutive transient failures (network
+    errors, timeouts, 429/5xx) eject an endpoint for `eject_seconds`; afterwards it
+    gets traffic again and one more failure ejects it again. If every endpoint is
+    ejected the one due back first is used - the provider's circuit breaker, not
+    the pool, decides when to stop calling altogether.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        provider: str,
+        urls: List[str],
+        routing: str = "least_outstanding",
+        eject_failures: int = 3,
+        eject_seconds: float = 30.0,
+        ewma_alpha: float = 0.3,
+    ):
+        if not urls:
+            raise ValueError(f"No endpoints configured for {kind} provider {provider}")
+        if routing not in ("least_outstanding", "ewma"):
+            raise ValueError(f"Unknown backend routing: {routing}")
+        self.kind = kind
+        self.provider = provider
+        self.routing = routing
+        self.eject_failures = eject_failures
+        self.eject_seconds = eject_seconds
+        self.ewma_alpha = ewma_alpha
+        self.endpoints = [Endpoint(url) for url in urls]
+        self._lock = threading.Lock()
+        for endpoint in self.endpoints:
+            backend_healthy.labels(**self._labels(endpoint)).set(1)
+            backend_in_flight.labels(**self._labels(endpoint)).set(0)
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def _labels(self, endpoint: Endpoint) -> Dict[str, str]:
+        return {"kind": self.kind, "provider": self.provider, "endpoint": endpoint.url}
+
+    def _cost(self, endpoint: Endpoint) -> Tuple[float, float]:
+        # Each consecutive failure weighs like one more call in flight
+        load = endpoint.outstanding + endpoint.failures
+        if self.routing == "ewma":
+            return ((endpoint.ewma or 0.0) * (load + 1), random.random())
+        return (load, random.random())
+
+    def acquire(self) -> Endpoint:
+        """Pick an endpoint and count the call as outstanding on it"""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [e for e in self.endpoints if e.available(now)]
+            if candidates:
+                endpoint = min(candidates, key=self._cost)
+            else:
+                endpoint = min(self.endpoints, key=lambda e: e.ejected_until)
+            endpoint.outstanding += 1
+            backend_in_flight.labels(**self._labels(endpoint)).set(endpoint.outstanding)
+        return endpoint
+
+    def release(self, endpoint: Endpoint, elapsed: float, error: Optional[BaseException] = None) -> None:
+        """Record the call's outcome; transient failures count towards ejection"""
+        labels = self._labels(endpoint)
+        with self._lock:
+            endpoint.outstanding -= 1
+            backend_in_flight.labels(**labels).set(endpoint.outstanding)
+            if error is None or not is_retryable(error):  # an answer, even a 400, means it is up
+                if error is None:
+                    endpoint.ewma = elapsed if endpoint.ewma is None else (
+                        self.ewma_alpha * elapsed + (1 - self.ewma_alpha) * endpoint.ewma
+                    )
+                if endpoint.failures or endpoint.ejected_until:
+                    endpoint.failures = 0
+                    endpoint.ejected_until = 0.0
+                    backend_healthy.labels(**labels).set(1)
+                    logger.info(f"[OK] {self.kind} endpoint {endpoint.url} is healthy")
+            else:
+                endpoint.failures += 1
+                # Back from ejection: one more failure is enough to eject it again
+                if endpoint.failures >= self.eject_failures or endpoint.ejected_until:
+                    self._eject(endpoint, error)
+        backend_requests.labels(**labels, outcome="ok" if error is None else "error").inc()
+        if error is None:
+            backend_latency.labels(**labels).observe(elapsed)
+
+    def _abandon(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+            backend_in_flight.labels(**self._labels(endpoint)).set(endpoint.outstanding)
+
+    def _eject(self, endpoint: Endpoint, error: BaseException) -> None:
+        endpoint.ejected_until = time.monotonic() + self.eject_seconds
+        labels = self._labels(endpoint)
+        backend_healthy.labels(**labels).set(0)
+        backend_ejections.labels(**labels).inc()
+        logger.warning(
+            f"{self.kind} endpoint {endpoint.url} ejected for {self.eject_seconds}s "
+            f"after {endpoint.failures} failures ({error})"
+        )
+
+    def call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """fn(base_url, *args) on the chosen endpoint"""
+        endpoint = self.acquire()
+        start = time.monotonic()
+        try:
+            result = fn(endpoint.url, *args)
+        except Exception as e:
+            self.release(endpoint, time.monotonic() - start, e)
+            raise
+        except BaseException:
+            self._abandon(endpoint)
+            raise
+        self.release(endpoint, time.monotonic() - start)
+        return result
+
+    async def call_async(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """await fn(base_url, *args) on the chosen endpoint"""
+        endpoint = self.acquire()
+        start = time.monotonic()
+        try:
+            result = await fn(endpoint.url, *args)
+        except Exception as e:
+            self.release(endpoint, time.monotonic() - start, e)
+            raise
+        except BaseException:  # cancelled, e.g. a hedge that lost - says nothing about the endpoint
+            self._abandon(endpoint)
+            raise
+        self.release(endpoint, time.monotonic() - start)
+        return result
+
+    def probe(self, check: Callable[[str], None]) -> List[str]:
+        """
+        Run check(base_url) against every endpoint (warm-up); endpoints that fail
+        it are ejected. Returns the reachable URLs, raising the last error if none is.
+        """
+        reachable, last_error = [], None
+        for endpoint in self.endpoints:
+            try:
+                check(endpoint.url)
+            except Exception as e:
+                last_error = e
+                with self._lock:
+                    endpoint.failures = max(endpoint.failures, self.eject_failures)
+                    self._eject(endpoint, e)
+                continue
+            reachable.append(endpoint.url)
+            with self._lock:
+                if endpoint.ejected_until:
+                    endpoint.failures = 0
+                    endpoint.ejected_until = 0.0
+                    backend_healthy.labels(**self._labels(endpoint)).set(1)
+        if not reachable and last_error is not None:
+            raise last_error
+        return reachable
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Per-endpoint routing state (for logs and debugging)"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": e.url,
+                    "healthy": e.available(now),
+                    "outstanding": e.outstanding,
+                    "ewma_ms": None if e.ewma is None else round(e.ewma * 1000, 1),
+                    "failures": e.failures,
+                }
+                for e in self.endpoints
+            ]
+
+
+_pools: Dict[Tuple[str, str], BackendPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_backend_pool(kind: str, provider: str, urls: List[str]) -> BackendPool:
+    """Shared pool for one provider's endpoints ("llm" or "embedding"), configured from settings"""
+    with _pools_lock:
+        pool = _pools.get((kind, provider))
+        if pool is None or [e.url for e in pool.endpoints] != urls:
+            pool = _pools[(kind, provider)] = BackendPool(
+                kind,
+                provider,
+                urls,
+                routing=settings.BACKEND_ROUTING,
+                eject_failures=settings.BACKEND_EJECT_FAILURES,
+                eject_seconds=settings.BACKEND_EJECT_SECONDS,
+            )
+        return pool
@@ -3,17 +3,47 @@ Batch scoring endpoint for multiple resumes/jobs
 Performance optimization for bulk operations
 """
 
-from typing import List
-from pydantic import BaseModel, Field
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple, Union
+import asyncio
+import logging
+import time
+from pydantic import BaseModel, Field, model_validator
 
+from app.config import settings
 from app.core import ScoringEngine
+from app.core.profiles import DocumentProfile, get_profile_store
+
+logger = logging.getLogger(__name__)
 
 
 class BatchScoreRequest(BaseModel):
-    """Batch scoring request"""
-    resumes: List[str] = Field(..., description="List of resume texts")
-    jobs: List[str] = Field(..., description="List of job descriptions")
+    """Batch scoring request (texts, or ids registered via /profiles)"""
+    resumes: List[str] = Field(default_factory=list, description="List of resume texts")
+    resume_ids: List[str] = Field(default_factory=list, description="Registered resume profile ids")
+    jobs: List[str] = Field(default_factory=list, description="List of job descriptions")
+    job_ids: List[str] = Field(default_factory=list, description="Registered job profile ids")
     requirements: List[str] = Field(default_factory=list, description="List of job requirements")
+    max_concurrency: Optional[int] = Field(
+        None, ge=1, description="Max pairs scored at once (defaults to BATCH_MAX_CONCURRENCY)"
+    )
+
+    @model_validator(mode="after")
+    def check_documents(self) -> "BatchScoreRequest":
+        for texts, ids in (("resumes", "resume_ids"), ("jobs", "job_ids")):
+            given = self.model_fields_set
+            if (texts not in given and ids not in given) or (getattr(self, texts) and getattr(self, ids)):
+                raise ValueError(f"Provide exactly one of {texts} or {ids}")
+        if self.job_ids and self.requirements:
+            raise ValueError("requirements only apply to jobs (a job profile has its own)")
+        return self
+
+    @property
+    def resume_count(self) -> int:
+        return len(self.resumes or self.resume_ids)
+
+    @property
+    def job_count(self) -> int:
+        return len(self.jobs or self.job_ids)
 
 
 class BatchScoreItem(BaseModel):
@@ -24,50 +54,271 @@ class BatchScoreItem(BaseModel):
     matched_skills: List[str]
     missing_skills: List[str]
     experience_gap: str
+    error: Optional[str] = None
 
 
 class BatchScoreResponse(BaseModel):
     """Batch scoring response"""
     results: List[BatchScoreItem]
     total_comparisons: int
+    failed_comparisons: int = 0
+    processing_time_seconds: float
+
+
+class RankRequest(BaseModel):
+    """Rank many resumes against one job (texts, or ids registered via /profiles)"""
+    resumes: List[str] = Field(default_factory=list, description="List of resume texts")
+    resume_ids: List[str] = Field(default_factory=list, description="Registered resume profile ids")
+    job_description: Optional[str] = Field(None, min_length=1, description="Job description text")
+    job_id: Optional[str] = Field(None, min_length=1, description="Registered job profile id")
+    job_requirements: str = Field("", description="Additional job requirements")
+    top_n: int = Field(10, ge=1, description="Number of finalists to return")
+    max_concurrency: Optional[int] = Field(
+        None, ge=1, description="Max LLM assessments at once (defaults to BATCH_MAX_CONCURRENCY)"
+    )
+
+    @model_validator(mode="after")
+    def check_documents(self) -> "RankRequest":
+        given = self.model_fields_set
+        if ("resumes" not in given and "resume_ids" not in given) or (self.resumes and self.resume_ids):
+            raise ValueError("Provide exactly one of resumes or resume_ids")
+        if (self.job_description is None) == (self.job_id is None):
+            raise ValueError("Provide exactly one of job_description or job_id")
+        if self.job_id is not None and self.job_requirements:
+            raise ValueError("job_requirements only apply to job_description (a job profile has its own)")
+        return self
+
+    @property
+    def resume_count(self) -> int:
+        return len(self.resumes or self.resume_ids)
+
+
+class RankItem(BaseModel):
+    """One ranked finalist"""
+    resume_index: int
+    match_score: float
+    matched_skills: List[str]
+    missing_skills: List[str]
+    experience_gap: str
+    summary: str
+
+
+class RankResponse(BaseModel):
+    """Top-N finalists, best first"""
+    results: List[RankItem]
+    total_candidates: int
+    failed_candidates: int
+    llm_calls: int = Field(..., description="Candidates whose experience gap was sent to the LLM")
+    cached_verdicts: int = Field(..., description="Experience gaps answered from the verdict cache")
+    heuristic_verdicts: int = Field(..., description="Experience gaps settled by the parser (EXPERIENCE_MODE)")
     processing_time_seconds: float
 
 
-def score_batch(
+def _documents(texts: List[str], ids: List[str], kind: str) -> Union[List[str], List[DocumentProfile]]:
+    """Texts as given, or the registered profiles for ids (ProfileNotFoundError if one is missing)"""
+    return get_profile_store().get_many(ids, kind) if ids else texts
+
+
+def resolve_profiles(request: BatchScoreRequest) -> BatchScoreRequest:
+    """
+    Same batch with profile ids replaced by the registered texts - for per-pair
+    scoring (streams, background jobs), which works on texts and must not depend
+    on profiles that may be changed or removed while it runs
+    """
+    if not request.resume_ids and not request.job_ids:
+        return request
+    store = get_profile_store()
+    resumes, jobs, requirements = request.resumes, request.jobs, request.requirements
+    if request.resume_ids:
+        resumes = [profile.text for profile in store.get_many(request.resume_ids, "resume")]
+    if request.job_ids:
+        profiles = store.get_many(request.job_ids, "job")
+        jobs = [profile.text for profile in profiles]
+        requirements = [profile.requirements for profile in profiles]
+    return BatchScoreRequest(
+        resumes=resumes, jobs=jobs, requirements=requirements, max_concurrency=request.max_concurrency
+    )
+
+
+def _to_item(r_idx: int, j_idx: int, outcome: Union[Dict, Exception]) -> BatchScoreItem:
+    """Convert a pair result (or its failure) into a batch item"""
+    if isinstance(outcome, Exception):
+        logger.error(f"Batch pair ({r_idx}, {j_idx}) failed: {outcome}")
+        return BatchScoreItem(
+            resume_index=r_idx,
+            job_index=j_idx,
+            match_score=0.0,
+            matched_skills=[],
+            missing_skills=[],
+            experience_gap="Unknown",
+            error=str(outcome),
+        )
+
+    return BatchScoreItem(
+        resume_index=r_idx,
+        job_index=j_idx,
+        match_score=outcome["match_score"],
+        matched_skills=outcome["matched_skills"],
+        missing_skills=outcome["missing_skills"],
+        experience_gap=outcome["experience_gap"],
+    )
+
+
+async def score_batch(
     scoring_engine: ScoringEngine,
     request: BatchScoreRequest,
 ) -> BatchScoreResponse:
-    """Score multiple resume-job pairs in batch"""
-    import time
-
+    """
+    Score multiple resume-job pairs in batch
+    Each document is processed once (skills, keywords, embedding) and the
+    component scores come from M×N matrix products; provider calls run
+    concurrently (bounded by max_concurrency). Results keep
+    resume_index/job_index order regardless of completion order
+    """
     start = time.time()
-    results = []
-
-    for r_idx, resume_text in enumerate(request.resumes):
-        for j_idx, job_desc in enumerate(request.jobs):
-            requirement = request.requirements[j_idx] if j_idx < len(request.requirements) else ""
-
-            score_result = scoring_engine.score_match(
-                resume_text=resume_text,
-                job_description=job_desc,
-                job_requirements=requirement,
-            )
-
-            results.append(
-                BatchScoreItem(
-                    resume_index=r_idx,
-                    job_index=j_idx,
-                    match_score=score_result["match_score"],
-                    matched_skills=score_result["matched_skills"],
-                    missing_skills=score_result["missing_skills"],
-                    experience_gap=score_result["experience_gap"],
-                )
-            )
 
+    matrix = await scoring_engine.score_matrix_async(
+        _documents(request.resumes, request.resume_ids, "resume"),
+        _documents(request.jobs, request.job_ids, "job"),
+        request.requirements,
+        max_concurrency=request.max_concurrency or settings.BATCH_MAX_CONCURRENCY,
+    )
+    results = [
+        _to_item(r_idx, j_idx, outcome)
+        for r_idx, row in enumerate(matrix)
+        for j_idx, outcome in enumerate(row)
+    ]
     elapsed = time.time() - start
 
     return BatchScoreResponse(
         results=results,
-        total_comparisons=len(request.resumes) * len(request.jobs),
+        total_comparisons=request.resume_count * request.job_count,
+        failed_comparisons=sum(1 for item in results if item.error),
         processing_time_seconds=round(elapsed, 2),
     )
+
+
+async def rank_candidates(
+    scoring_engine: ScoringEngine,
+    request: RankRequest,
+) -> RankResponse:
+    """
+    Two-stage ranking: cheap components for every resume, LLM only for
+    candidates that can still reach the top-N (same top-N as scoring all pairs)
+    """
+    start = time.time()
+
+    job = get_profile_store().get_many([request.job_id], "job")[0] if request.job_id else request.job_description
+    ranking = await scoring_engine.rank_candidates_async(
+        _documents(request.resumes, request.resume_ids, "resume"),
+        job,
+        request.job_requirements,
+        top_n=request.top_n,
+        max_concurrency=request.max_concurrency or settings.BATCH_MAX_CONCURRENCY,
+    )
+    elapsed = time.time() - start
+
+    return RankResponse(**ranking, processing_time_seconds=round(elapsed, 2))
+
+
+async def _score_pair(
+    scoring_engine: ScoringEngine,
+    r_idx: int,
+    j_idx: int,
+    request: BatchScoreRequest,
+) -> BatchScoreItem:
+    """Score one pair independently; failures become error entries"""
+    requirement = request.requirements[j_idx] if j_idx < len(request.requirements) else ""
+    try:
+        outcome = await scoring_engine.score_match_async(
+            resume_text=request.resumes[r_idx],
+            job_description=request.jobs[j_idx],
+            job_requirements=requirement,
+        )
+    except Exception as e:
+        outcome = e
+    return _to_item(r_idx, j_idx, outcome)
+
+
+async def iter_scored_pairs(
+    scoring_engine: ScoringEngine,
+    request: BatchScoreRequest,
+    pairs: Iterator[Tuple[int, int]],
+    limit: int,
+    tick: Optional[float] = None,
+) -> AsyncIterator[Optional[BatchScoreItem]]:
+    """
+    Score (resume_index, job_index) pairs through a sliding window of `limit`
+    tasks, yielding items in completion order. With `tick`, None is yielded
+    whenever that many seconds pass without a completion (for heartbeats).
+    Pending pairs are cancelled if the consumer stops early.
+    """
+    pending: Set[asyncio.Task] = set()
+
+    def refill() -> None:
+        while len(pending) < limit:
+            pair = next(pairs, None)
+            if pair is None:
+                return
+            pending.add(asyncio.create_task(_score_pair(scoring_engine, *pair, request)))
+
+    try:
+        refill()
+        while pending:
+            done, _ = await asyncio.wait(pending, timeout=tick, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                yield None
+            for task in done:
+                pending.discard(task)
+                yield task.result()
+            refill()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def stream_batch(
+    scoring_engine: ScoringEngine,
+    request: BatchScoreRequest,
+) -> AsyncIterator[Dict]:
+    """
+    Yield batch results as they complete, with periodic progress records
+
+    Records: {"type": "result", ...BatchScoreItem}, {"type": "progress", ...}
+    and a final {"type": "done", ...}. Pairs are scored through a sliding
+    window of max_concurrency tasks, so the first result does not wait for
+    the rest of the batch and memory stays flat regardless of batch size.
+    Per-document work (embeddings, LLM verdicts) is still shared across pairs
+    through the embedding and verdict caches. Results arrive in completion
+    order; resume_index/job_index identify each pair.
+    """
+    start = time.time()
+    total = len(request.resumes) * len(request.jobs)
+    limit = request.max_concurrency or settings.BATCH_MAX_CONCURRENCY
+    interval = settings.BATCH_STREAM_PROGRESS_SECONDS
+    pairs = ((r, j) for r in range(len(request.resumes)) for j in range(len(request.jobs)))
+    completed = failed = 0
+    last_progress = start
+
+    def progress(kind: str) -> Dict:
+        return {
+            "type": kind,
+            "completed": completed,
+            "failed": failed,
+            "total_comparisons": total,
+            "elapsed_seconds": round(time.time() - start, 2),
+        }
+
+    async for item in iter_scored_pairs(
+        scoring_engine, request, pairs, limit, tick=interval if interval > 0 else None
+    ):
+        if item is not None:
+            completed += 1
+            failed += 1 if item.error else 0
+            yield {"type": "result", **item.model_dump()}
+
+        if interval > 0 and time.time() - last_progress >= interval:
+            last_progress = time.time()
+            yield progress("progress")
+
+    yield progress("done")
@@ -0,0 +1,394 @@
+"""
+Durable asynchronous batch-scoring jobs
+Jobs and completed pair results persist in SQLite so restarts resume where they stopped
+"""
+
+from typing import List, Optional, Set, Tuple
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.core import ScoringEngine
+from app.core.batch import BatchScoreItem, BatchScoreRequest, iter_scored_pairs
+
+logger = logging.getLogger(__name__)
+
+# Finished pairs are written in batches: at most this many rows or seconds apart
+_FLUSH_ROWS = 64
+_FLUSH_SECONDS = 1.0
+
+
+class LeaseLostError(RuntimeError):
+    """Another worker claimed the job after this one's lease expired"""
+
+
+class BatchJobCreated(BaseModel):
+    """Response to a job submission"""
+    id: str
+    status: str
+    total_comparisons: int
+
+
+class BatchJobStatus(BaseModel):
+    """Job progress plus one page of completed results"""
+    id: str
+    status: str = Field(..., description="queued, running, completed or failed")
+    total_comparisons: int
+    completed: int
+    failed: int
+    created_at: float
+    updated_at: float
+    error: Optional[str] = None
+    offset: int
+    limit: int
+    results: List[BatchScoreItem]
+
+
+class BatchJobStore:
+    """SQLite persistence for jobs and their per-pair results"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    total INTEGER NOT NULL,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    heartbeat REAL
+                );
+                CREATE TABLE IF NOT EXISTS results (
+                    job_id TEXT NOT NULL,
+                    resume_index INTEGER NOT NULL,
+                    job_index INTEGER NOT NULL,
+                    item TEXT NOT NULL,
+                    failed INTEGER NOT NULL,
+                    PRIMARY KEY (job_id, resume_index, job_index)
+                );
+                """
+            )
+            # Databases created before job leases
+            columns = {row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner", "TEXT"), ("heartbeat", "REAL")):
+                if column not in columns:
+                    self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            self._db.commit()
+
+    def create(self, request: BatchScoreRequest) -> str:
+        """Persist a new queued job and return its id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, request, total, created_at, updated_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, request.model_dump_json(), len(request.resumes) * len(request.jobs), now, now),
+            )
+            self._db.commit()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    def finish(self, job_id: str, owner: str, status: str, error: Optional[str] = None) -> None:
+        """Final status for a job this owner holds (no-op if the lease was lost)"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ?, owner = NULL "
+                "WHERE id = ? AND owner = ?",
+                (status, error, time.time(), job_id, owner),
+            )
+            self._db.commit()
+
+    def claim(self, job_id: str, owner: str, stale_before: float) -> bool:
+        """
+        Atomically take a queued job, or a running one whose owner stopped
+        heartbeating before stale_before; False if someone else holds it
+        """
+        now = time.time()
+        with self._lock:
+            claimed = self._db.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, heartbeat = ?, updated_at = ? "
+                "WHERE id = ? AND (status = 'queued' OR "
+                "(status = 'running' AND (heartbeat IS NULL OR heartbeat < ?)))",
+                (owner, now, now, job_id, stale_before),
+            ).rowcount == 1
+            self._db.commit()
+        return claimed
+
+    def heartbeat(self, job_id: str, owner: str) -> bool:
+        """Extend this owner's lease; False if the job was claimed by someone else"""
+        with self._lock:
+            held = self._db.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE id = ? AND owner = ? AND status = 'running'",
+                (time.time(), job_id, owner),
+            ).rowcount == 1
+            self._db.commit()
+        return held
+
+    def release(self, owner: str) -> None:
+        """Hand this owner's running jobs back to the queue (clean shutdown)"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, heartbeat = NULL "
+                "WHERE owner = ? AND status = 'running'",
+                (owner,),
+            )
+            self._db.commit()
+
+    def claimable(self, stale_before: float) -> List[str]:
+        """Queued jobs and running jobs whose owner stopped heartbeating"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' OR "
+                "(status = 'running' AND (heartbeat IS NULL OR heartbeat < ?)) ORDER BY created_at",
+                (stale_before,),
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def completed_pairs(self, job_id: str) -> Set[Tuple[int, int]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT resume_index, job_index FROM results WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return {(row["resume_index"], row["job_index"]) for row in rows}
+
+    def save_results(self, job_id: str, owner: str, items: List[BatchScoreItem]) -> None:
+        """Record finished pairs in one transaction; LeaseLostError if owner no longer holds the job"""
+        now = time.time()
+        with self._lock:
+            held = self._db.execute(
+                "UPDATE jobs SET updated_at = ?, heartbeat = ? WHERE id = ? AND owner = ? AND status = 'running'",
+                (now, now, job_id, owner),
+            ).rowcount == 1
+            if not held:
+                self._db.rollback()
+                raise LeaseLostError(f"Batch job {job_id} was claimed by another worker")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO results (job_id, resume_index, job_index, item, failed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (job_id, item.resume_index, item.job_index, item.model_dump_json(), int(bool(item.error)))
+                    for item in items
+                ],
+            )
+            self._db.commit()
+
+    def counts(self, job_id: str) -> Tuple[int, int]:
+        """(completed, failed) pair counts"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COUNT(*) AS completed, COALESCE(SUM(failed), 0) AS failed "
+                "FROM results WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        return row["completed"], row["failed"]
+
+    def results(self, job_id: str, offset: int, limit: int) -> List[BatchScoreItem]:
+        """A page of completed results in (resume_index, job_index) order"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT item FROM results WHERE job_id = ? "
+                "ORDER BY resume_index, job_index LIMIT ? OFFSET ?",
+                (job_id, limit, offset),
+            ).fetchall()
+        return [BatchScoreItem.model_validate_json(row["item"]) for row in rows]
+
+
+class BatchJobManager:
+    """
+    Why durable jobs?
+    -----------------
+    Corpus-wide re-ranking can take far longer than any HTTP timeout.
+    Submissions return a job id immediately; a small pool of asyncio workers
+    scores the pairs and records finished pairs in SQLite (in batches, off the
+    event loop). On restart only the missing pairs are scored.
+
+    Every uvicorn worker shares the database, so a job is claimed atomically
+    before it runs and its owner heartbeats while scoring. Only queued jobs and
+    jobs whose owner stopped heartbeating for BATCH_JOB_LEASE_SECONDS are picked
+    up - at start and by a periodic sweep - so a job never runs twice at once.
+    """
+
+    def __init__(self, store: BatchJobStore, workers: int = 2, lease_seconds: float = 60.0):
+        self.store = store
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds
+        self._worker_count = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[str] = set()
+        self._workers: List[asyncio.Task] = []
+        self._engine: Optional[ScoringEngine] = None
+
+    async def start(self, scoring_engine: ScoringEngine) -> None:
+        """Start workers and resume unfinished jobs that nobody else is running"""
+        self._engine = scoring_engine
+        self._queue = asyncio.Queue()
+        resumable = await self._enqueue_claimable()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self._worker_count)]
+        self._workers.append(asyncio.create_task(self._sweep()))
+        if resumable:
+            logger.info(f"Resuming {resumable} unfinished batch jobs")
+
+    async def stop(self) -> None:
+        """Stop workers; jobs in flight go back to the queue and resume on the next start"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await asyncio.to_thread(self.store.release, self.owner)
+
+    async def submit(self, request: BatchScoreRequest) -> str:
+        """Persist and enqueue a job"""
+        if self._queue is None:
+            raise RuntimeError("Batch job workers not started")
+        job_id = await asyncio.to_thread(self.store.create, request)
+        self._enqueue(job_id)
+        return job_id
+
+    def _enqueue(self, job_id: str) -> None:
+        """Queue a job once (event loop only: asyncio.Queue is not thread-safe)"""
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _enqueue_claimable(self) -> int:
+        claimable = await asyncio.to_thread(self.store.claimable, time.time() - self.lease_seconds)
+        for job_id in claimable:
+            self._enqueue(job_id)
+        return len(claimable)
+
+    async def _sweep(self) -> None:
+        """Pick up jobs left behind by workers that died (their leases expire)"""
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                await self._enqueue_claimable()
+            except Exception as e:
+                logger.error(f"Batch job sweep failed: {e}")
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await asyncio.to_thread(self.store.heartbeat, job_id, self.owner):
+                return  # lease lost: the next write stops the run
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except LeaseLostError as e:
+                logger.warning(str(e))
+            except Exception as e:
+                logger.error(f"Batch job {job_id} failed: {e}")
+                await asyncio.to_thread(self.store.finish, job_id, self.owner, "failed", str(e))
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        claimed = await asyncio.to_thread(
+            self.store.claim, job_id, self.owner, time.time() - self.lease_seconds
+        )
+        if not claimed:
+            return  # finished, or running on another worker
+        row = await asyncio.to_thread(self.store.get, job_id)
+        request = BatchScoreRequest.model_validate_json(row["request"])
+
+        done = await asyncio.to_thread(self.store.completed_pairs, job_id)
+        pairs = (
+            (r, j)
+            for r in range(len(request.resumes))
+            for j in range(len(request.jobs))
+            if (r, j) not in done
+        )
+        logger.info(f"[START] Batch job {job_id}: {row['total'] - len(done)} pairs remaining")
+
+        limit = request.max_concurrency or settings.BATCH_MAX_CONCURRENCY
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        pending: List[BatchScoreItem] = []
+        last_flush = time.monotonic()
+        try:
+            async for item in iter_scored_pairs(self._engine, request, pairs, limit):
+                pending.append(item)
+                if len(pending) >= _FLUSH_ROWS or time.monotonic() - last_flush >= _FLUSH_SECONDS:
+                    await asyncio.to_thread(self.store.save_results, job_id, self.owner, pending)
+                    pending, last_flush = [], time.monotonic()
+            if pending:
+                await asyncio.to_thread(self.store.save_results, job_id, self.owner, pending)
+        except asyncio.CancelledError:
+            if pending:  # shutting down: keep what is already scored
+                # Shielded so the write completes although this task is being cancelled
+                save = asyncio.ensure_future(
+                    asyncio.to_thread(self.store.save_results, job_id, self.owner, pending)
+                )
+                try:
+                    await asyncio.shield(save)
+                except (asyncio.CancelledError, LeaseLostError):
+                    pass
+            raise
+        finally:
+            heartbeat.cancel()
+
+        await asyncio.to_thread(self.store.finish, job_id, self.owner, "completed")
+        logger.info(f"[OK] Batch job {job_id} completed")
+
+    async def status(self, job_id: str, offset: int = 0, limit: int = 100) -> Optional[BatchJobStatus]:
+        """Progress and a page of results, or None for an unknown job"""
+        return await asyncio.to_thread(self._status, job_id, offset, limit)
+
+    def _status(self, job_id: str, offset: int, limit: int) -> Optional[BatchJobStatus]:
+        row = self.store.get(job_id)
+        if row is None:
+            return None
+        completed, failed = self.store.counts(job_id)
+        return BatchJobStatus(
+            id=job_id,
+            status=row["status"],
+            total_comparisons=row["total"],
+            completed=completed,
+            failed=failed,
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            error=row["error"],
+            offset=offset,
+            limit=limit,
+            results=self.store.results(job_id, offset, limit),
+        )
+
+
+_job_manager: Optional[BatchJobManager] = None
+
+
+def get_job_manager() -> BatchJobManager:
+    """Get global batch job manager"""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = BatchJobManager(
+            BatchJobStore(settings.BATCH_JOBS_DB_PATH),
+            workers=settings.BATCH_JOB_WORKERS,
+            lease_seconds=settings.BATCH_JOB_LEASE_SECONDS,
+        )
+    return _job_manager
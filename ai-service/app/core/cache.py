@@ -3,61 +3,120 @@ Embedding cache layer for performance optimization
 Stores computed embeddings to avoid redundant API calls
 """
 
+from collections import OrderedDict
 import hashlib
-import json
-from typing import Optional, Dict, Any
+import threading
+import time
+from typing import Optional, Dict, Any, Sequence, Tuple, Union
 import logging
+import numpy as np
+from app.config import settings
+from app.core.metrics import record_cache_hit, record_cache_miss
 
 logger = logging.getLogger(__name__)
 
 
 class EmbeddingCache:
-    """In-memory cache for embeddings with TTL support"""
-
-    def __init__(self, max_size: int = 1000):
-        self._cache: Dict[str, Any] = {}
-        self._max_size = max_size
-
-    def _get_key(self, text: str) -> str:
-        """Generate cache key from text hash"""
-        return hashlib.sha256(text.encode()).hexdigest()
-
-    def get(self, text: str) -> Optional[list]:
-        """Retrieve cached embedding"""
-        key = self._get_key(text)
-        if key in self._cache:
-            logger.debug(f"Cache HIT for embedding")
-            return self._cache[key]
-        logger.debug(f"Cache MISS for embedding")
+    """
+    In-memory LRU cache for embeddings with optional TTL
+
+    - Keyed by sha256(model + text) so switching models never serves stale vectors
+    - Stores compact float32 arrays (~4 bytes/dim instead of ~32 for a list of floats)
+    - Sized by a byte budget: least-recently-used entries are evicted first
+    - Thread-safe: one lock guards the map and counters
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl_seconds: Optional[float] = None):
+        self._cache: "OrderedDict[str, Tuple[np.ndarray, Optional[float]]]" = OrderedDict()
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds or None
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _get_key(self, text: str, model: str = "") -> str:
+        """Generate cache key from model + text hash"""
+        return hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+
+    def get(self, text: str, model: str = "") -> Optional[np.ndarray]:
+        """Retrieve cached embedding (refreshes its recency)"""
+        key = self._get_key(text, model)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                embedding, expires_at = entry
+                if expires_at is not None and expires_at <= time.monotonic():
+                    self._remove(key)
+                    self._expirations += 1
+                else:
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    record_cache_hit()
+                    return embedding
+            self._misses += 1
+        record_cache_miss()
         return None
 
-    def set(self, text: str, embedding: list) -> None:
-        """Cache embedding with LRU eviction"""
-        if len(self._cache) >= self._max_size:
-            # Simple eviction: remove first key
-            first_key = next(iter(self._cache))
-            del self._cache[first_key]
-            logger.debug(f"Cache evicted old entry, size={len(self._cache)}")
+    def set(self, text: str, embedding: Union[Sequence[float], np.ndarray], model: str = "") -> None:
+        """Cache embedding with LRU eviction under the byte budget"""
+        key = self._get_key(text, model)
+        # Own copy: a row view would pin its whole parent matrix in memory
+        vector = np.array(embedding, dtype=np.float32)
+        vector.setflags(write=False)  # shared between callers
+        expires_at = time.monotonic() + self._ttl if self._ttl else None
+
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            if vector.nbytes > self._max_bytes:
+                logger.debug("Embedding larger than cache budget, not cached")
+                return
+
+            while self._cache and self._bytes + vector.nbytes > self._max_bytes:
+                oldest_key = next(iter(self._cache))
+                self._remove(oldest_key)
+                self._evictions += 1
+
+            self._cache[key] = (vector, expires_at)
+            self._bytes += vector.nbytes
 
-        key = self._get_key(text)
-        self._cache[key] = embedding
-        logger.debug(f"Cached embedding, cache_size={len(self._cache)}")
+    def _remove(self, key: str) -> None:
+        """Drop an entry and release its bytes (caller holds the lock)"""
+        vector, _ = self._cache.pop(key)
+        self._bytes -= vector.nbytes
 
     def clear(self) -> None:
         """Clear all cache"""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
         logger.info("Cache cleared")
 
     def stats(self) -> Dict[str, Any]:
         """Return cache statistics"""
-        return {
-            "size": len(self._cache),
-            "max_size": self._max_size,
-        }
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._cache),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "ttl_seconds": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
 
 
 # Global cache instance
-_embedding_cache = EmbeddingCache()
+_embedding_cache = EmbeddingCache(
+    max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+    ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+)
 
 
 def get_cache() -> EmbeddingCache:
@@ -0,0 +1,168 @@
+"""
+Process pool for CPU-bound work (local embedding model, skill extraction)
+Keeps encode/regex work off the event loop and spreads it across cores
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import numpy as np
+from app.config import settings
+from app.core.metrics import (
+    cpu_pool_queue_depth,
+    cpu_pool_tasks,
+    cpu_pool_worker_busy_seconds,
+    cpu_pool_worker_utilization,
+)
+
+logger = logging.getLogger(__name__)
+
+# Per-worker state, set once by the pool initializer
+_worker_model = None
+_worker_started = 0.0
+
+
+def _init_worker(model_name: Optional[str]) -> None:
+    """Runs once per worker process: load the embedding model a single time"""
+    global _worker_model, _worker_started
+    _worker_started = time.monotonic()
+    if model_name:
+        from sentence_transformers import SentenceTransformer
+        _worker_model = SentenceTransformer(model_name)
+
+
+def _timed(fn: Callable, *args: Any) -> Tuple[str, float, float, Any]:
+    """Run a task and report (worker, busy seconds, worker uptime, result)"""
+    start = time.monotonic()
+    result = fn(*args)
+    end = time.monotonic()
+    return str(os.getpid()), end - start, end - _worker_started, result
+
+
+def encode_texts(texts: List[str], batch_size: int) -> np.ndarray:
+    """Worker task: encode texts with the worker's local model"""
+    if _worker_model is None:
+        raise RuntimeError("CPU pool worker has no embedding model loaded")
+    return np.asarray(
+        _worker_model.encode(texts, batch_size=batch_size, convert_to_numpy=True), dtype=np.float32
+    )
+
+
+def ping() -> int:
+    """Worker task: no-op that forces a worker to start (and load its model)"""
+    return os.getpid()
+
+
+def extract_skills_many(texts: List[str]) -> List[Set[str]]:
+    """Worker task: skill sets for many texts in one round trip"""
+    from app.core.scoring import extract_skills
+    return [extract_skills(text) for text in texts]
+
+
+class CPUPool:
+    """
+    Why a process pool?
+    -------------------
+    SentenceTransformer.encode and regex scanning hold the GIL, so running them
+    on the event loop (or in threads) serializes every request behind one core.
+
+    Work is shipped to worker processes instead. Each worker loads the local
+    embedding model once in its initializer and keeps it for its lifetime, so
+    throughput scales with CPU_POOL_WORKERS rather than with one core.
+
+    Metrics:
+    --------
+    - cpu_pool_queue_depth: tasks waiting for a free worker
+    - cpu_pool_worker_busy_seconds_total / cpu_pool_worker_utilization: per worker pid
+    """
+
+    def __init__(self, workers: int, model_name: Optional[str] = None):
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),  # torch is not fork-safe
+            initializer=_init_worker,
+            initargs=(model_name,),
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._busy: Dict[str, float] = {}
+        logger.info(f"[OK] CPU pool started with {workers} worker processes")
+
+    def _submit(self, fn: Callable, *args: Any) -> Future:
+        with self._lock:
+            self._in_flight += 1
+            cpu_pool_queue_depth.set(max(0, self._in_flight - self.workers))
+        cpu_pool_tasks.labels(task=fn.__name__).inc()
+        future = self._executor.submit(_timed, fn, *args)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            cpu_pool_queue_depth.set(max(0, self._in_flight - self.workers))
+            if future.cancelled() or future.exception() is not None:
+                return
+            worker, busy, uptime, _ = future.result()
+            self._busy[worker] = self._busy.get(worker, 0.0) + busy
+        cpu_pool_worker_busy_seconds.labels(worker=worker).inc(busy)
+        if uptime > 0:
+            cpu_pool_worker_utilization.labels(worker=worker).set(min(1.0, self._busy[worker] / uptime))
+
+    def run(self, fn: Callable, *args: Any) -> Any:
+        """Run fn(*args) in a worker and block for the result"""
+        return self._submit(fn, *args).result()[3]
+
+    async def run_async(self, fn: Callable, *args: Any) -> Any:
+        """Run fn(*args) in a worker without blocking the event loop"""
+        return (await asyncio.wrap_future(self._submit(fn, *args)))[3]
+
+    def warm_up(self) -> None:
+        """Start every worker now instead of on the first requests"""
+        # Workers spawn on demand, one per submit that finds no idle worker
+        for future in [self._submit(ping) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool statistics"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "busy_seconds": {worker: round(busy, 3) for worker, busy in self._busy.items()},
+            }
+
+
+_cpu_pool: Optional[CPUPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_cpu_pool() -> Optional[CPUPool]:
+    """Get global CPU pool (None when CPU_POOL_WORKERS is 0 - work runs in-process)"""
+    global _cpu_pool
+    if settings.CPU_POOL_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _cpu_pool is None:
+            model_name = settings.LOCAL_EMBEDDING_MODEL if settings.EMBEDDING_PROVIDER == "local" else None
+            _cpu_pool = CPUPool(settings.CPU_POOL_WORKERS, model_name)
+    return _cpu_pool
+
+
+def shutdown_cpu_pool() -> None:
+    """Stop worker processes (called on application shutdown)"""
+    global _cpu_pool
+    with _pool_lock:
+        if _cpu_pool is not None:
+            _cpu_pool.shutdown()
+            _cpu_pool = None
@@ -0,0 +1,214 @@
+"""
+Persistent embedding store backed by memory-mapped float32 matrices
+Survives restarts so the corpus is not re-embedded through the provider
+"""
+
+from typing import Any, Dict, Optional, Sequence, Union
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import numpy as np
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_DIGEST_BYTES = 32  # sha256
+
+
+class _MatrixFile:
+    """
+    One append-only store per provider:model (vector size is fixed per model)
+
+    Files:
+      <name>.f32   row-major float32 matrix, memory-mapped read-only
+      <name>.idx   sha256 digests in row order (row i <-> digest i)
+      <name>.json  metadata (model key, dimension)
+      <name>.lock  flock target serializing appends across workers
+
+    Data rows are written before their digest, so a reader never sees an index
+    entry without its vector. A half-written tail row (crash between the two
+    writes) is simply overwritten by the next append.
+    """
+
+    def __init__(self, directory: str, model_key: str):
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", model_key)
+        self.model_key = model_key
+        self._data_path = os.path.join(directory, f"{name}.f32")
+        self._index_path = os.path.join(directory, f"{name}.idx")
+        self._meta_path = os.path.join(directory, f"{name}.json")
+        self._lock_path = os.path.join(directory, f"{name}.lock")
+        self._lock = threading.Lock()
+        self._rows: Dict[bytes, int] = {}
+        self._index_bytes = 0
+        self._matrix: Optional[np.memmap] = None
+        self.dim: Optional[int] = self._read_dim()
+        self._refresh()
+
+    def _read_dim(self) -> Optional[int]:
+        """Vector size from the metadata file (None until the first vector is stored)"""
+        try:
+            with open(self._meta_path) as f:
+                return int(json.load(f)["dim"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _refresh(self) -> None:
+        """Pick up rows appended since the last look (by this or another worker)"""
+        try:
+            size = os.path.getsize(self._index_path)
+        except OSError:
+            return
+        size -= size % _DIGEST_BYTES
+        if size <= self._index_bytes:
+            return  # nothing new: keep the current mapping
+        if self.dim is None:
+            # Another worker stored the first vector after this one opened the store
+            self.dim = self._read_dim()
+            if self.dim is None:
+                return
+
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_bytes)
+            tail = f.read(size - self._index_bytes)
+
+        # Remap to cover the new rows - the OS shares the pages across workers.
+        # State is only updated once the mapping succeeded, so a failure can be retried
+        self._matrix = np.memmap(
+            self._data_path, dtype=np.float32, mode="r", shape=(size // _DIGEST_BYTES, self.dim)
+        )
+        first_row = self._index_bytes // _DIGEST_BYTES
+        for offset in range(0, len(tail), _DIGEST_BYTES):
+            self._rows.setdefault(tail[offset:offset + _DIGEST_BYTES], first_row + offset // _DIGEST_BYTES)
+        self._index_bytes = size
+
+    def get(self, digest: bytes) -> Optional[np.ndarray]:
+        """Row for digest (read-only view into the mapping), if stored"""
+        with self._lock:
+            row = self._rows.get(digest)
+            if row is None:
+                self._refresh()
+                row = self._rows.get(digest)
+            if row is None:
+                return None
+            return self._matrix[row]
+
+    def put(self, digest: bytes, vector: np.ndarray) -> bool:
+        """Append a vector unless it is already stored; True if written"""
+        with self._lock, open(self._lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                if digest in self._rows:
+                    return False
+                if self.dim is None:
+                    self.dim = self._read_dim()
+                if self.dim is None:
+                    self.dim = int(vector.shape[0])
+                    with open(self._meta_path, "w") as f:
+                        json.dump({"model": self.model_key, "dim": self.dim}, f)
+                elif vector.shape[0] != self.dim:
+                    raise ValueError(
+                        f"Embedding size {vector.shape[0]} does not match store dimension {self.dim}"
+                    )
+
+                offset = (self._index_bytes // _DIGEST_BYTES) * self.dim * 4
+                fd = os.open(self._data_path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    os.pwrite(fd, vector.tobytes(), offset)
+                    os.ftruncate(fd, offset + vector.nbytes)
+                finally:
+                    os.close(fd)
+                with open(self._index_path, "ab") as f:
+                    f.write(digest)
+                self._refresh()
+                return True
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class EmbeddingStore:
+    """
+    On-disk embedding store keyed by (provider, model, sha256(text))
+
+    Why memory-mapped?
+    ------------------
+    - Startup only reads the small digest index; vectors stay on disk until touched
+    - Every uvicorn worker maps the same file, so the page cache is shared
+      instead of each process holding its own copy
+    - Sits behind the in-memory LRU: a store hit warms the LRU, a provider
+      call writes through to both
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._files: Dict[str, _MatrixFile] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _file(self, model_key: str) -> _MatrixFile:
+        with self._lock:
+            if model_key not in self._files:
+                self._files[model_key] = _MatrixFile(self._directory, model_key)
+            return self._files[model_key]
+
+    def _digest(self, text: str) -> bytes:
+        return hashlib.sha256(text.encode()).digest()
+
+    def get(self, text: str, model_key: str) -> Optional[np.ndarray]:
+        """Stored embedding for text under model_key, or None"""
+        vector = self._file(model_key).get(self._digest(text))
+        if vector is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return vector
+
+    def put(self, text: str, model_key: str, embedding: Union[Sequence[float], np.ndarray]) -> None:
+        """Persist an embedding (no-op if already stored)"""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        if self._file(model_key).put(self._digest(text), vector):
+            self._writes += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return store statistics"""
+        with self._lock:
+            files = dict(self._files)
+        return {
+            "directory": self._directory,
+            "hits": self._hits,
+            "misses": self._misses,
+            "writes": self._writes,
+            "models": {key: {"rows": len(f), "dim": f.dim} for key, f in files.items()},
+        }
+
+
+_embedding_store: Optional[EmbeddingStore] = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store() -> Optional[EmbeddingStore]:
+    """Get global store instance (None when EMBEDDING_STORE_PATH is unset)"""
+    global _embedding_store
+    if not settings.EMBEDDING_STORE_PATH:
+        return None
+    with _store_lock:
+        if _embedding_store is None:
+            _embedding_store = EmbeddingStore(settings.EMBEDDING_STORE_PATH)
+            logger.info(f"[OK] Persistent embedding store at {settings.EMBEDDING_STORE_PATH}")
+    return _embedding_store
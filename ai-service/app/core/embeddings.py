@@ -1,17 +1,36 @@
 """
 Embeddings service with multi-provider support
-Supports: OpenAI, Ollama (FREE), and local Sentence Transformers (FREE)
+Supports: OpenAI, Ollama (FREE), local Sentence Transformers (FREE) and hashed lexical vectors
 Explains why embeddings are used and advantages over keyword matching
 """
 
-from typing import List
+from functools import cached_property
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+import asyncio
+import hashlib
+import threading
 import numpy as np
 from app.config import settings
+from app.core.backend_pool import BackendPool, get_backend_pool, parse_endpoints
 from app.core.cache import get_cache
+from app.core.cpu_pool import encode_texts, get_cpu_pool
+from app.core.embedding_store import get_embedding_store
+from app.core.hashed_embeddings import HashedLexicalEncoder
+from app.core.http import get_async_client, get_sync_session
+from app.core.metrics import embedding_latency, time_stage
+from app.core.microbatch import MicroBatcher
+from app.core.resilience import ProviderHTTPError, Resilience, get_resilience
+from app.core.singleflight import SingleFlight
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Coalesces concurrent requests for the same text into one provider call
+_embedding_flight = SingleFlight("embedding")
+# Background warm-up may build the provider clients while a request does
+# (cached_property has no lock since Python 3.12), and a local model must load once
+_create_lock = threading.Lock()
+
 
 class EmbeddingsService:
     """
@@ -30,11 +49,20 @@ class EmbeddingsService:
     1. OpenAI: Best quality, requires API key, costs money
     2. Ollama: FREE, runs locally, good quality
     3. Sentence Transformers: FREE, runs locally, no dependencies
+    4. Hashed: lexical n-gram hashing, sub-millisecond per text, no model at all
     """
 
+    # Whether vectors go to the persistent store (not worth it for cheap providers)
+    persistent = True
+    # Limit/retry/hedge/breaker policy for remote providers (None = call directly)
+    _resilience: Optional[Resilience] = None
+    # Ollama servers to spread calls over
+    _pool: Optional[BackendPool] = None
+
     def __init__(self):
+        # Configuration only - SDK imports, model loading and connectivity checks
+        # wait for first use or warm_up(), so construction is instant and offline
         self.provider = settings.EMBEDDING_PROVIDER
-        self.client = None
 
         if self.provider == "openai":
             self._init_openai()
@@ -42,67 +70,346 @@ class EmbeddingsService:
             self._init_ollama()
         elif self.provider == "local":
             self._init_local()
+        elif self.provider == "hashed":
+            self._init_hashed()
         else:
             raise ValueError(f"Unknown embedding provider: {self.provider}")
 
+        if self.provider in ("openai", "ollama"):
+            endpoints = 1 if self._pool is None else len(self._pool)
+            self._resilience = get_resilience("embedding", self.provider, endpoints)
+        self._init_batcher()
+
+    def _init_batcher(self):
+        """Concurrent single-text requests share one batched provider call"""
+        self._batcher: Optional[MicroBatcher] = None
+        # Hashing one text is cheaper than waiting for the window
+        if settings.EMBEDDING_MICROBATCH_WINDOW_MS > 0 and self.provider != "hashed":
+            self._batcher = MicroBatcher(
+                "embedding",
+                self._provider_batch,
+                self._provider_batch_async,
+                window=settings.EMBEDDING_MICROBATCH_WINDOW_MS / 1000,
+                max_size=settings.EMBEDDING_MICROBATCH_MAX_SIZE,
+            )
+
     def _init_openai(self):
         """Initialize OpenAI embeddings"""
         if not settings.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY required for OpenAI embeddings")
-        
-        from openai import OpenAI
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = settings.OPENAI_EMBEDDING_MODEL
-        logger.info(f"[OK] Using OpenAI embeddings: {self.model}")
 
     def _init_ollama(self):
         """Initialize Ollama embeddings (FREE, local)"""
-        import requests
         self.model = settings.OLLAMA_EMBEDDING_MODEL
-        self.base_url = settings.OLLAMA_BASE_URL
-        
-        # Test Ollama connection
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code != 200:
-                raise ConnectionError("Ollama not running")
-            logger.info(f"[OK] Using Ollama embeddings: {self.model} (FREE, local)")
-        except Exception as e:
-            raise ConnectionError(
-                f"Ollama not accessible at {self.base_url}. "
-                f"Install: https://ollama.ai, then run: ollama pull {self.model}"
-            ) from e
+        self._pool = get_backend_pool("embedding", self.provider, parse_endpoints(settings.OLLAMA_BASE_URL))
 
     def _init_local(self):
         """Initialize local Sentence Transformers (FREE, completely offline)"""
-        from sentence_transformers import SentenceTransformer
         self.model = settings.LOCAL_EMBEDDING_MODEL
-        self.client = SentenceTransformer(self.model)
-        logger.info(f"[OK] Using local embeddings: {self.model} (FREE, offline)")
 
-    def get_embedding(self, text: str) -> List[float]:
-        """Generate embedding vector for text (with caching)"""
+    @cached_property
+    def client(self):
+        """OpenAI client or local SentenceTransformer, built once on first use"""
+        return self._create_once("_client", self._create_client)
+
+    @cached_property
+    def async_client(self):
+        """Async OpenAI client on the shared connection pool, built once on first use"""
+        return self._create_once("_async_client", self._create_async_client)
+
+    def _create_once(self, attr: str, create: Callable[[], Any]) -> Any:
+        with _create_lock:
+            if attr not in self.__dict__:
+                setattr(self, attr, create())
+            return self.__dict__[attr]
+
+    def _create_client(self):
+        if self.provider == "openai":
+            from openai import OpenAI
+            return OpenAI(api_key=settings.OPENAI_API_KEY)
+        if self.provider == "local":
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer(self.model)
+        return None
+
+    def _create_async_client(self):
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=get_async_client())
+
+    def warm_up(self) -> None:
+        """
+        Get ready for the first request: load the local model (in every pool
+        worker when the CPU pool is on), build SDK clients, or check Ollama.
+        Raises ConnectionError when Ollama is unreachable.
+        """
+        if self.provider == "openai":
+            _ = self.client, self.async_client
+            logger.info(f"[OK] Using OpenAI embeddings: {self.model}")
+        elif self.provider == "ollama":
+            try:
+                reachable = self._pool.probe(self._check_ollama)
+            except Exception as e:
+                raise ConnectionError(
+                    f"Ollama not accessible at {', '.join(e.url for e in self._pool.endpoints)}. "
+                    f"Install: https://ollama.ai, then run: ollama pull {self.model}"
+                ) from e
+            logger.info(
+                f"[OK] Using Ollama embeddings: {self.model} (FREE, local), "
+                f"{len(reachable)}/{len(self._pool)} servers up"
+            )
+        elif self.provider == "local":
+            pool = get_cpu_pool()
+            if pool is not None:
+                pool.warm_up()  # each worker loads its copy of the model
+                logger.info(f"[OK] Using local embeddings: {self.model} in {pool.workers} worker processes")
+            else:
+                self._encode_local(["warm-up"])
+                logger.info(f"[OK] Using local embeddings: {self.model} (FREE, offline)")
+        elif self.provider == "hashed":
+            self.client.encode(["warm-up"])
+
+    @staticmethod
+    def _check_ollama(base_url: str) -> None:
+        response = get_sync_session().get(f"{base_url}/api/tags", timeout=5)
+        if response.status_code != 200:
+            raise ConnectionError(f"Ollama not running at {base_url}")
+
+    def _init_hashed(self):
+        """Initialize hashed lexical embeddings (no model, no network)"""
+        idf = np.load(settings.HASHED_EMBEDDING_IDF_PATH) if settings.HASHED_EMBEDDING_IDF_PATH else None
+        self.client = HashedLexicalEncoder(
+            settings.HASHED_EMBEDDING_DIM,
+            settings.HASHED_EMBEDDING_WORD_NGRAMS,
+            settings.HASHED_EMBEDDING_CHAR_MIN,
+            settings.HASHED_EMBEDDING_CHAR_MAX,
+            idf=idf,
+        )
+        self.model = self.client.name
+        # Recomputing is cheaper than a disk write and read - keep vectors in the LRU only
+        self.persistent = False
+        logger.info(f"[OK] Using hashed lexical embeddings: {self.model} (offline, no model)")
+
+    @property
+    def model_key(self) -> str:
+        """Provider + model identifier used to namespace cached vectors"""
+        return f"{self.provider}:{self.model}"
+
+    def get_embedding(self, text: str) -> np.ndarray:
+        """Generate embedding vector for text (with caching) as a float32 array"""
         if not text or not text.strip():
             raise ValueError("Cannot generate embedding for empty text")
 
-        # Check cache first
-        cache = get_cache()
-        cached = cache.get(text)
-        if cached:
+        # Check cache (memory, then disk) first
+        cached = self._lookup(text)
+        if cached is not None:
             return cached
 
-        # Compute embedding
+        # Compute embedding - concurrent identical requests share one provider call
+        return _embedding_flight.do(self._flight_key(text), lambda: self._compute_embedding(text))
+
+    async def get_embedding_async(self, text: str) -> np.ndarray:
+        """Generate embedding vector for text without blocking the event loop"""
+        if not text or not text.strip():
+            raise ValueError("Cannot generate embedding for empty text")
+
+        cached = self._lookup(text)
+        if cached is not None:
+            return cached
+
+        return await _embedding_flight.do_async(
+            self._flight_key(text), lambda: self._compute_embedding_async(text)
+        )
+
+    def _flight_key(self, text: str) -> str:
+        """Single-flight key: provider/model + text hash"""
+        return f"{self.model_key}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+    def _compute_embedding(self, text: str) -> np.ndarray:
+        """Call the provider and cache the result"""
+        if self._batcher is not None:
+            embedding = self._batcher.submit(text)  # timed as a batch call
+        else:
+            with time_stage(embedding_latency, provider=self.provider, model=self.model):
+                embedding = self._provider_call(self._embed_one, text)
+
+        # Cache result
+        return self._remember(text, embedding)
+
+    async def _compute_embedding_async(self, text: str) -> np.ndarray:
+        """Call the provider without blocking and cache the result"""
+        if self._batcher is not None:
+            embedding = await self._batcher.submit_async(text)  # timed as a batch call
+        else:
+            with time_stage(embedding_latency, provider=self.provider, model=self.model):
+                embedding = await self._provider_call_async(self._embed_one_async, text)
+
+        embedding = self._remember(text, embedding, persist=False)
+        await self._persist_async([(text, embedding)])
+        return embedding
+
+    def _provider_call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Provider call through the resilience policy (remote providers only)"""
+        if self._resilience is None:
+            return fn(*args)
+        return self._resilience.call(fn, *args)
+
+    async def _provider_call_async(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        if self._resilience is None:
+            return await fn(*args)
+        return await self._resilience.call_async(fn, *args)
+
+    def _provider_batch(self, texts: List[str]) -> List[List[float]]:
+        return self._provider_call(self._embed_batch, texts)
+
+    async def _provider_batch_async(self, texts: List[str]) -> List[List[float]]:
+        return await self._provider_call_async(self._embed_batch_async, texts)
+
+    def _embed_one(self, text: str) -> Union[List[float], np.ndarray]:
+        """One provider call for a single text"""
         if self.provider == "openai":
-            embedding = self._get_openai_embedding(text)
+            return self._get_openai_embedding(text)
         elif self.provider == "ollama":
-            embedding = self._get_ollama_embedding(text)
+            return self._pool.call(self._get_ollama_embedding, text)
         elif self.provider == "local":
-            embedding = self._get_local_embedding(text)
+            return self._get_local_embedding(text)
+        elif self.provider == "hashed":
+            return self.client.encode([text])[0]
 
-        # Cache result
-        cache.set(text, embedding)
+    async def _embed_one_async(self, text: str) -> Union[List[float], np.ndarray]:
+        """One async provider call for a single text"""
+        if self.provider == "openai":
+            return await self._get_openai_embedding_async(text)
+        elif self.provider == "ollama":
+            return await self._pool.call_async(self._get_ollama_embedding_async, text)
+        elif self.provider == "local":
+            return (await self._encode_local_async([text]))[0]
+        elif self.provider == "hashed":
+            return self.client.encode([text])[0]
+
+    def _lookup(self, text: str) -> Optional[np.ndarray]:
+        """In-memory LRU first, then the persistent store (which warms the LRU)"""
+        cache = get_cache()
+        cached = cache.get(text, self.model_key)
+        if cached is not None:
+            return cached
+
+        store = get_embedding_store() if self.persistent else None
+        stored = store.get(text, self.model_key) if store else None
+        if stored is not None:
+            cache.set(text, stored, self.model_key)  # a miss above, not also a hit
+        return stored
+
+    def _remember(
+        self, text: str, embedding: Union[List[float], np.ndarray], persist: bool = True
+    ) -> np.ndarray:
+        """Write a fresh embedding through to the LRU and (unless persist=False) the persistent store"""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        get_cache().set(text, embedding, self.model_key)
+        if persist:
+            self._persist([(text, embedding)])
         return embedding
 
+    def _persist(self, items: List[Tuple[str, np.ndarray]]) -> None:
+        """Append fresh embeddings to the persistent store (file I/O under the store lock)"""
+        store = get_embedding_store() if self.persistent else None
+        if store:
+            for text, embedding in items:
+                try:
+                    store.put(text, self.model_key, embedding)
+                except Exception as e:
+                    logger.warning(f"Embedding store write failed: {e}")
+
+    async def _persist_async(self, items: List[Tuple[str, np.ndarray]]) -> None:
+        """_persist in a worker thread, so store writes never block the event loop"""
+        if items and self.persistent and get_embedding_store() is not None:
+            await asyncio.to_thread(self._persist, items)
+
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed many texts at once (with caching) - returns an N×d float32 array.
+        Cache hits are served directly; misses go to the provider in batches of
+        EMBEDDING_BATCH_SIZE instead of one request per text.
+        """
+        vectors, misses = self._split_cached(texts)
+        for start in range(0, len(misses), settings.EMBEDDING_BATCH_SIZE):
+            chunk = misses[start:start + settings.EMBEDDING_BATCH_SIZE]
+            self._store_batch(chunk, self._provider_batch(chunk), vectors)
+        return self._assemble(texts, vectors)
+
+    async def get_embeddings_async(self, texts: List[str]) -> np.ndarray:
+        """Batched embeddings without blocking the event loop"""
+        vectors, misses = self._split_cached(texts)
+        for start in range(0, len(misses), settings.EMBEDDING_BATCH_SIZE):
+            chunk = misses[start:start + settings.EMBEDDING_BATCH_SIZE]
+            self._store_batch(chunk, await self._provider_batch_async(chunk), vectors, persist=False)
+            await self._persist_async([(text, vectors[text]) for text in chunk])
+        return self._assemble(texts, vectors)
+
+    def _split_cached(self, texts: List[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """Validate texts and split unique ones into cached vectors and misses"""
+        if any(not text or not text.strip() for text in texts):
+            raise ValueError("Cannot generate embedding for empty text")
+
+        vectors: Dict[str, np.ndarray] = {}
+        misses: List[str] = []
+        for text in dict.fromkeys(texts):
+            cached = self._lookup(text)
+            if cached is not None:
+                vectors[text] = cached
+            else:
+                misses.append(text)
+        return vectors, misses
+
+    def _store_batch(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        vectors: Dict[str, np.ndarray],
+        persist: bool = True,
+    ) -> None:
+        """Cache a provider batch and add it to the result map"""
+        if len(embeddings) != len(texts):
+            raise RuntimeError(f"Expected {len(texts)} embeddings, provider returned {len(embeddings)}")
+        for text, embedding in zip(texts, embeddings):
+            vectors[text] = self._remember(text, embedding, persist)
+
+    def _assemble(self, texts: List[str], vectors: Dict[str, np.ndarray]) -> np.ndarray:
+        """Stack vectors back into input order as a contiguous float32 array"""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.ascontiguousarray(np.stack([vectors[text] for text in texts]), dtype=np.float32)
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """One provider call for a batch of texts"""
+        with time_stage(embedding_latency, provider=self.provider, model=self.model):
+            if self.provider == "openai":
+                response = self.client.embeddings.create(
+                    model=self.model, input=texts, encoding_format="float"
+                )
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+            elif self.provider == "ollama":
+                return self._pool.call(self._get_ollama_embeddings, texts)
+            elif self.provider == "local":
+                return list(self._encode_local(texts))
+            elif self.provider == "hashed":
+                return list(self.client.encode(texts))
+
+    async def _embed_batch_async(self, texts: List[str]) -> List[List[float]]:
+        """One async provider call for a batch of texts"""
+        with time_stage(embedding_latency, provider=self.provider, model=self.model):
+            if self.provider == "openai":
+                response = await self.async_client.embeddings.create(
+                    model=self.model, input=texts, encoding_format="float"
+                )
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+            elif self.provider == "ollama":
+                return await self._pool.call_async(self._get_ollama_embeddings_async, texts)
+            elif self.provider == "local":
+                return list(await self._encode_local_async(texts))
+            elif self.provider == "hashed":
+                return list(await asyncio.to_thread(self.client.encode, texts))
+
     def _get_openai_embedding(self, text: str) -> List[float]:
         """Get embedding from OpenAI"""
         response = self.client.embeddings.create(
@@ -110,30 +417,87 @@ class EmbeddingsService:
         )
         return response.data[0].embedding
 
-    def _get_ollama_embedding(self, text: str) -> List[float]:
+    async def _get_openai_embedding_async(self, text: str) -> List[float]:
+        """Get embedding from the async OpenAI client"""
+        response = await self.async_client.embeddings.create(
+            model=self.model, input=text, encoding_format="float"
+        )
+        return response.data[0].embedding
+
+    def _get_ollama_embedding(self, base_url: str, text: str) -> List[float]:
         """Get embedding from Ollama (FREE)"""
-        import requests
-        
-        response = requests.post(
-            f"{self.base_url}/api/embeddings",
+        response = get_sync_session().post(
+            f"{base_url}/api/embeddings",
             json={"model": self.model, "prompt": text},
             timeout=30
         )
         
         if response.status_code != 200:
-            raise RuntimeError(f"Ollama embedding failed: {response.text}")
+            raise ProviderHTTPError(f"Ollama embedding failed: {response.text}", response.status_code)
         
         return response.json()["embedding"]
 
-    def _get_local_embedding(self, text: str) -> List[float]:
+    async def _get_ollama_embedding_async(self, base_url: str, text: str) -> List[float]:
+        """Get embedding from Ollama over the pooled async client"""
+        response = await get_async_client().post(
+            f"{base_url}/api/embeddings",
+            json={"model": self.model, "prompt": text},
+            timeout=30,
+        )
+
+        if response.status_code != 200:
+            raise ProviderHTTPError(f"Ollama embedding failed: {response.text}", response.status_code)
+
+        return response.json()["embedding"]
+
+    def _get_ollama_embeddings(self, base_url: str, texts: List[str]) -> List[List[float]]:
+        """Batch embeddings from Ollama's /api/embed"""
+        response = get_sync_session().post(
+            f"{base_url}/api/embed",
+            json={"model": self.model, "input": texts},
+            timeout=30
+        )
+        if response.status_code != 200:
+            raise ProviderHTTPError(f"Ollama embedding failed: {response.text}", response.status_code)
+        return response.json()["embeddings"]
+
+    async def _get_ollama_embeddings_async(self, base_url: str, texts: List[str]) -> List[List[float]]:
+        """Batch embeddings from Ollama's /api/embed over the pooled async client"""
+        response = await get_async_client().post(
+            f"{base_url}/api/embed",
+            json={"model": self.model, "input": texts},
+            timeout=30,
+        )
+        if response.status_code != 200:
+            raise ProviderHTTPError(f"Ollama embedding failed: {response.text}", response.status_code)
+        return response.json()["embeddings"]
+
+    def _get_local_embedding(self, text: str) -> np.ndarray:
         """Get embedding from local model (FREE, offline)"""
-        embedding = self.client.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        return self._encode_local([text])[0]
 
-    def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
-        """Calculate cosine similarity between two embeddings"""
-        vec1 = np.array(embedding1)
-        vec2 = np.array(embedding2)
+    def _encode_local(self, texts: List[str]) -> np.ndarray:
+        """Encode with the local model - in the CPU pool when enabled"""
+        pool = get_cpu_pool()
+        if pool is not None:
+            return pool.run(encode_texts, texts, settings.EMBEDDING_BATCH_SIZE)
+        return np.asarray(self.client.encode(
+            texts, batch_size=settings.EMBEDDING_BATCH_SIZE, convert_to_numpy=True
+        ), dtype=np.float32)
+
+    async def _encode_local_async(self, texts: List[str]) -> np.ndarray:
+        """Encode without blocking the event loop (pool worker, else a thread)"""
+        pool = get_cpu_pool()
+        if pool is not None:
+            return await pool.run_async(encode_texts, texts, settings.EMBEDDING_BATCH_SIZE)
+        return await asyncio.to_thread(self._encode_local, texts)
+
+    def calculate_similarity(
+        self, embedding1: Union[List[float], np.ndarray], embedding2: Union[List[float], np.ndarray]
+    ) -> float:
+        """Calculate cosine similarity between two embeddings (in float64, as similarity_matrix)"""
+        vec1 = np.asarray(embedding1, dtype=np.float64)
+        vec2 = np.asarray(embedding2, dtype=np.float64)
 
         dot_product = np.dot(vec1, vec2)
         norm1 = np.linalg.norm(vec1)
@@ -145,8 +509,36 @@ class EmbeddingsService:
         similarity = dot_product / (norm1 * norm2)
         return float((similarity + 1) / 2 * 100)
 
+    def similarity_matrix(self, matrix1: np.ndarray, matrix2: np.ndarray) -> np.ndarray:
+        """
+        Pairwise similarity (0-100) between rows of an M×d and an N×d matrix.
+        Same scale as calculate_similarity, computed as one normalized product -
+        in float64, so a pair scores the same (to the reported 2 decimals) either way.
+        """
+        if matrix1.size == 0 or matrix2.size == 0:
+            return np.zeros((len(matrix1), len(matrix2)))
+        matrix1 = np.asarray(matrix1, dtype=np.float64)
+        matrix2 = np.asarray(matrix2, dtype=np.float64)
+
+        norms1 = np.linalg.norm(matrix1, axis=1, keepdims=True)
+        norms2 = np.linalg.norm(matrix2, axis=1, keepdims=True)
+        cosine = (matrix1 / np.where(norms1 == 0, 1, norms1)) @ (matrix2 / np.where(norms2 == 0, 1, norms2)).T
+
+        scores = (cosine + 1) / 2 * 100
+        # Zero vectors have no direction - match calculate_similarity's 0.0
+        scores[(norms1 == 0).ravel(), :] = 0.0
+        scores[:, (norms2 == 0).ravel()] = 0.0
+        return scores
+
     def get_semantic_similarity(self, text1: str, text2: str) -> float:
         """Calculate semantic similarity between two texts (0-100)"""
         emb1 = self.get_embedding(text1)
         emb2 = self.get_embedding(text2)
         return self.calculate_similarity(emb1, emb2)
+
+    async def get_semantic_similarity_async(self, text1: str, text2: str) -> float:
+        """Async semantic similarity - both embeddings are fetched concurrently"""
+        emb1, emb2 = await asyncio.gather(
+            self.get_embedding_async(text1), self.get_embedding_async(text2)
+        )
+        return self.calculate_similarity(emb1, emb2)
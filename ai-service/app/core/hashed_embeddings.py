@@ -0,0 +1,155 @@
+"""
+Hashed lexical embeddings (EMBEDDING_PROVIDER=hashed)
+Feature hashing over word and character n-grams with TF-IDF weighting - no model, no network
+"""
+
+from typing import List, Optional
+import hashlib
+import re
+import zlib
+import numpy as np
+
+# Tokens keep skill punctuation: c++, c#, node.js, ci/cd -> "ci", "cd"
+_TOKEN = re.compile(r"\w[\w+#]*(?:\.\w+)*")
+_NON_TEXT = re.compile(r"[^\w+#]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this "
+    "to was we were will with you your i my me their they".split()
+)
+
+_PRIME = np.uint64(0x100000001B3)
+_WORD_SALT = np.uint64(0x9E3779B97F4A7C15)
+_CHAR_SALT = np.uint64(0xC2B2AE3D27D4EB4F)
+
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer - spreads polynomial hashes over all 64 bits"""
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+class HashedLexicalEncoder:
+    """
+    Why hashed lexical embeddings?
+    ------------------------------
+    Model-based providers cost milliseconds to seconds per text and need a model
+    server or a model download. For high-volume pre-screening, or where no model
+    is reachable, surface overlap is often enough.
+
+    Each text becomes a fixed-size vector: word unigrams..`word_ngrams` (stopwords
+    dropped) and character n-grams `char_min`..`char_max` are hashed into `dim`
+    buckets with a sign bit (collisions cancel instead of piling up), counts are
+    dampened to log(1 + tf), multiplied by a per-bucket IDF when one is loaded,
+    and L2-normalized. A whole batch is hashed with a handful of NumPy passes,
+    so vectors feed calculate_similarity / similarity_matrix like any other
+    provider's.
+    """
+
+    def __init__(
+        self,
+        dim: int = 4096,
+        word_ngrams: int = 2,
+        char_min: int = 3,
+        char_max: int = 5,
+        idf: Optional[np.ndarray] = None,
+    ):
+        if dim <= 0:
+            raise ValueError("Hashed embedding dimension must be positive")
+        if idf is not None and idf.shape != (dim,):
+            raise ValueError(f"IDF vector has shape {idf.shape}, expected ({dim},)")
+        self.dim = dim
+        self.word_ngrams = max(0, word_ngrams)
+        self.char_min = max(1, char_min)
+        self.char_max = char_max
+        self.idf = None if idf is None else np.asarray(idf, dtype=np.float32)
+
+    @property
+    def name(self) -> str:
+        """Model identifier - changes whenever the vectors would"""
+        name = f"hashed-{self.dim}-w{self.word_ngrams}-c{self.char_min}-{self.char_max}"
+        if self.idf is not None:
+            name += "-idf" + hashlib.sha256(self.idf.tobytes()).hexdigest()[:8]
+        return name
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """N×dim float32 matrix of L2-normalized TF-IDF hashed vectors"""
+        vectors = self._weighted(self._counts(texts))
+        if self.idf is not None:
+            vectors *= self.idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def fit_idf(self, texts: List[str]) -> np.ndarray:
+        """Smoothed per-bucket IDF, log((1 + n) / (1 + df)) + 1, from a reference corpus"""
+        df = np.count_nonzero(self._counts(texts), axis=0)
+        return (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+
+    @staticmethod
+    def _weighted(counts: np.ndarray) -> np.ndarray:
+        """Sublinear term frequency, keeping each bucket's sign"""
+        return (np.sign(counts) * np.log1p(np.abs(counts))).astype(np.float32)
+
+    def _counts(self, texts: List[str]) -> np.ndarray:
+        """Signed feature counts per bucket for every text (N×dim)"""
+        rows, hashes = [], []
+        for fn in (self._word_features, self._char_features):
+            row, h = fn(texts)
+            rows.append(row)
+            hashes.append(h)
+        row, h = np.concatenate(rows), _mix(np.concatenate(hashes))
+
+        buckets = (h % np.uint64(self.dim)).astype(np.int64)
+        signs = np.where(h >> np.uint64(63), -1.0, 1.0)
+        counts = np.bincount(row * self.dim + buckets, weights=signs, minlength=len(texts) * self.dim)
+        return counts.reshape(len(texts), self.dim)
+
+    def _word_features(self, texts: List[str]):
+        """(row, hash) for word n-grams; tokens via crc32, n-grams combined in NumPy"""
+        rows, tokens = [], []
+        for i, text in enumerate(texts):
+            words = [w for w in _TOKEN.findall(text.lower()) if w not in STOPWORDS]
+            rows.extend([i] * len(words))
+            tokens.extend(map(zlib.crc32, map(str.encode, words)))
+        row = np.asarray(rows, dtype=np.int64)
+        token = np.asarray(tokens, dtype=np.uint64)
+
+        out_rows, out_hashes = [], []
+        h = np.zeros(len(token), dtype=np.uint64)
+        for n in range(1, self.word_ngrams + 1):
+            count = len(token) - n + 1
+            if count <= 0:
+                break
+            h = h[:count] * _PRIME + token[n - 1:n - 1 + count]
+            same_row = row[:count] == row[n - 1:n - 1 + count]
+            out_rows.append(row[:count][same_row])
+            out_hashes.append(h[same_row] ^ _WORD_SALT ^ np.uint64(n))
+        if not out_rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint64)
+        return np.concatenate(out_rows), np.concatenate(out_hashes)
+
+    def _char_features(self, texts: List[str]):
+        """(row, hash) for character n-grams: rolling hashes over all texts at once"""
+        chunks = [(" " + _NON_TEXT.sub(" ", text.lower()).strip() + " ").encode() for text in texts]
+        data = np.frombuffer(b"".join(chunks), dtype=np.uint8).astype(np.uint64)
+        row = np.repeat(np.arange(len(texts), dtype=np.int64), [len(c) for c in chunks])
+
+        out_rows, out_hashes = [], []
+        h = np.zeros(len(data), dtype=np.uint64)
+        for n in range(1, self.char_max + 1):
+            count = len(data) - n + 1
+            if count <= 0:
+                break
+            h = h[:count] * _PRIME + data[n - 1:n - 1 + count]
+            if n < self.char_min:
+                continue
+            same_row = row[:count] == row[n - 1:n - 1 + count]  # never span two texts
+            out_rows.append(row[:count][same_row])
+            out_hashes.append(h[same_row] ^ _CHAR_SALT ^ np.uint64(n))
+        if not out_rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint64)
+        return np.concatenate(out_rows), np.concatenate(out_hashes)
+
@@ -0,0 +1,62 @@
+"""
+Shared HTTP clients for provider calls
+One pooled connection set per process instead of a fresh connection per request
+"""
+
+from typing import Optional
+import logging
+import threading
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_async_client: Optional[httpx.AsyncClient] = None
+_sync_session: Optional[requests.Session] = None
+# Background warm-up may create the clients while a request does
+_create_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Get the process-wide pooled async HTTP client (created on first use)"""
+    global _async_client
+    with _create_lock:
+        if _async_client is None or _async_client.is_closed:
+            _async_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.LLM_TIMEOUT, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+            )
+            logger.debug("Created pooled async HTTP client")
+        return _async_client
+
+
+def get_sync_session() -> requests.Session:
+    """Get the process-wide keep-alive session for blocking callers"""
+    global _sync_session
+    with _create_lock:
+        if _sync_session is None:
+            adapter = HTTPAdapter(
+                pool_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                pool_maxsize=settings.HTTP_MAX_CONNECTIONS,
+            )
+            _sync_session = requests.Session()
+            _sync_session.mount("http://", adapter)
+            _sync_session.mount("https://", adapter)
+        return _sync_session
+
+
+async def close_http_clients() -> None:
+    """Close pooled clients (called on application shutdown)"""
+    global _async_client, _sync_session
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    if _sync_session is not None:
+        _sync_session.close()
+        _sync_session = None
+    logger.info("HTTP clients closed")
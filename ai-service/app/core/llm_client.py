@@ -4,13 +4,21 @@ Supports: OpenAI, Ollama (FREE), and any OpenAI-compatible API
 Allows easy switching between providers without code changes
 """
 
-from typing import Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from app.config import settings
+from app.core.backend_pool import BackendPool, get_backend_pool, parse_endpoints
+from app.core.http import get_async_client, get_sync_session
+from app.core.metrics import llm_latency, time_stage
+from app.core.resilience import ProviderHTTPError, Resilience, get_resilience
 import json
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Background warm-up may build the SDK clients while a request does
+_create_lock = threading.Lock()
+
 
 class LLMClient:
     """
@@ -30,73 +38,153 @@ class LLMClient:
     3. Custom: Any OpenAI-compatible API (Groq, Together, LocalAI)
     """
 
+    # Set by __init__; a client built another way calls the provider directly
+    _resilience: Optional[Resilience] = None
+    # Ollama / custom servers to spread calls over (None = the provider's default endpoint)
+    _pool: Optional[BackendPool] = None
+
     def __init__(self):
         self.provider = settings.LLM_PROVIDER
         self.temperature = settings.LLM_TEMPERATURE
         self.max_tokens = settings.LLM_MAX_TOKENS
         self.timeout = settings.LLM_TIMEOUT
 
+        # Configuration only - SDK imports, clients and connectivity checks wait
+        # for first use or warm_up(), so construction is instant and offline
         if self.provider == "openai":
-            self._init_openai()
+            if not settings.OPENAI_API_KEY:
+                raise ValueError("OPENAI_API_KEY required for OpenAI provider")
+            self.model = settings.OPENAI_MODEL
         elif self.provider == "ollama":
-            self._init_ollama()
+            self.model = settings.OLLAMA_MODEL
+            self._pool = get_backend_pool("llm", self.provider, parse_endpoints(settings.OLLAMA_BASE_URL))
         elif self.provider == "custom":
-            self._init_custom()
+            if not parse_endpoints(settings.CUSTOM_API_URL):
+                raise ValueError("CUSTOM_API_URL required for custom provider")
+            self.model = settings.OPENAI_MODEL
+            self._pool = get_backend_pool("llm", self.provider, parse_endpoints(settings.CUSTOM_API_URL))
         else:
             raise ValueError(f"Unknown LLM provider: {self.provider}")
 
-    def _init_openai(self):
-        """Initialize OpenAI client"""
-        if not settings.OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY required for OpenAI provider")
-        
-        from openai import OpenAI
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.model = settings.OPENAI_MODEL
-        logger.info(f"[OK] Using OpenAI LLM: {self.model}")
-
-    def _init_ollama(self):
-        """Initialize Ollama client (FREE, local)"""
-        import requests
-        
-        self.model = settings.OLLAMA_MODEL
-        self.base_url = settings.OLLAMA_BASE_URL
-        
-        # Test Ollama connection
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code != 200:
-                raise ConnectionError("Ollama not running")
-            logger.info(f"[OK] Using Ollama LLM: {self.model} (FREE, local)")
-        except Exception as e:
-            raise ConnectionError(
-                f"Ollama not accessible at {self.base_url}. "
-                f"Install: https://ollama.ai, then run: ollama pull {self.model}"
-            ) from e
-
-    def _init_custom(self):
-        """Initialize custom OpenAI-compatible API"""
-        if not settings.CUSTOM_API_URL:
-            raise ValueError("CUSTOM_API_URL required for custom provider")
-        
-        from openai import OpenAI
-        self.client = OpenAI(
-            api_key=settings.CUSTOM_API_KEY or "dummy",
-            base_url=settings.CUSTOM_API_URL
-        )
-        self.model = settings.OPENAI_MODEL
-        logger.info(f"✓ Using custom LLM API: {settings.CUSTOM_API_URL}")
+        # Concurrency limit, retries, hedging and circuit breaker, shared per provider
+        self._resilience = get_resilience("llm", self.provider, len(self.endpoints) or 1)
+        self._clients: Dict = {}
+
+    @property
+    def endpoints(self) -> List[str]:
+        """Backend base URLs calls are spread over (empty for hosted OpenAI)"""
+        return [] if self._pool is None else [e.url for e in self._pool.endpoints]
+
+    def _openai_kwargs(self, base_url: Optional[str]) -> Dict:
+        if self.provider == "custom":
+            return {"api_key": settings.CUSTOM_API_KEY or "dummy", "base_url": base_url}
+        return {"api_key": settings.OPENAI_API_KEY}
+
+    def client(self, base_url: Optional[str] = None):
+        """Sync OpenAI-compatible client for one endpoint, built on first use"""
+        client = self._clients.get((False, base_url))
+        if client is None:
+            with _create_lock:
+                if (False, base_url) not in self._clients:
+                    from openai import OpenAI
+                    self._clients[(False, base_url)] = OpenAI(**self._openai_kwargs(base_url))
+                client = self._clients[(False, base_url)]
+        return client
+
+    def async_client(self, base_url: Optional[str] = None):
+        """Async OpenAI-compatible client for one endpoint on the shared connection pool"""
+        client = self._clients.get((True, base_url))
+        if client is None:
+            with _create_lock:
+                if (True, base_url) not in self._clients:
+                    from openai import AsyncOpenAI
+                    self._clients[(True, base_url)] = AsyncOpenAI(
+                        **self._openai_kwargs(base_url), http_client=get_async_client()
+                    )
+                client = self._clients[(True, base_url)]
+        return client
+
+    def warm_up(self) -> None:
+        """
+        Get ready for the first request. Unreachable Ollama servers are ejected
+        from the pool; ConnectionError is raised only when none answers.
+        """
+        if self.provider == "ollama":
+            try:
+                reachable = self._pool.probe(self._check_ollama)
+            except Exception as e:
+                raise ConnectionError(
+                    f"Ollama not accessible at {', '.join(self.endpoints)}. "
+                    f"Install: https://ollama.ai, then run: ollama pull {self.model}"
+                ) from e
+            logger.info(
+                f"[OK] Using Ollama LLM: {self.model} (FREE, local), "
+                f"{len(reachable)}/{len(self.endpoints)} servers up"
+            )
+        else:
+            # Import the SDK and build every endpoint's clients ahead of the first request
+            for base_url in self.endpoints or [None]:
+                _ = self.client(base_url), self.async_client(base_url)
+            logger.info(f"[OK] Using {self.provider} LLM: {self.model}")
+
+    @staticmethod
+    def _check_ollama(base_url: str) -> None:
+        response = get_sync_session().get(f"{base_url}/api/tags", timeout=5)
+        if response.status_code != 200:
+            raise ConnectionError(f"Ollama not running at {base_url}")
+
+    def _route(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """fn(base_url, *args) on the least-loaded endpoint"""
+        if self._pool is None:
+            return fn(None, *args)
+        return self._pool.call(fn, *args)
+
+    async def _route_async(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        if self._pool is None:
+            return await fn(None, *args)
+        return await self._pool.call_async(fn, *args)
 
     def generate(self, prompt: str) -> str:
         """Generate completion from LLM"""
-        if self.provider == "openai" or self.provider == "custom":
-            return self._generate_openai(prompt)
-        elif self.provider == "ollama":
-            return self._generate_ollama(prompt)
+        if self._resilience is None:
+            return self._generate(prompt)
+        return self._resilience.call(self._generate, prompt)
+
+    async def generate_async(self, prompt: str) -> str:
+        """Generate completion without blocking the event loop"""
+        if self._resilience is None:
+            return await self._generate_async(prompt)
+        return await self._resilience.call_async(self._generate_async, prompt)
+
+    def _generate(self, prompt: str) -> str:
+        """One provider call"""
+        with time_stage(llm_latency, provider=self.provider, model=self.model):
+            if self.provider == "openai" or self.provider == "custom":
+                return self._route(self._generate_openai, prompt)
+            elif self.provider == "ollama":
+                return self._route(self._generate_ollama, prompt)
+
+    async def _generate_async(self, prompt: str) -> str:
+        """One async provider call"""
+        with time_stage(llm_latency, provider=self.provider, model=self.model):
+            if self.provider == "openai" or self.provider == "custom":
+                return await self._route_async(self._generate_openai_async, prompt)
+            elif self.provider == "ollama":
+                return await self._route_async(self._generate_ollama_async, prompt)
 
-    def _generate_openai(self, prompt: str) -> str:
+    def _generate_openai(self, base_url: Optional[str], prompt: str) -> str:
         """Generate using OpenAI or compatible API"""
-        response = self.client.chat.completions.create(
+        response = self.client(base_url).chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        )
+        return response.choices[0].message.content
+
+    async def _generate_openai_async(self, base_url: Optional[str], prompt: str) -> str:
+        """Generate using the async OpenAI or compatible client"""
+        response = await self.async_client(base_url).chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=self.temperature,
@@ -104,30 +192,45 @@ class LLMClient:
         )
         return response.choices[0].message.content
 
-    def _generate_ollama(self, prompt: str) -> str:
+    def _ollama_payload(self, prompt: str) -> Dict:
+        """Request body for Ollama /api/generate"""
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "format": "json",  # Force JSON output format
+            "options": {
+                "temperature": self.temperature,
+                "num_predict": self.max_tokens,
+            }
+        }
+
+    def _generate_ollama(self, base_url: str, prompt: str) -> str:
         """Generate using Ollama (FREE)"""
-        import requests
-        
-        response = requests.post(
-            f"{self.base_url}/api/generate",
-            json={
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "format": "json",  # Force JSON output format
-                "options": {
-                    "temperature": self.temperature,
-                    "num_predict": self.max_tokens,
-                }
-            },
+        response = get_sync_session().post(
+            f"{base_url}/api/generate",
+            json=self._ollama_payload(prompt),
             timeout=self.timeout
         )
         
         if response.status_code != 200:
-            raise RuntimeError(f"Ollama generation failed: {response.text}")
+            raise ProviderHTTPError(f"Ollama generation failed: {response.text}", response.status_code)
         
         return response.json()["response"]
 
+    async def _generate_ollama_async(self, base_url: str, prompt: str) -> str:
+        """Generate using Ollama over the pooled async client"""
+        response = await get_async_client().post(
+            f"{base_url}/api/generate",
+            json=self._ollama_payload(prompt),
+            timeout=self.timeout,
+        )
+
+        if response.status_code != 200:
+            raise ProviderHTTPError(f"Ollama generation failed: {response.text}", response.status_code)
+
+        return response.json()["response"]
+
     def generate_json(self, prompt: str) -> Dict:
         """
         Generate JSON response from LLM
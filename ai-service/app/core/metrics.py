@@ -5,8 +5,12 @@ Tracks scoring latency, cache hits, and AI service performance
 
 from prometheus_client import Counter, Histogram, Gauge
 import time
+from contextlib import contextmanager
 from functools import wraps
-from typing import Callable, Any
+from typing import Callable, Any, Iterator
+
+# LLM calls take seconds; deterministic stages take milliseconds - cover both
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
 
 # Metrics
 scoring_requests = Counter(
@@ -18,7 +22,14 @@ scoring_requests = Counter(
 scoring_latency = Histogram(
     "scoring_latency_seconds",
     "Scoring latency in seconds",
-    buckets=(0.1, 0.5, 1.0, 2.0, 5.0, 10.0),
+    buckets=LATENCY_BUCKETS,
+)
+
+scoring_stage_latency = Histogram(
+    "scoring_stage_latency_seconds",
+    "score_match latency by stage (skills, embedding, llm, keywords, total)",
+    ["stage", "provider", "model"],
+    buckets=LATENCY_BUCKETS,
 )
 
 cache_hits = Counter(
@@ -31,16 +42,158 @@ cache_misses = Counter(
     "Total cache misses",
 )
 
+result_cache_hits = Counter(
+    "result_cache_hits_total",
+    "Result cache hits (e.g. LLM experience-gap verdicts)",
+    ["cache"],
+)
+
+result_cache_misses = Counter(
+    "result_cache_misses_total",
+    "Result cache misses",
+    ["cache"],
+)
+
+experience_gap_resolutions = Counter(
+    "experience_gap_resolutions_total",
+    "Experience-gap verdicts by source (heuristic = resolved without the LLM)",
+    ["source"],
+)
+
+experience_gap_batches = Counter(
+    "experience_gap_batches_total",
+    "Multi-pair experience-gap prompts by outcome (ok, or fallback to per-pair calls)",
+    ["outcome"],
+)
+
+singleflight_calls = Counter(
+    "singleflight_calls_total",
+    "Provider calls executed by a single-flight leader",
+    ["group"],
+)
+
+singleflight_coalesced = Counter(
+    "singleflight_coalesced_total",
+    "Calls that joined an identical in-flight request instead of calling the provider",
+    ["group"],
+)
+
+cpu_pool_queue_depth = Gauge(
+    "cpu_pool_queue_depth",
+    "CPU pool tasks waiting for a free worker process",
+)
+
+cpu_pool_tasks = Counter(
+    "cpu_pool_tasks_total",
+    "Tasks dispatched to the CPU pool",
+    ["task"],
+)
+
+cpu_pool_worker_busy_seconds = Counter(
+    "cpu_pool_worker_busy_seconds_total",
+    "Seconds each CPU pool worker spent running tasks (rate = utilization)",
+    ["worker"],
+)
+
+cpu_pool_worker_utilization = Gauge(
+    "cpu_pool_worker_utilization",
+    "Fraction of its lifetime each CPU pool worker has been busy",
+    ["worker"],
+)
+
+microbatch_size = Histogram(
+    "microbatch_size",
+    "Items per flushed micro-batch",
+    ["batcher"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+microbatch_queue_delay = Histogram(
+    "microbatch_queue_delay_seconds",
+    "Time an item waited in a micro-batch before the batch call started",
+    ["batcher"],
+    buckets=(0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1),
+)
+
 embedding_latency = Histogram(
     "embedding_latency_seconds",
-    "Embedding generation latency",
-    buckets=(0.05, 0.1, 0.5, 1.0),
+    "Embedding provider call latency",
+    ["provider", "model"],
+    buckets=LATENCY_BUCKETS,
 )
 
 llm_latency = Histogram(
     "llm_latency_seconds",
-    "LLM scoring latency",
-    buckets=(0.5, 1.0, 2.0, 5.0, 10.0),
+    "LLM provider call latency",
+    ["provider", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+
+provider_in_flight = Gauge(
+    "provider_in_flight",
+    "Provider calls currently running (bounded by *_MAX_CONCURRENCY)",
+    ["kind", "provider"],
+)
+
+provider_queue_depth = Gauge(
+    "provider_queue_depth",
+    "Provider calls waiting for a concurrency slot",
+    ["kind", "provider"],
+)
+
+provider_calls = Counter(
+    "provider_calls_total",
+    "Provider call attempts by outcome (ok, error, rejected = circuit open)",
+    ["kind", "provider", "outcome"],
+)
+
+provider_retries = Counter(
+    "provider_retries_total",
+    "Provider calls retried after a transient failure",
+    ["kind", "provider"],
+)
+
+provider_hedges = Counter(
+    "provider_hedges_total",
+    "Hedged provider calls by which request answered first (primary, hedge)",
+    ["kind", "provider", "winner"],
+)
+
+provider_circuit_state = Gauge(
+    "provider_circuit_state",
+    "Circuit breaker state: 0 closed, 1 half-open, 2 open",
+    ["kind", "provider"],
+)
+
+backend_in_flight = Gauge(
+    "backend_in_flight",
+    "Provider calls currently outstanding per backend endpoint",
+    ["kind", "provider", "endpoint"],
+)
+
+backend_requests = Counter(
+    "backend_requests_total",
+    "Provider calls per backend endpoint by outcome (ok, error)",
+    ["kind", "provider", "endpoint", "outcome"],
+)
+
+backend_latency = Histogram(
+    "backend_latency_seconds",
+    "Successful provider call latency per backend endpoint",
+    ["kind", "provider", "endpoint"],
+    buckets=LATENCY_BUCKETS,
+)
+
+backend_healthy = Gauge(
+    "backend_healthy",
+    "1 if the backend endpoint takes traffic, 0 while it is ejected",
+    ["kind", "provider", "endpoint"],
+)
+
+backend_ejections = Counter(
+    "backend_ejections_total",
+    "Backend endpoints ejected after consecutive transient failures",
+    ["kind", "provider", "endpoint"],
 )
 
 active_requests = Gauge(
@@ -48,6 +201,17 @@ active_requests = Gauge(
     "Active scoring requests",
 )
 
+component_ready = Gauge(
+    "ai_service_component_ready",
+    "1 once a component (llm, embeddings, http, caches, cpu_pool) has warmed up",
+    ["component"],
+)
+
+time_to_ready = Gauge(
+    "ai_service_time_to_ready_seconds",
+    "Seconds from startup until every component was warm",
+)
+
 
 def track_latency(metric: Histogram) -> Callable:
     """Decorator to track operation latency"""
@@ -68,6 +232,16 @@ def track_latency(metric: Histogram) -> Callable:
     return decorator
 
 
+@contextmanager
+def time_stage(metric: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the duration of the with-block (also when it raises)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric.labels(**labels).observe(time.perf_counter() - start)
+
+
 def record_cache_hit() -> None:
     """Record cache hit"""
     cache_hits.inc()
@@ -0,0 +1,157 @@
+"""
+Dynamic micro-batching
+Concurrent single-item requests are collected for a few milliseconds and sent as one batch call
+"""
+
+from typing import Any, Awaitable, Callable, Generic, List, Optional, TypeVar
+import asyncio
+import logging
+import threading
+import time
+from app.core.metrics import microbatch_queue_delay, microbatch_size
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _Batch:
+    """A batch being collected (items plus their enqueue times)"""
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.enqueued: List[float] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results: Optional[List[Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncBatch:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.items: List[Any] = []
+        self.enqueued: List[float] = []
+        self.full = asyncio.Event()
+        self.task: Optional["asyncio.Future[List[Any]]"] = None
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Why micro-batching?
+    -------------------
+    Embedding backends (sentence-transformers, Ollama /api/embed, OpenAI) process a
+    list of texts for roughly the cost of one, but concurrent requests each arrive
+    with a single text.
+
+    The first request opens a batch; requests arriving meanwhile join it. If no
+    batch call is in flight the batch is flushed at once (after one event-loop
+    turn on the async path, so callers started together still share it): a lone
+    request never pays the window. Otherwise it waits up to `window` seconds or
+    until it reaches `max_size`. Each caller gets back its own element of the
+    result; a failed batch call fails every caller in it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[List[T]], List[R]],
+        fn_async: Callable[[List[T]], Awaitable[List[R]]],
+        window: float,
+        max_size: int,
+    ):
+        self.name = name
+        self.window = window
+        self.max_size = max(1, max_size)
+        self._fn = fn
+        self._fn_async = fn_async
+        self._lock = threading.Lock()
+        self._open: Optional[_Batch] = None
+        self._open_async: Optional[_AsyncBatch] = None
+        self._in_flight = 0  # batch calls running (either path)
+
+    def submit(self, item: T) -> R:
+        """Add item to the current batch (threads) and block for its result"""
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            index = len(batch.items)
+            batch.items.append(item)
+            batch.enqueued.append(time.monotonic())
+            if len(batch.items) >= self.max_size:
+                self._open = None
+                batch.full.set()
+
+        if leader:
+            if self._in_flight:
+                batch.full.wait(self.window)
+            with self._lock:
+                if self._open is batch:
+                    self._open = None
+                self._in_flight += 1
+            try:
+                batch.results = self._checked(batch.items, self._run(batch, self._fn))
+            except BaseException as e:
+                batch.error = e
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[index]
+
+    async def submit_async(self, item: T) -> R:
+        """Add item to the current batch (coroutines) and await its result"""
+        loop = asyncio.get_running_loop()
+        batch = self._open_async
+        if batch is None or batch.loop is not loop:
+            batch = self._open_async = _AsyncBatch(loop)
+            # Own task so one caller's cancellation does not cancel the batch
+            batch.task = asyncio.ensure_future(self._flush_async(batch))
+        index = len(batch.items)
+        batch.items.append(item)
+        batch.enqueued.append(time.monotonic())
+        if len(batch.items) >= self.max_size:
+            self._open_async = None
+            batch.full.set()
+
+        results = await asyncio.shield(batch.task)
+        return results[index]
+
+    async def _flush_async(self, batch: _AsyncBatch) -> List[R]:
+        if self._in_flight:
+            try:
+                await asyncio.wait_for(batch.full.wait(), self.window)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            await asyncio.sleep(0)  # let callers scheduled in the same turn join
+        if self._open_async is batch:
+            self._open_async = None
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._checked(batch.items, await self._run(batch, self._fn_async))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _run(self, batch: Any, fn: Callable[[List[T]], Any]) -> Any:
+        """Record batch metrics and start the batch call"""
+        start = time.monotonic()
+        microbatch_size.labels(batcher=self.name).observe(len(batch.items))
+        for enqueued in batch.enqueued:
+            microbatch_queue_delay.labels(batcher=self.name).observe(start - enqueued)
+        return fn(list(batch.items))
+
+    def _checked(self, items: List[T], results: List[R]) -> List[R]:
+        if len(results) != len(items):
+            raise RuntimeError(f"{self.name} batch returned {len(results)} results for {len(items)} items")
+        return results
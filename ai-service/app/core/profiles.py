@@ -0,0 +1,242 @@
+"""
+Registered document profiles (resumes and jobs scored by id)
+Per-document features computed once at registration; bounded memory tier with optional SQLite persistence
+"""
+
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+import json
+import logging
+import os
+import sqlite3
+import threading
+import numpy as np
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileNotFoundError(LookupError):
+    """A referenced profile id is not registered"""
+
+
+class DocumentProfile(NamedTuple):
+    """
+    Everything scoring needs from one document, so scoring by id skips the
+    payload and the per-document work (cleaning, skills, keywords, embedding)
+    """
+    id: str
+    kind: str  # "resume" or "job"
+    text: str  # normalized; for jobs the description (requirements kept apart)
+    requirements: str
+    skills: FrozenSet[str]  # from text (+ requirements for jobs), as scoring extracts them
+    keywords: FrozenSet[str]  # role keyword hits in text
+    embedding: np.ndarray  # float32, of the same truncated text score_match embeds
+    embedding_model: str  # EmbeddingsService.model_key the vector belongs to
+    content_hash: str  # sha256 of kind, text and requirements
+    registered_at: float
+
+
+class ProfileStore:
+    """
+    Why profiles?
+    -------------
+    A job scored against hundreds of resumes used to be sent, cleaned, scanned
+    for skills and embedded once per request. Registering it stores those
+    features under the caller's id; /score, /batch-score and /rank then take
+    ids and reuse them. Re-registering unchanged content is free (same
+    content_hash and embedding model).
+
+    Disk tier (optional): SQLite table, the source of truth, so registrations
+    survive restarts and are shared by every worker. Memory tier: bounded LRU
+    of decoded profiles. With a disk tier each entry remembers the row version
+    it was read at and is reused only while the row still has that version
+    (one primary-key lookup), so another worker's update or delete is seen
+    immediately. Without one the memory tier is the store and profiles evicted
+    from it must be registered again.
+    """
+
+    _COLUMNS = (
+        "id, kind, text, requirements, skills, keywords, "
+        "embedding, embedding_model, content_hash, registered_at"
+    )
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10_000):
+        self._profiles: "OrderedDict[str, Tuple[int, DocumentProfile]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._path = path
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS profiles (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    requirements TEXT NOT NULL,
+                    skills TEXT NOT NULL,
+                    keywords TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    embedding_model TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    registered_at REAL NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            # Stores created before the version column
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(profiles)")}
+            if "version" not in columns:
+                self._db.execute("ALTER TABLE profiles ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            self._db.commit()
+
+    def get(self, doc_id: str) -> Optional[DocumentProfile]:
+        """Profile registered under doc_id, or None"""
+        with self._lock:
+            return self._lookup([doc_id]).get(doc_id)
+
+    def get_many(self, doc_ids: List[str], kind: str) -> List[DocumentProfile]:
+        """Profiles for ids in order; ProfileNotFoundError if one is missing or of another kind"""
+        with self._lock:
+            found = self._lookup(list(dict.fromkeys(doc_ids)))
+        profiles = []
+        for doc_id in doc_ids:
+            profile = found.get(doc_id)
+            if profile is None or profile.kind != kind:
+                raise ProfileNotFoundError(f"No {kind} profile registered as {doc_id}")
+            profiles.append(profile)
+        return profiles
+
+    def _lookup(self, doc_ids: List[str]) -> Dict[str, DocumentProfile]:
+        """Current profiles for distinct ids, reading only rows that changed (caller holds the lock)"""
+        if self._db is None:
+            found = {}
+            for doc_id in doc_ids:
+                if doc_id in self._profiles:
+                    self._profiles.move_to_end(doc_id)
+                    found[doc_id] = self._profiles[doc_id][1]
+            return found
+
+        found, stale = {}, []
+        for start in range(0, len(doc_ids), 500):  # stay under SQLite's bound-parameter limit
+            chunk = doc_ids[start:start + 500]
+            marks = ", ".join("?" * len(chunk))
+            versions = dict(
+                self._db.execute(f"SELECT id, version FROM profiles WHERE id IN ({marks})", chunk)
+            )
+            for doc_id in chunk:
+                cached = self._profiles.get(doc_id)
+                if doc_id not in versions:
+                    self._profiles.pop(doc_id, None)  # removed, possibly by another worker
+                elif cached is not None and cached[0] == versions[doc_id]:
+                    self._profiles.move_to_end(doc_id)
+                    found[doc_id] = cached[1]
+                else:
+                    stale.append(doc_id)
+
+        for doc_id in stale:
+            row = self._db.execute(
+                f"SELECT {self._COLUMNS}, version FROM profiles WHERE id = ?", (doc_id,)
+            ).fetchone()
+            if row is not None:
+                found[doc_id] = self._from_row(row[:-1])
+                self._remember(doc_id, row[-1], found[doc_id])
+        return found
+
+    def _remember(self, doc_id: str, version: int, profile: DocumentProfile) -> None:
+        """Insert into the memory tier with LRU eviction (caller holds the lock)"""
+        self._profiles[doc_id] = (version, profile)
+        self._profiles.move_to_end(doc_id)
+        while len(self._profiles) > self._max_entries:
+            self._profiles.popitem(last=False)
+
+    def put(self, profile: DocumentProfile) -> None:
+        """Insert or replace a profile on disk (if enabled) and in memory"""
+        with self._lock:
+            if self._db is None:
+                self._remember(profile.id, 0, profile)
+                return
+            try:
+                # The upsert bumps the row version, which invalidates other workers' copies
+                version = self._db.execute(
+                    f"INSERT INTO profiles ({self._COLUMNS}, version) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1) "
+                    "ON CONFLICT(id) DO UPDATE SET "
+                    "kind = excluded.kind, text = excluded.text, requirements = excluded.requirements, "
+                    "skills = excluded.skills, keywords = excluded.keywords, embedding = excluded.embedding, "
+                    "embedding_model = excluded.embedding_model, content_hash = excluded.content_hash, "
+                    "registered_at = excluded.registered_at, version = profiles.version + 1 "
+                    "RETURNING version",
+                    (
+                        profile.id,
+                        profile.kind,
+                        profile.text,
+                        profile.requirements,
+                        json.dumps(sorted(profile.skills)),
+                        json.dumps(sorted(profile.keywords)),
+                        np.asarray(profile.embedding, dtype=np.float32).tobytes(),
+                        profile.embedding_model,
+                        profile.content_hash,
+                        profile.registered_at,
+                    ),
+                ).fetchall()[0][0]
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Profile write failed for {profile.id}: {e}")
+                self._profiles.pop(profile.id, None)
+                return
+            self._remember(profile.id, version, profile)
+
+    def remove(self, doc_id: str) -> bool:
+        """Delete a profile; returns False if it was not registered"""
+        with self._lock:
+            removed = self._profiles.pop(doc_id, None) is not None
+            if self._db is not None:
+                removed = self._db.execute("DELETE FROM profiles WHERE id = ?", (doc_id,)).rowcount > 0
+                self._db.commit()
+            return removed
+
+    @staticmethod
+    def _from_row(row: tuple) -> DocumentProfile:
+        (doc_id, kind, text, requirements, skills, keywords,
+         embedding, embedding_model, content_hash, registered_at) = row
+        return DocumentProfile(
+            id=doc_id,
+            kind=kind,
+            text=text,
+            requirements=requirements,
+            skills=frozenset(json.loads(skills)),
+            keywords=frozenset(json.loads(keywords)),
+            embedding=np.frombuffer(embedding, dtype=np.float32),
+            embedding_model=embedding_model,
+            content_hash=content_hash,
+            registered_at=registered_at,
+        )
+
+    def stats(self) -> Dict[str, object]:
+        """Return store statistics"""
+        with self._lock:
+            stored = None
+            if self._db is not None:
+                stored = self._db.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+            return {"loaded": len(self._profiles), "stored": stored, "persistent": self._path}
+
+
+_profile_store: Optional[ProfileStore] = None
+_profile_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    """Get global document profile store"""
+    global _profile_store
+    with _profile_lock:
+        if _profile_store is None:
+            _profile_store = ProfileStore(
+                settings.PROFILE_STORE_PATH, max_entries=settings.PROFILE_CACHE_MAX_ENTRIES
+            )
+    return _profile_store
@@ -0,0 +1,426 @@
+"""
+Resilience layer for provider calls (LLM, embeddings)
+Concurrency limit, jittered retries, hedged requests and a circuit breaker per provider
+"""
+
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, Optional, Tuple
+import asyncio
+import logging
+import random
+import threading
+import time
+from app.config import settings
+from app.core.metrics import (
+    provider_calls,
+    provider_circuit_state,
+    provider_hedges,
+    provider_in_flight,
+    provider_queue_depth,
+    provider_retries,
+)
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth another attempt: timeouts, conflicts, throttling, server errors
+RETRYABLE_STATUS = {408, 409, 425, 429}
+# Transport failures by class name, so neither httpx, requests nor openai must be imported here
+RETRYABLE_ERRORS = {
+    "ConnectError", "ConnectTimeout", "ReadTimeout", "WriteTimeout", "PoolTimeout", "ReadError",
+    "RemoteProtocolError", "TimeoutException", "NetworkError",  # httpx
+    "ConnectionError", "Timeout", "ChunkedEncodingError",  # requests
+    "APIConnectionError", "APITimeoutError",  # openai
+}
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised without calling the provider while its circuit is open"""
+
+
+class ProviderHTTPError(RuntimeError):
+    """Non-2xx answer from a provider; status_code decides whether it is retried"""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient failure (network, timeout, 408/409/425/429/5xx) rather than a bad request"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS or status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+
+class ConcurrencyLimiter:
+    """
+    At most `limit` calls in flight (0 = unlimited), shared by threads and
+    coroutines on any event loop. Waiters are served FIFO: a released slot is
+    handed straight to the next waiter.
+    """
+
+    def __init__(self, limit: int, on_change: Optional[Callable[[int, int], None]] = None):
+        self.limit = limit
+        self._on_change = on_change or (lambda active, waiting: None)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: Deque[Any] = deque()
+
+    def _free(self) -> bool:
+        return self.limit <= 0 or (self._active < self.limit and not self._waiters)
+
+    def _changed(self) -> None:
+        self._on_change(self._active, len(self._waiters))
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now"""
+        with self._lock:
+            if not self._free():
+                return False
+            self._active += 1
+            self._changed()
+            return True
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._free():
+                self._active += 1
+                self._changed()
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+            self._changed()
+        event.wait()  # release() hands the slot over
+
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free():
+                self._active += 1
+                self._changed()
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+            self._changed()
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    self._changed()
+                    raise
+            # The slot was already handed over: pass it on (a cancelled future is passed on by _wake)
+            if not waiter[1].cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                self._changed()
+                return
+            waiter = self._waiters.popleft()  # the slot moves to the waiter; active is unchanged
+            self._changed()
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+            return
+        loop, future = waiter
+        try:
+            loop.call_soon_threadsafe(self._wake, future)
+        except RuntimeError:  # loop closed - nobody will take the slot
+            self.release()
+
+    def _wake(self, future: "asyncio.Future[None]") -> None:
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def slot_async(self) -> AsyncIterator[None]:
+        await self.acquire_async()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive transient failures;
+    open -> half-open after `reset_seconds`, letting one trial call through;
+    the trial's outcome closes or re-opens it. failure_threshold 0 = never open.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_seconds: float,
+        on_change: Optional[Callable[[int], None]] = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._on_change = on_change or (lambda state: None)
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+
+    def _set(self, state: int) -> None:
+        if state != self.state:
+            self.state = state
+            self._on_change(state)
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError unless a call may go to the provider now; True for the half-open trial"""
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.reset_seconds - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpenError(f"circuit open, retry in {remaining:.1f}s")
+                self._set(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._trial:
+                    raise CircuitOpenError("circuit half-open, trial call in flight")
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial = False
+            self._set(self.CLOSED)
+
+    def abandon(self) -> None:
+        """The trial call was cancelled before it said anything about the provider"""
+        with self._lock:
+            self._trial = False  # still half-open: the next call is the trial
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial = False
+            tripped = self.failure_threshold > 0 and self._failures >= self.failure_threshold
+            if self.state == self.HALF_OPEN or tripped:
+                self._opened_at = time.monotonic()
+                self._set(self.OPEN)
+
+
+class Resilience:
+    """
+    Why a resilience layer?
+    -----------------------
+    A provider call used to be one attempt with a 30s timeout. When Ollama was
+    saturated every request queued on it, and the slow tail set our p99.
+
+    Every call now goes through, in order:
+      1. Circuit breaker - fails fast (CircuitOpenError) while the provider is down
+      2. Concurrency limiter - at most `max_concurrency` calls in flight; the rest
+         wait here instead of piling onto the provider
+      3. Hedging (async only, hedge_quantile set) - if the call is slower than that
+         quantile of recent latencies and a slot is free, a second identical call
+         starts; the first answer wins and the other is cancelled
+      4. Retries - transient failures are retried up to `max_retries` times with
+         full-jitter exponential backoff (uniform in [0, backoff * 2^attempt])
+
+    Metrics (labels kind, provider): provider_in_flight, provider_queue_depth,
+    provider_calls_total{outcome}, provider_retries_total, provider_hedges_total{winner},
+    provider_circuit_state
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        provider: str,
+        max_concurrency: int = 0,
+        max_retries: int = 0,
+        backoff_seconds: float = 0.5,
+        hedge_quantile: Optional[float] = None,
+        circuit_failures: int = 5,
+        circuit_reset_seconds: float = 30.0,
+        min_hedge_samples: int = 20,
+    ):
+        self.kind = kind
+        self.provider = provider
+        self.max_retries = max(0, max_retries)
+        self.backoff_seconds = backoff_seconds
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_samples = min_hedge_samples
+        labels = {"kind": kind, "provider": provider}
+        self._labels = labels
+
+        def limiter_changed(active: int, waiting: int) -> None:
+            provider_in_flight.labels(**labels).set(active)
+            provider_queue_depth.labels(**labels).set(waiting)
+
+        def circuit_changed(state: int) -> None:
+            provider_circuit_state.labels(**labels).set(state)
+            if state == CircuitBreaker.OPEN:
+                logger.warning(f"{kind} provider {provider}: circuit open for {circuit_reset_seconds}s")
+            elif state == CircuitBreaker.CLOSED:
+                logger.info(f"[OK] {kind} provider {provider}: circuit closed")
+
+        self.limiter = ConcurrencyLimiter(max_concurrency, limiter_changed)
+        self.breaker = CircuitBreaker(circuit_failures, circuit_reset_seconds, circuit_changed)
+        self._latencies: Deque[float] = deque(maxlen=256)
+        provider_circuit_state.labels(**labels).set(CircuitBreaker.CLOSED)
+
+    def call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking provider call with limit, retries and circuit breaker"""
+        for attempt in range(self.max_retries + 1):
+            trial = self._admit()
+            try:
+                with self.limiter.slot():
+                    result = self._timed(fn, *args)
+            except Exception as e:
+                if not self._failed(e, attempt):
+                    raise
+                time.sleep(self._backoff(attempt))
+            except BaseException:
+                if trial:
+                    self.breaker.abandon()
+                raise
+            else:
+                return self._succeeded(result)
+
+    async def call_async(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Async provider call with limit, hedging, retries and circuit breaker"""
+        for attempt in range(self.max_retries + 1):
+            trial = self._admit()
+            try:
+                async with self.limiter.slot_async():
+                    result = await self._hedged(fn, *args)
+            except Exception as e:
+                if not self._failed(e, attempt):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+            except BaseException:  # cancelled while queued or in flight, e.g. a hedge that lost
+                if trial:
+                    self.breaker.abandon()
+                raise
+            else:
+                return self._succeeded(result)
+
+    def _admit(self) -> bool:
+        try:
+            return self.breaker.before_call()
+        except CircuitOpenError:
+            provider_calls.labels(**self._labels, outcome="rejected").inc()
+            raise
+
+    def _succeeded(self, result: Any) -> Any:
+        self.breaker.record_success()
+        provider_calls.labels(**self._labels, outcome="ok").inc()
+        return result
+
+    def _failed(self, error: Exception, attempt: int) -> bool:
+        """Record a failed attempt; True if it should be retried"""
+        provider_calls.labels(**self._labels, outcome="error").inc()
+        if not is_retryable(error):
+            self.breaker.record_success()  # the provider answered - it is up
+            return False
+        self.breaker.record_failure()
+        if attempt >= self.max_retries or self.breaker.state == CircuitBreaker.OPEN:
+            return False
+        provider_retries.labels(**self._labels).inc()
+        logger.warning(f"{self.kind} call to {self.provider} failed ({error}); retry {attempt + 1}/{self.max_retries}")
+        return True
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, self.backoff_seconds * 2 ** attempt)
+
+    def _timed(self, fn: Callable[..., Any], *args: Any) -> Any:
+        start = time.monotonic()
+        result = fn(*args)
+        self._latencies.append(time.monotonic() - start)
+        return result
+
+    async def _timed_async(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        start = time.monotonic()
+        result = await fn(*args)
+        self._latencies.append(time.monotonic() - start)
+        return result
+
+    def hedge_delay(self) -> Optional[float]:
+        """hedge_quantile of recent successful latencies (None = do not hedge yet)"""
+        if self.hedge_quantile is None or len(self._latencies) < self.min_hedge_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(self.hedge_quantile * len(ordered)))]
+
+    async def _hedged(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        primary = asyncio.ensure_future(self._timed_async(fn, *args))
+        delay = self.hedge_delay()
+        if delay is None:
+            return await primary
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except BaseException:  # asyncio.wait does not cancel what it waits on
+            primary.cancel()
+            raise
+        if done or not self.limiter.try_acquire():
+            return await primary  # fast enough, or no spare capacity to hedge with
+
+        hedge = asyncio.ensure_future(self._timed_async(fn, *args))
+        hedge.add_done_callback(lambda _: self.limiter.release())
+        calls: Dict["asyncio.Future[Any]", str] = {primary: "primary", hedge: "hedge"}
+        try:
+            pending = set(calls)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for call in done:
+                    if call.exception() is None:
+                        provider_hedges.labels(**self._labels, winner=calls[call]).inc()
+                        return call.result()
+            return primary.result()  # both failed: surface the primary's error
+        finally:
+            for call in calls:
+                if not call.done():
+                    call.cancel()
+                # Consume the loser's outcome so it is never reported as unretrieved
+                call.add_done_callback(lambda c: c.cancelled() or c.exception())
+
+
+_resilience: Dict[Tuple[str, str, int], Resilience] = {}
+_resilience_lock = threading.Lock()
+
+
+def get_resilience(kind: str, provider: str, endpoints: int = 1) -> Resilience:
+    """
+    Shared policy for one provider ("llm" or "embedding"), configured from settings;
+    the concurrency limit is per backend endpoint, so it scales with the pool
+    """
+    prefix = "LLM" if kind == "llm" else "EMBEDDING"
+    with _resilience_lock:
+        if (kind, provider, endpoints) not in _resilience:
+            _resilience[(kind, provider, endpoints)] = Resilience(
+                kind,
+                provider,
+                max_concurrency=getattr(settings, f"{prefix}_MAX_CONCURRENCY") * endpoints,
+                max_retries=getattr(settings, f"{prefix}_MAX_RETRIES"),
+                backoff_seconds=getattr(settings, f"{prefix}_RETRY_BACKOFF_SECONDS"),
+                hedge_quantile=getattr(settings, f"{prefix}_HEDGE_QUANTILE"),
+                circuit_failures=getattr(settings, f"{prefix}_CIRCUIT_FAILURES"),
+                circuit_reset_seconds=getattr(settings, f"{prefix}_CIRCUIT_RESET_SECONDS"),
+            )
+        return _resilience[(kind, provider, endpoints)]
@@ -0,0 +1,134 @@
+"""
+Result cache for expensive, deterministic-enough computations (e.g. LLM verdicts)
+In-memory LRU with optional SQLite persistence shared across restarts and workers
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+from app.config import settings
+from app.core.metrics import result_cache_hits, result_cache_misses
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    LRU cache of JSON-serializable results keyed by a hash of their inputs
+
+    - Memory tier: bounded OrderedDict (least-recently-used evicted first)
+    - Disk tier (optional): SQLite table consulted on memory misses, so
+      verdicts survive restarts and are shared by every worker
+    """
+
+    def __init__(self, name: str, max_entries: int = 10_000, path: Optional[str] = None):
+        self.name = name
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._path = path
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Stable hash of the inputs that determine a result"""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached result for key (memory first, then disk), or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._record_hit(self._entries[key])
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value)
+                    return self._record_hit(value)
+
+            self._misses += 1
+            result_cache_misses.labels(cache=self.name).inc()
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a result in memory and (if enabled) on disk"""
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                        (key, json.dumps(value)),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"{self.name} cache write failed: {e}")
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert into the memory tier with LRU eviction (caller holds the lock)"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _record_hit(self, value: Any) -> Any:
+        self._hits += 1
+        result_cache_hits.labels(cache=self.name).inc()
+        return value
+
+    def clear(self) -> None:
+        """Clear both tiers"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+        logger.info(f"{self.name} cache cleared")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "persistent": self._path,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_experience_cache: Optional[ResultCache] = None
+_experience_lock = threading.Lock()
+
+
+def get_experience_cache() -> ResultCache:
+    """Get global experience-gap verdict cache"""
+    global _experience_cache
+    with _experience_lock:
+        if _experience_cache is None:
+            _experience_cache = ResultCache(
+                "experience_gap",
+                max_entries=settings.EXPERIENCE_CACHE_MAX_ENTRIES,
+                path=settings.EXPERIENCE_CACHE_PATH,
+            )
+    return _experience_cache
@@ -0,0 +1,70 @@
+"""
+Content-addressed cache of full /score responses
+Keyed by the scored (normalized) inputs + the engine's config version; entries carry a strong ETag
+"""
+
+from typing import Any, Dict, Optional
+import hashlib
+import re
+import threading
+import unicodedata
+from app.config import settings
+from app.core.result_cache import ResultCache
+
+_TRAILING_SPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+_score_cache: Optional[ResultCache] = None
+_score_lock = threading.Lock()
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Canonical form of a document: NFC, \\n line endings, no trailing spaces per
+    line or surrounding blank space. /score and profile registration score this
+    form, so inputs differing only in these ways get the same (cached) result
+    """
+    text = unicodedata.normalize("NFC", text or "").replace("\r\n", "\n").replace("\r", "\n")
+    return _TRAILING_SPACE.sub("", text).strip()
+
+
+def score_cache_key(config_version: str, resume_text: str, job_description: str, job_requirements: str = "") -> str:
+    """Cache key for one (resume, job, requirements) triple, exactly as scored, under one scoring config"""
+    return ResultCache.make_key("score", config_version, resume_text, job_description, job_requirements)
+
+
+def make_entry(body: str) -> Dict[str, str]:
+    """Cache entry for a serialized response: the JSON body and its strong ETag"""
+    return {"etag": '"' + hashlib.sha256(body.encode()).hexdigest()[:32] + '"', "body": body}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check: "*" or any listed tag, compared weakly (RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    """
+    Skip results that a retry could improve: "Unknown" experience means the LLM
+    failed, except in heuristic mode where it is the deterministic answer
+    """
+    return result.get("experience_gap") != "Unknown" or settings.EXPERIENCE_MODE == "heuristic"
+
+
+def get_score_cache() -> Optional[ResultCache]:
+    """Get global /score result cache (None when SCORE_CACHE_MAX_ENTRIES is 0)"""
+    global _score_cache
+    if settings.SCORE_CACHE_MAX_ENTRIES <= 0:
+        return None
+    with _score_lock:
+        if _score_cache is None:
+            _score_cache = ResultCache(
+                "score",
+                max_entries=settings.SCORE_CACHE_MAX_ENTRIES,
+                path=settings.SCORE_CACHE_PATH,
+            )
+    return _score_cache
@@ -3,13 +3,34 @@ Core scoring engine combining embeddings, LLM, and rule-based logic
 Implements the weighted scoring algorithm
 """
 
-from typing import Dict, List, Set, Tuple
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
+from typing import Any, Awaitable, ContextManager, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+import asyncio
 import json
 import re
 import logging
+import time
+import numpy as np
 from app.config import settings
+from app.core.cpu_pool import extract_skills_many, get_cpu_pool
 from app.core.embeddings import EmbeddingsService
 from app.core.llm_client import LLMClient
+from app.core.metrics import (
+    active_requests,
+    experience_gap_batches,
+    experience_gap_resolutions,
+    scoring_latency,
+    scoring_requests,
+    scoring_stage_latency,
+    time_stage,
+)
+from app.core.profiles import DocumentProfile, get_profile_store
+from app.core.result_cache import ResultCache, get_experience_cache
+from app.core.score_cache import normalize_text
+from app.core.singleflight import SingleFlight
+from app.core.skills import SkillMatch, SkillMatcher
 from app.prompts import get_scoring_prompt
 from app.utils import validate_score_response
 
@@ -83,16 +104,237 @@ SKILL_PATTERNS: List[Tuple[str, str]] = [
 ]
 
 
+# Coalesces concurrent identical experience-gap prompts into one LLM call
+_experience_flight = SingleFlight("experience_gap")
+
+# Whole taxonomy compiled once - each document is scanned in a single pass
+_skill_matcher = SkillMatcher(SKILL_PATTERNS)
+
+
 def extract_skills(text: str) -> Set[str]:
     """Extract skills from text using regex patterns"""
+    return _skill_matcher.extract(text)
+
+
+def find_skill_matches(text: str) -> List[SkillMatch]:
+    """Skill occurrences with offsets (into the lowercased text)"""
+    return _skill_matcher.find_all(text)
+
+
+# Match Score = Σ weight × component (each component is 0-100)
+SCORE_WEIGHTS: Dict[str, float] = {
+    "skills": 0.40,
+    "semantic": 0.30,
+    "experience": 0.20,
+    "keywords": 0.10,
+}
+
+# Experience component by LLM verdict (anything else scores 50)
+EXPERIENCE_GAP_SCORES: Dict[str, float] = {"None": 100, "Minor": 75, "Moderate": 50, "Major": 25}
+
+# Role-specific keywords for the 10% keyword component
+ROLE_KEYWORDS: Dict[str, List[str]] = {
+    "senior": ["senior", "lead", "principal", "staff"],
+    "mid": ["engineer", "developer", "specialist"],
+    "keywords": ["api", "rest", "microservices", "docker", "kubernetes"],
+}
+KEYWORD_TERMS: List[str] = [term for terms in ROLE_KEYWORDS.values() for term in terms]
+
+
+# Bump when the scoring code changes results in a way the constants above do not show
+SCORING_VERSION = 1
+_STATIC_CONFIG_VERSION = ResultCache.make_key(
+    SCORING_VERSION, SCORE_WEIGHTS, EXPERIENCE_GAP_SCORES, ROLE_KEYWORDS, SKILL_PATTERNS
+)
+
+
+def keyword_hits(text: str) -> Set[str]:
+    """Role keywords present in text (substring match, as the keyword score uses)"""
     text_lower = text.lower()
-    found_skills = set()
-    
-    for pattern, skill_name in SKILL_PATTERNS:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            found_skills.add(skill_name)
-    
-    return found_skills
+    return {term for term in KEYWORD_TERMS if term in text_lower}
+
+
+# Deterministic experience extraction (fast path before the LLM)
+_MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1
+)}
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+_DATE = r"(?:(?P<{p}mon>" + _MONTH + r")\s+|(?P<{p}num>\d{{1,2}})/)?(?P<{p}year>(?:19|20)\d{{2}})"
+_DATE_RANGE = re.compile(
+    _DATE.format(p="s") + r"\s*(?:-|–|—|to|until)\s*(?:(?P<present>present|current|now|today)|"
+    + _DATE.format(p="e") + r")",
+    re.IGNORECASE,
+)
+_YEARS = re.compile(
+    r"(?P<low>\d{1,2}(?:\.\d)?)\s*\+?\s*(?:(?:-|–|to)\s*(?P<high>\d{1,2})\s*\+?\s*)?(?:years?|yrs?)\b",
+    re.IGNORECASE,
+)
+_EDUCATION = re.compile(r"\b(?:university|college|school|bachelor|master|degree|b\.?sc|m\.?sc|phd|education)\b", re.I)
+
+# Title words by seniority level (higher = more senior)
+SENIORITY_LEVELS: List[Tuple[int, "re.Pattern[str]"]] = [
+    (0, re.compile(r"\b(?:intern|internship|trainee)\b", re.I)),
+    (1, re.compile(r"\b(?:junior|jr\.?|entry[- ]level|graduate)\b", re.I)),
+    (2, re.compile(r"\b(?:mid[- ]level|intermediate)\b", re.I)),
+    (3, re.compile(r"\b(?:senior|sr\.?)\b", re.I)),
+    (4, re.compile(r"\b(?:lead|staff)\b", re.I)),
+    (5, re.compile(r"\b(?:principal|architect|head of|director)\b", re.I)),
+]
+
+
+class ExperienceProfile(NamedTuple):
+    """Parsed experience signals (None = not stated or ambiguous)"""
+    years: Optional[float]
+    level: Optional[int]
+
+
+def _stated_years(text: str) -> List[float]:
+    """'5+ years of experience' / '3-5 yrs experience' -> lower bounds near the word 'experience'"""
+    found = []
+    for m in _YEARS.finditer(text):
+        window = text[max(0, m.start() - 40):m.end() + 40].lower()
+        if "experience" in window or "exp." in window:
+            found.append(float(m.group("low")))
+    return found
+
+
+def _month_index(match: "re.Match[str]", prefix: str) -> int:
+    year = int(match.group(f"{prefix}year"))
+    month_name, month_num = match.group(f"{prefix}mon"), match.group(f"{prefix}num")
+    if month_name:
+        month = _MONTHS[month_name[:3].lower()]
+    elif month_num and 1 <= int(month_num) <= 12:
+        month = int(month_num)
+    else:
+        month = 1
+    return year * 12 + month - 1
+
+
+def _work_history_years(text: str) -> Optional[float]:
+    """Total years covered by date ranges (overlaps merged, education ranges skipped)"""
+    today = date.today()
+    intervals = []
+    for m in _DATE_RANGE.finditer(text):
+        if _EDUCATION.search(text[max(0, m.start() - 80):m.start()]):
+            continue
+        start = _month_index(m, "s")
+        end = today.year * 12 + today.month - 1 if m.group("present") else _month_index(m, "e")
+        if start < end <= start + 50 * 12:
+            intervals.append((start, end))
+    if not intervals:
+        return None
+
+    months, current_start, current_end = 0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    months += current_end - current_start
+    return months / 12
+
+
+def _seniority_levels(text: str) -> Set[int]:
+    return {level for level, pattern in SENIORITY_LEVELS if pattern.search(text)}
+
+
+# Parsed once per document, not once per pair, when a batch scores M×N
+@lru_cache(maxsize=4096)
+def parse_resume_experience(resume_text: str) -> ExperienceProfile:
+    """Candidate years (stated, else work history) and highest seniority title"""
+    stated = _stated_years(resume_text)
+    history = _work_history_years(resume_text)
+    years = max(stated) if stated else history
+    if stated and history is not None and abs(max(stated) - history) > 2:
+        years = None  # the resume contradicts itself - let the LLM read it
+    levels = _seniority_levels(resume_text)
+    return ExperienceProfile(years, max(levels) if levels else None)
+
+
+@lru_cache(maxsize=4096)
+def parse_job_experience(job_description: str) -> ExperienceProfile:
+    """Required years (largest lower bound) and seniority (only if a single level is named)"""
+    stated = _stated_years(job_description)
+    levels = _seniority_levels(job_description)
+    return ExperienceProfile(
+        max(stated) if stated else None,
+        levels.pop() if len(levels) == 1 else None,
+    )
+
+
+def _gap_label(shortfall: float, minor: float, moderate: float) -> str:
+    if shortfall <= 0:
+        return "None"
+    if shortfall <= minor:
+        return "Minor"
+    return "Moderate" if shortfall <= moderate else "Major"
+
+
+def estimate_experience_gap(resume_text: str, job_description: str) -> Optional[str]:
+    """
+    None/Minor/Moderate/Major from parsed years (preferred) or seniority titles;
+    None when the texts do not give both sides a confident signal.
+    """
+    resume, job = parse_resume_experience(resume_text), parse_job_experience(job_description)
+    if resume.years is not None and job.years is not None:
+        return _gap_label(job.years - resume.years, minor=1, moderate=3)
+    if resume.level is not None and job.level is not None:
+        return _gap_label(job.level - resume.level, minor=1, moderate=2)
+    return None
+
+
+# A document to score: raw text, or a registered profile carrying its features
+Document = Union[str, DocumentProfile]
+
+
+class _DocumentFeatures(NamedTuple):
+    """Per-document scoring inputs for a list of resumes or jobs"""
+    texts: List[str]  # as passed to the experience gap (job descriptions without requirements)
+    skills: List[Set[str]]
+    keywords: List[Set[str]]
+    embeddings: List[Union[np.ndarray, Exception]]
+
+
+def profile_content_hash(kind: str, text: str, requirements: str = "") -> str:
+    """Identity of a profile's content; unchanged content is not re-registered"""
+    return ResultCache.make_key("profile", kind, text, requirements)
+
+
+class _ComponentMatrix(NamedTuple):
+    """Non-LLM score components for an M×N resume/job grid"""
+    resume_texts: List[str]
+    job_texts: List[str]
+    resume_skills: List[Set[str]]
+    job_skills: List[Set[str]]
+    skill_scores: np.ndarray
+    semantic: np.ndarray
+    keyword_scores: np.ndarray
+    resume_errors: List[Optional[Exception]]
+    job_errors: List[Optional[Exception]]
+
+    def pair_error(self, r_idx: int, j_idx: int) -> Optional[Exception]:
+        """Why a pair cannot be scored (a document failed to embed), if it can't"""
+        return self.resume_errors[r_idx] or self.job_errors[j_idx]
+
+
+def _indicator_matrix(rows: List[Set[str]], vocab: Dict[str, int]) -> np.ndarray:
+    """Binary document×term matrix for set-overlap counts via matrix products"""
+    matrix = np.zeros((len(rows), len(vocab)), dtype=np.float32)
+    for i, items in enumerate(rows):
+        matrix[i, [vocab[item] for item in items]] = 1.0
+    return matrix
+
+
+def _stack_embeddings(embeddings: List[Union[np.ndarray, Exception]]) -> np.ndarray:
+    """Stack embeddings into a float32 matrix; failed rows become zero vectors"""
+    dim = next((len(e) for e in embeddings if not isinstance(e, Exception)), 0)
+    matrix = np.zeros((len(embeddings), dim), dtype=np.float32)
+    for i, embedding in enumerate(embeddings):
+        if not isinstance(embedding, Exception):
+            matrix[i] = embedding
+    return matrix
 
 
 class ScoringEngine:
@@ -107,22 +349,472 @@ class ScoringEngine:
     - Use LLM for experience gap assessment only (controlled output)
     """
 
-    def __init__(self):
-        self.llm = LLMClient()
-        self.embeddings_service = EmbeddingsService()
+    def __init__(
+        self,
+        llm: Optional[LLMClient] = None,
+        embeddings_service: Optional[EmbeddingsService] = None,
+    ):
+        # Backends default to the configured providers; pass your own to swap them out
+        self.llm = llm or LLMClient()
+        self.embeddings_service = embeddings_service or EmbeddingsService()
         logger.info(
-            f"[OK] Scoring engine initialized with {settings.LLM_PROVIDER} LLM "
-            f"and {settings.EMBEDDING_PROVIDER} embeddings"
+            f"[OK] Scoring engine initialized with {self.llm.provider} LLM "
+            f"and {self.embeddings_service.provider} embeddings"
         )
 
+    @property
+    def config_version(self) -> str:
+        """
+        Hash of everything that decides a score besides the inputs: SCORING_VERSION,
+        weights, skill taxonomy, keywords, experience mode and prompt, LLM and
+        embedding provider/model. Cached results are keyed by it, so changing any
+        of these invalidates them.
+        """
+        return ResultCache.make_key(
+            _STATIC_CONFIG_VERSION,
+            settings.EXPERIENCE_MODE,
+            self._experience_gap_prompt("", ""),
+            self.llm.provider,
+            self.llm.model,
+            self.llm.temperature,
+            self.embeddings_service.model_key,
+        )[:16]
+
     def score_match(self, resume_text: str, job_description: str, job_requirements: str = "") -> Dict:
         """Main scoring function - uses DETERMINISTIC skill matching to prevent hallucination"""
-        
-        # Step 1: DETERMINISTIC skill extraction (NO LLM - prevents hallucination)
-        resume_skills = extract_skills(resume_text)
-        job_text = job_description + " " + (job_requirements or "")
-        job_skills = extract_skills(job_text)
-        
+        with self._instrumented():
+            # Step 1: DETERMINISTIC skill extraction (NO LLM - prevents hallucination)
+            job_text = job_description + " " + (job_requirements or "")
+            with self._stage("skills"):
+                skills = self._match_skills(resume_text, job_text)
+
+            # Step 2: Get semantic similarity using embeddings (30% weight)
+            with self._stage("embedding"):
+                semantic_score = self.embeddings_service.get_semantic_similarity(
+                    resume_text[:1000], job_text[:1500]
+                )
+
+            # Step 3: Get experience gap from LLM (only this part uses LLM)
+            experience_gap = self._get_experience_gap(resume_text, job_description)
+
+            # Step 4: Keyword score (10% weight)
+            with self._stage("keywords"):
+                keyword_score = self._calculate_keyword_score(resume_text, job_description)
+
+            return self._build_result(skills, semantic_score, experience_gap, keyword_score)
+
+    async def score_match_async(
+        self, resume_text: str, job_description: str, job_requirements: str = ""
+    ) -> Dict:
+        """
+        Async scoring path - same formula as score_match, but provider calls
+        are awaited so one worker can serve many scorings concurrently.
+        Embeddings and the LLM call run in parallel since they are independent.
+        """
+        with self._instrumented():
+            job_text = job_description + " " + (job_requirements or "")
+            with self._stage("skills"):
+                resume_skills, job_skills = await self._extract_skills_async([resume_text, job_text])
+                skills = self._skill_overlap(resume_skills, job_skills)
+
+            semantic_score, experience_gap = await asyncio.gather(
+                self._timed("embedding", self.embeddings_service.get_semantic_similarity_async(
+                    resume_text[:1000], job_text[:1500]
+                )),
+                self._get_experience_gap_async(resume_text, job_description),
+            )
+
+            with self._stage("keywords"):
+                keyword_score = self._calculate_keyword_score(resume_text, job_description)
+
+            return self._build_result(skills, semantic_score, experience_gap, keyword_score)
+
+    async def score_documents_async(self, resume: Document, job: Document, job_requirements: str = "") -> Dict:
+        """
+        score_match_async where either side may be a registered profile: its skills,
+        keywords and embedding are reused, so only the experience gap is left to
+        compute. Gives the same result as scoring the profile's text.
+        """
+        with self._instrumented():
+            # Only raw texts (or profiles from another embedding model) reach the provider here
+            resume_features, job_features = await self._timed(
+                "embedding", self._document_features([resume], [job], [job_requirements])
+            )
+            with self._stage("skills"):
+                skills = self._skill_overlap(resume_features.skills[0], job_features.skills[0])
+
+            resume_embedding, job_embedding = resume_features.embeddings[0], job_features.embeddings[0]
+            for embedding in (resume_embedding, job_embedding):
+                if isinstance(embedding, Exception):
+                    raise embedding
+            semantic_score = self.embeddings_service.calculate_similarity(resume_embedding, job_embedding)
+
+            experience_gap = await self._get_experience_gap_async(
+                resume_features.texts[0], job_features.texts[0]
+            )
+
+            with self._stage("keywords"):
+                matches = resume_features.keywords[0] & job_features.keywords[0]
+                keyword_score = (len(matches) / len(KEYWORD_TERMS) * 100) if KEYWORD_TERMS else 50
+
+            return self._build_result(skills, semantic_score, experience_gap, keyword_score)
+
+    async def build_profile_async(
+        self, doc_id: str, kind: str, text: str, requirements: str = ""
+    ) -> DocumentProfile:
+        """Normalize a document and compute its scoring features for registration"""
+        if kind not in ("resume", "job"):
+            raise ValueError(f"Unknown document kind: {kind}")
+        text = normalize_text(text)
+        requirements = normalize_text(requirements) if kind == "job" else ""
+        if not text:
+            raise ValueError("Cannot register an empty document")
+
+        resume_features, job_features = await self._document_features(
+            [text] if kind == "resume" else [], [text] if kind == "job" else [], [requirements]
+        )
+        features = resume_features if kind == "resume" else job_features
+        embedding = features.embeddings[0]
+        if isinstance(embedding, Exception):
+            raise embedding
+        return DocumentProfile(
+            id=doc_id,
+            kind=kind,
+            text=text,
+            requirements=requirements,
+            skills=frozenset(features.skills[0]),
+            keywords=frozenset(features.keywords[0]),
+            embedding=np.asarray(embedding, dtype=np.float32),
+            embedding_model=self.embeddings_service.model_key,
+            content_hash=profile_content_hash(kind, text, requirements),
+            registered_at=time.time(),
+        )
+
+    async def register_profile_async(
+        self, doc_id: str, kind: str, text: str, requirements: str = ""
+    ) -> Tuple[DocumentProfile, bool]:
+        """
+        Store a profile under doc_id; returns (profile, changed). Content already
+        registered under that id with the current embedding model is kept as is.
+        """
+        store = get_profile_store()
+        existing = store.get(doc_id)
+        if kind == "resume":
+            requirements = ""
+        content_hash = profile_content_hash(kind, normalize_text(text), normalize_text(requirements))
+        if (
+            existing is not None
+            and existing.content_hash == content_hash
+            and existing.embedding_model == self.embeddings_service.model_key
+        ):
+            return existing, False
+
+        profile = await self.build_profile_async(doc_id, kind, text, requirements)
+        store.put(profile)
+        return profile, True
+
+    @contextmanager
+    def _instrumented(self) -> Iterator[None]:
+        """In-flight gauge, request counter and total latency for one scoring"""
+        active_requests.inc()
+        try:
+            with self._stage("total"), scoring_latency.time():
+                yield
+        except Exception:
+            scoring_requests.labels(status="error").inc()
+            raise
+        else:
+            scoring_requests.labels(status="success").inc()
+        finally:
+            active_requests.dec()
+
+    def _stage(self, stage: str) -> ContextManager[None]:
+        """
+        Stage timer labeled with the backend doing the work (local for deterministic
+        stages, all for the total, which spans every backend)
+        """
+        if stage == "embedding":
+            provider, model = self.embeddings_service.provider, self.embeddings_service.model
+        elif stage == "llm":
+            provider, model = self.llm.provider, self.llm.model
+        elif stage == "total":
+            provider, model = "all", "all"
+        else:
+            provider, model = "local", "deterministic"
+        return time_stage(scoring_stage_latency, stage=stage, provider=provider, model=model)
+
+    async def _timed(self, stage: str, awaitable: Awaitable[Any]) -> Any:
+        """Await under a stage timer (for stages that run concurrently)"""
+        with self._stage(stage):
+            return await awaitable
+
+    async def score_matrix_async(
+        self,
+        resumes: List[Document],
+        jobs: List[Document],
+        requirements: Optional[List[str]] = None,
+        max_concurrency: int = 8,
+    ) -> List[List[Union[Dict, Exception]]]:
+        """
+        Score every resume against every job (M×N) with per-document precomputation.
+
+        Skills, keyword hits and embeddings are computed once per document (M+N work),
+        then the skill, keyword and semantic components come from matrix products.
+        Only the experience gap is still per pair (several pairs per LLM prompt).
+        Returns rows indexed [resume][job]; a pair whose inputs could not be
+        embedded holds the Exception instead of a result. Registered profiles
+        may stand in for texts (their requirements replace `requirements`).
+        """
+        components = await self._score_components(resumes, jobs, requirements)
+
+        # Experience gap: the only per-pair (LLM) step
+        pairs = [
+            (r_idx, j_idx)
+            for r_idx in range(len(resumes))
+            for j_idx in range(len(jobs))
+            if components.pair_error(r_idx, j_idx) is None
+        ]
+        verdicts = await self._get_experience_gaps_async(
+            [(components.resume_texts[r_idx], components.job_texts[j_idx]) for r_idx, j_idx in pairs],
+            max_concurrency,
+        )
+        gaps = dict(zip(pairs, verdicts))
+
+        return [
+            [
+                self._pair_result(components, r_idx, j_idx, gaps[(r_idx, j_idx)])
+                if (r_idx, j_idx) in gaps else components.pair_error(r_idx, j_idx)
+                for j_idx in range(len(jobs))
+            ]
+            for r_idx in range(len(resumes))
+        ]
+
+    async def rank_candidates_async(
+        self,
+        resumes: List[Document],
+        job_description: Document,
+        job_requirements: str = "",
+        top_n: int = 10,
+        max_concurrency: int = 8,
+    ) -> Dict:
+        """
+        Top-N resumes for one job, calling the LLM only for possible finalists.
+
+        Stage 1 scores every candidate on the cheap components (skills, semantic,
+        keywords). The experience component is bounded, so each candidate's final
+        score lies in [cheap + W·min_exp, cheap + W·max_exp]. Stage 2 walks
+        candidates by upper bound, assessing experience in waves, and stops once
+        the N-th best exact score beats every remaining upper bound - the result
+        is the same top-N (ties broken by resume_index) as exhaustive scoring.
+        Resumes and the job may be registered profiles instead of texts.
+        """
+        components = await self._score_components(resumes, [job_description], [job_requirements])
+        cheap = (
+            SCORE_WEIGHTS["skills"] * components.skill_scores[:, 0]
+            + SCORE_WEIGHTS["semantic"] * components.semantic[:, 0]
+            + SCORE_WEIGHTS["keywords"] * components.keyword_scores[:, 0]
+        )
+        upper = cheap + SCORE_WEIGHTS["experience"] * max(EXPERIENCE_GAP_SCORES.values())
+
+        candidates = [r for r in range(len(resumes)) if components.pair_error(r, 0) is None]
+        candidates.sort(key=lambda r: (-upper[r], r))
+
+        finals: Dict[int, Dict] = {}
+        sources = {"llm": 0, "cache": 0, "heuristic": 0}  # how each assessed pair was settled
+        pos = 0
+        while pos < len(candidates):
+            threshold = None
+            if len(finals) >= top_n:
+                threshold = sorted((f["match_score"] for f in finals.values()), reverse=True)[top_n - 1]
+
+            # Next wave: candidates whose (rounded) bound can still reach the top-N
+            wave = []
+            while pos < len(candidates) and len(wave) < max_concurrency:
+                r_idx = candidates[pos]
+                if threshold is not None and round(float(upper[r_idx]), 2) < threshold:
+                    pos = len(candidates)  # sorted by bound: nobody after can make it either
+                    break
+                wave.append(r_idx)
+                pos += 1
+            if not wave:
+                break
+
+            gaps = await self._get_experience_gaps_async(
+                [(components.resume_texts[r_idx], components.job_texts[0]) for r_idx in wave],
+                max_concurrency,
+                sources,
+            )
+            for r_idx, gap in zip(wave, gaps):
+                finals[r_idx] = self._pair_result(components, r_idx, 0, gap)
+
+        ranked = sorted(finals.items(), key=lambda item: (-item[1]["match_score"], item[0]))[:top_n]
+        logger.info(
+            f"Ranked {len(resumes)} candidates with {len(finals)} experience assessments "
+            f"({sources['llm']} by the LLM)"
+        )
+        return {
+            "results": [{"resume_index": r_idx, **result} for r_idx, result in ranked],
+            "total_candidates": len(resumes),
+            "failed_candidates": len(resumes) - len(candidates),
+            "llm_calls": sources["llm"],
+            "cached_verdicts": sources["cache"],
+            "heuristic_verdicts": sources["heuristic"],
+        }
+
+    async def _score_components(
+        self, resumes: List[Document], jobs: List[Document], requirements: Optional[List[str]] = None
+    ) -> "_ComponentMatrix":
+        """Cheap (non-LLM) score components for every resume×job pair"""
+        # Per-document features (computed once, or taken from registered profiles)
+        resume_features, job_features = await self._document_features(resumes, jobs, requirements)
+        resume_skills, job_skills = resume_features.skills, job_features.skills
+        resume_keywords, job_keywords = resume_features.keywords, job_features.keywords
+        resume_embeddings, job_embeddings = resume_features.embeddings, job_features.embeddings
+
+        # Semantic component: one normalized matrix product
+        semantic = self.embeddings_service.similarity_matrix(
+            _stack_embeddings(resume_embeddings), _stack_embeddings(job_embeddings)
+        )
+
+        # Skill component: matched counts = R·Jᵀ over a binary skill vocabulary
+        vocab = {skill: i for i, skill in enumerate(sorted(set().union(*resume_skills, *job_skills)))}
+        resume_skill_matrix = _indicator_matrix(resume_skills, vocab)
+        job_skill_matrix = _indicator_matrix(job_skills, vocab)
+        # Counts are exact in float32; the ratios below are float64 like score_match's
+        matched_counts = (resume_skill_matrix @ job_skill_matrix.T).astype(np.float64)
+        job_counts = job_skill_matrix.sum(axis=1, dtype=np.float64)
+        skill_scores = np.where(
+            job_counts > 0, matched_counts / np.maximum(job_counts, 1) * 100, 50.0
+        )
+
+        # Keyword component
+        keyword_vocab = {term: i for i, term in enumerate(KEYWORD_TERMS)}
+        keyword_matches = (
+            _indicator_matrix(resume_keywords, keyword_vocab)
+            @ _indicator_matrix(job_keywords, keyword_vocab).T
+        ).astype(np.float64)
+        keyword_scores = keyword_matches / len(KEYWORD_TERMS) * 100 if KEYWORD_TERMS else np.full(
+            matched_counts.shape, 50.0
+        )
+
+        return _ComponentMatrix(
+            resume_texts=resume_features.texts,
+            job_texts=job_features.texts,
+            resume_skills=resume_skills,
+            job_skills=job_skills,
+            skill_scores=skill_scores,
+            semantic=semantic,
+            keyword_scores=keyword_scores,
+            resume_errors=[e if isinstance(e, Exception) else None for e in resume_embeddings],
+            job_errors=[e if isinstance(e, Exception) else None for e in job_embeddings],
+        )
+
+    def _pair_result(self, components: "_ComponentMatrix", r_idx: int, j_idx: int, gap: str) -> Dict:
+        """Final result for one pair from precomputed components + experience gap"""
+        resume_skills, job_skills = components.resume_skills[r_idx], components.job_skills[j_idx]
+        skills = (
+            float(components.skill_scores[r_idx, j_idx]),
+            list(resume_skills & job_skills),
+            list(job_skills - resume_skills),
+            job_skills,
+        )
+        return self._build_result(
+            skills,
+            float(components.semantic[r_idx, j_idx]),
+            gap,
+            float(components.keyword_scores[r_idx, j_idx]),
+        )
+
+    async def _document_features(
+        self, resumes: List[Document], jobs: List[Document], requirements: Optional[List[str]] = None
+    ) -> Tuple[_DocumentFeatures, _DocumentFeatures]:
+        """
+        Skills, keyword hits and embeddings for resumes and jobs. Texts are processed
+        in one batch (one CPU pool round trip, one embedding pass); profiles contribute
+        their stored features, except that one embedded with another model is
+        re-embedded (and re-stored) here.
+        """
+        requirements = requirements or []
+        docs = list(resumes) + list(jobs)
+        texts = [doc.text if isinstance(doc, DocumentProfile) else doc for doc in docs]
+        # Jobs are matched and embedded with their requirements appended
+        full_texts = texts[:len(resumes)] + [
+            doc.text + " " + doc.requirements if isinstance(doc, DocumentProfile)
+            else doc + " " + (requirements[j] if j < len(requirements) else "")
+            for j, doc in enumerate(jobs)
+        ]
+
+        raw = [i for i, doc in enumerate(docs) if not isinstance(doc, DocumentProfile)]
+        stale = [
+            i for i, doc in enumerate(docs)
+            if isinstance(doc, DocumentProfile) and doc.embedding_model != self.embeddings_service.model_key
+        ]
+
+        skills: List[Set[str]] = [set(doc.skills) if isinstance(doc, DocumentProfile) else set() for doc in docs]
+        for i, extracted in zip(raw, await self._extract_skills_async([full_texts[i] for i in raw])):
+            skills[i] = extracted
+        keywords = [
+            set(doc.keywords) if isinstance(doc, DocumentProfile) else keyword_hits(doc) for doc in docs
+        ]
+
+        # Same truncation as score_match: 1000 chars of a resume, 1500 of job text
+        embeddings: List[Union[np.ndarray, Exception]] = [
+            doc.embedding if isinstance(doc, DocumentProfile) else None for doc in docs
+        ]
+        to_embed = raw + stale
+        embedded = await self._embed_documents(
+            [full_texts[i][:1000 if i < len(resumes) else 1500] for i in to_embed]
+        )
+        for i, embedding in zip(to_embed, embedded):
+            embeddings[i] = embedding
+        for i in stale:
+            if not isinstance(embeddings[i], Exception):
+                get_profile_store().put(docs[i]._replace(
+                    embedding=np.asarray(embeddings[i], dtype=np.float32),
+                    embedding_model=self.embeddings_service.model_key,
+                ))
+
+        split = len(resumes)
+        return (
+            _DocumentFeatures(texts[:split], skills[:split], keywords[:split], embeddings[:split]),
+            _DocumentFeatures(texts[split:], skills[split:], keywords[split:], embeddings[split:]),
+        )
+
+    async def _embed_documents(self, texts: List[str]) -> List[Union[np.ndarray, Exception]]:
+        """Batch-embed documents; empty texts (or a failed provider call) yield per-document exceptions"""
+        outcomes: List[Union[np.ndarray, Exception]] = [
+            ValueError("Cannot generate embedding for empty text")
+        ] * len(texts)
+        valid = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not valid:
+            return outcomes
+
+        try:
+            matrix = await self.embeddings_service.get_embeddings_async([texts[i] for i in valid])
+        except Exception as e:
+            for i in valid:
+                outcomes[i] = e
+            return outcomes
+
+        for row, i in enumerate(valid):
+            outcomes[i] = matrix[row]
+        return outcomes
+
+    async def _extract_skills_async(self, texts: List[str]) -> List[Set[str]]:
+        """Skill sets for many texts - one CPU pool round trip when the pool is enabled"""
+        pool = get_cpu_pool()
+        if pool is None:
+            return [extract_skills(text) for text in texts]
+        return await pool.run_async(extract_skills_many, texts)
+
+    def _match_skills(self, resume_text: str, job_text: str) -> Tuple[float, List[str], List[str], Set[str]]:
+        """Deterministic skill overlap: (skill_score, matched, missing, job_skills)"""
+        return self._skill_overlap(extract_skills(resume_text), extract_skills(job_text))
+
+    def _skill_overlap(
+        self, resume_skills: Set[str], job_skills: Set[str]
+    ) -> Tuple[float, List[str], List[str], Set[str]]:
+        """Skill score from already-extracted skill sets"""
         matched_skills = list(resume_skills & job_skills)
         missing_skills = list(job_skills - resume_skills)
         
@@ -132,28 +824,28 @@ class ScoringEngine:
         else:
             skill_score = 50  # Default if no skills detected in JD
         
-        logger.info(f"Resume skills: {resume_skills}")
-        logger.info(f"Job skills: {job_skills}")
-        logger.info(f"Matched: {matched_skills}, Missing: {missing_skills}")
-        
-        # Step 2: Get semantic similarity using embeddings (30% weight)
-        semantic_score = self.embeddings_service.get_semantic_similarity(
-            resume_text[:1000], job_text[:1500]
-        )
+        logger.debug(f"Resume skills: {resume_skills}")
+        logger.debug(f"Job skills: {job_skills}")
+        logger.debug(f"Matched: {matched_skills}, Missing: {missing_skills}")
+        return skill_score, matched_skills, missing_skills, job_skills
 
-        # Step 3: Get experience gap from LLM (only this part uses LLM)
-        experience_gap = self._get_experience_gap(resume_text, job_description)
+    def _build_result(
+        self,
+        skills: Tuple[float, List[str], List[str], Set[str]],
+        semantic_score: float,
+        experience_gap: str,
+        keyword_score: float,
+    ) -> Dict:
+        """Apply the weighted formula and build the response payload"""
+        skill_score, matched_skills, missing_skills, job_skills = skills
         experience_score = self._calculate_experience_score(experience_gap)
-        
-        # Step 4: Keyword score (10% weight)
-        keyword_score = self._calculate_keyword_score(resume_text, job_description)
 
         # Final weighted score
         final_score = (
-            (skill_score * 0.40)
-            + (semantic_score * 0.30)
-            + (experience_score * 0.20)
-            + (keyword_score * 0.10)
+            (skill_score * SCORE_WEIGHTS["skills"])
+            + (semantic_score * SCORE_WEIGHTS["semantic"])
+            + (experience_score * SCORE_WEIGHTS["experience"])
+            + (keyword_score * SCORE_WEIGHTS["keywords"])
         )
         
         # Generate summary
@@ -174,9 +866,9 @@ class ScoringEngine:
             "summary": summary,
         }
 
-    def _get_experience_gap(self, resume_text: str, job_description: str) -> str:
-        """Use LLM only for experience gap assessment"""
-        prompt = f"""
+    def _experience_gap_prompt(self, resume_text: str, job_description: str) -> str:
+        """Prompt for the one-word experience gap verdict"""
+        return f"""
 Analyze the experience level. Return ONLY one word: None, Minor, Moderate, or Major.
 
 Resume (first 500 chars): {resume_text[:500]}
@@ -184,44 +876,210 @@ Resume (first 500 chars): {resume_text[:500]}
 Job requires: {job_description[:300]}
 
 Experience gap (one word only):"""
+
+    def _parse_experience_gap(self, result: str) -> str:
+        """Map raw LLM output onto None/Minor/Moderate/Major"""
+        result = result.strip().strip('"').strip("'")
+        
+        # Validate response
+        valid_gaps = ["None", "Minor", "Moderate", "Major"]
+        for gap in valid_gaps:
+            if gap.lower() in result.lower():
+                return gap
+        return "Moderate"  # Default
+
+    def _experience_cache_key(self, prompt: str) -> str:
+        """Verdict cache key: truncated inputs (via the prompt) + provider, model, temperature"""
+        return ResultCache.make_key(
+            "experience_gap", self.llm.provider, self.llm.model, self.llm.temperature, prompt
+        )
+
+    def _heuristic_experience_gap(self, resume_text: str, job_description: str) -> Optional[str]:
+        """
+        Deterministic verdict per EXPERIENCE_MODE: "llm" never answers here, "hybrid"
+        answers when both texts parse confidently, "heuristic" always answers
+        ("Unknown", scored 50, when it cannot tell). None means: ask the LLM.
+        """
+        mode = settings.EXPERIENCE_MODE
+        gap = None if mode == "llm" else estimate_experience_gap(resume_text, job_description)
+        if gap is None and mode == "heuristic":
+            gap = "Unknown"
+        experience_gap_resolutions.labels(source="llm" if gap is None else "heuristic").inc()
+        return gap
+
+    def _get_experience_gap(self, resume_text: str, job_description: str) -> str:
+        """Use LLM only for experience gap assessment (timed as "llm" only when it is asked)"""
+        heuristic = self._heuristic_experience_gap(resume_text, job_description)
+        if heuristic is not None:
+            return heuristic
+        with self._stage("llm"):
+            return self._llm_experience_gap(resume_text, job_description)
+
+    def _llm_experience_gap(self, resume_text: str, job_description: str) -> str:
+        """LLM verdict: cache, then single-flight, then the model"""
+        prompt = self._experience_gap_prompt(resume_text, job_description)
+        cache = get_experience_cache()
+        key = self._experience_cache_key(prompt)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
         
         try:
-            result = self.llm.generate(prompt)
-            result = result.strip().strip('"').strip("'")
-            
-            # Validate response
-            valid_gaps = ["None", "Minor", "Moderate", "Major"]
-            for gap in valid_gaps:
-                if gap.lower() in result.lower():
-                    return gap
-            return "Moderate"  # Default
+            # Identical in-flight prompts share one LLM call
+            return _experience_flight.do(key, lambda: self._assess_experience_gap(key, prompt))
         except Exception as e:
             logger.error(f"Experience gap error: {e}")
             return "Unknown"
 
-    def _calculate_experience_score(self, experience_gap: str) -> float:
-        """Convert experience gap to numerical score"""
-        gap_scores = {"None": 100, "Minor": 75, "Moderate": 50, "Major": 25}
-        return gap_scores.get(experience_gap, 50)
+    async def _get_experience_gap_async(self, resume_text: str, job_description: str) -> str:
+        """Async experience gap assessment (timed as "llm" only when it is asked)"""
+        heuristic = self._heuristic_experience_gap(resume_text, job_description)
+        if heuristic is not None:
+            return heuristic
+        with self._stage("llm"):
+            return await self._llm_experience_gap_async(resume_text, job_description)
 
-    def _calculate_keyword_score(self, resume_text: str, job_description: str) -> float:
-        """Calculate role-specific keyword match"""
-        keywords = {
-            "senior": ["senior", "lead", "principal", "staff"],
-            "mid": ["engineer", "developer", "specialist"],
-            "keywords": ["api", "rest", "microservices", "docker", "kubernetes"],
-        }
+    async def _llm_experience_gap_async(self, resume_text: str, job_description: str) -> str:
+        """Async LLM verdict: cache, then single-flight, then the model"""
+        prompt = self._experience_gap_prompt(resume_text, job_description)
+        cache = get_experience_cache()
+        key = self._experience_cache_key(prompt)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            return await _experience_flight.do_async(
+                key, lambda: self._assess_experience_gap_async(key, prompt)
+            )
+        except Exception as e:
+            logger.error(f"Experience gap error: {e}")
+            return "Unknown"
+
+    def _assess_experience_gap(self, key: str, prompt: str) -> str:
+        """Ask the LLM and cache the parsed verdict"""
+        gap = self._parse_experience_gap(self.llm.generate(prompt))
+        get_experience_cache().set(key, gap)
+        return gap
 
-        resume_lower = resume_text.lower()
-        job_lower = job_description.lower()
+    async def _assess_experience_gap_async(self, key: str, prompt: str) -> str:
+        """Ask the LLM (async) and cache the parsed verdict"""
+        gap = self._parse_experience_gap(await self.llm.generate_async(prompt))
+        get_experience_cache().set(key, gap)
+        return gap
 
-        matches = 0
-        total = 0
+    async def _get_experience_gaps_async(
+        self,
+        pairs: List[Tuple[str, str]],
+        max_concurrency: int = 8,
+        sources: Optional[Dict[str, int]] = None,
+    ) -> List[str]:
+        """
+        Experience gaps for many (resume, job) pairs. Pairs the heuristic cannot
+        settle and that are not cached are packed EXPERIENCE_BATCH_SIZE to a prompt;
+        verdicts share the per-pair cache, and a batch the model answers badly is
+        retried pair by pair. sources, if given, is incremented per pair under
+        "heuristic", "cache" (including repeats of a pair in this call) or "llm".
+        """
+        heuristics = [self._heuristic_experience_gap(r, j) for r, j in pairs]
+        cache = get_experience_cache()
+        keys = [self._experience_cache_key(self._experience_gap_prompt(r, j)) for r, j in pairs]
+        gaps: Dict[str, str] = {}
+        pending: Dict[str, Tuple[str, str]] = {}
+        for key, pair, heuristic in zip(keys, pairs, heuristics):
+            if heuristic is not None or key in gaps or key in pending:
+                continue
+            cached = cache.get(key)
+            if cached is not None:
+                gaps[key] = cached
+            else:
+                pending[key] = pair
+        if sources is not None:
+            settled = sum(heuristic is not None for heuristic in heuristics)
+            sources["heuristic"] += settled
+            sources["llm"] += len(pending)
+            sources["cache"] += len(pairs) - settled - len(pending)
 
-        for category, terms in keywords.items():
-            for term in terms:
-                total += 1
-                if term in job_lower and term in resume_lower:
-                    matches += 1
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-        return (matches / total * 100) if total > 0 else 50
+        async def single(resume_text: str, job_description: str) -> str:
+            async with semaphore:
+                return await self._llm_experience_gap_async(resume_text, job_description)
+
+        async def assess(chunk: List[Tuple[str, Tuple[str, str]]]) -> List[str]:
+            if len(chunk) > 1:
+                async with semaphore:
+                    verdicts = await self._assess_experience_batch_async(chunk)
+                if verdicts is not None:
+                    return verdicts
+            return await asyncio.gather(*(single(r, j) for _, (r, j) in chunk))
+
+        size = max(1, settings.EXPERIENCE_BATCH_SIZE)
+        items = list(pending.items())
+        chunks = [items[start:start + size] for start in range(0, len(items), size)]
+        for chunk, verdicts in zip(chunks, await asyncio.gather(*(assess(c) for c in chunks))):
+            for (key, _), gap in zip(chunk, verdicts):
+                gaps[key] = gap
+
+        return [gaps[key] if heuristic is None else heuristic for key, heuristic in zip(keys, heuristics)]
+
+    def _experience_gap_batch_prompt(self, pairs: List[Tuple[str, str]]) -> str:
+        """Prompt asking for one verdict per numbered pair as a JSON array"""
+        sections = "\n\n".join(
+            f"Pair {i}\nResume (first 500 chars): {resume_text[:500]}\nJob requires: {job_description[:300]}"
+            for i, (resume_text, job_description) in enumerate(pairs, 1)
+        )
+        return f"""
+Analyze the experience level for each numbered resume/job pair.
+Return ONLY a JSON array with exactly {len(pairs)} strings, in pair order, each one of:
+"None", "Minor", "Moderate", "Major". Example for 3 pairs: ["Minor", "None", "Major"]
+
+{sections}
+
+JSON array of {len(pairs)} experience gaps:"""
+
+    def _parse_experience_gap_batch(self, result: str, expected: int) -> Optional[List[str]]:
+        """Strictly parse a JSON array of verdicts; None if malformed, short or unknown labels"""
+        match = re.search(r"\[.*\]", result, re.DOTALL)
+        if not match:
+            return None
+        try:
+            labels = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(labels, list) or len(labels) != expected:
+            return None
+
+        valid = {gap.lower(): gap for gap in EXPERIENCE_GAP_SCORES}
+        verdicts = [valid.get(str(label).strip().lower()) for label in labels]
+        return None if None in verdicts else verdicts
+
+    async def _assess_experience_batch_async(
+        self, chunk: List[Tuple[str, Tuple[str, str]]]
+    ) -> Optional[List[str]]:
+        """One LLM call for several (key, pair) items; caches and returns verdicts, None on failure"""
+        prompt = self._experience_gap_batch_prompt([pair for _, pair in chunk])
+        try:
+            verdicts = self._parse_experience_gap_batch(await self.llm.generate_async(prompt), len(chunk))
+        except Exception as e:
+            logger.warning(f"Batched experience gap call failed: {e}")
+            verdicts = None
+
+        if verdicts is None:
+            experience_gap_batches.labels(outcome="fallback").inc()
+            return None
+
+        experience_gap_batches.labels(outcome="ok").inc()
+        cache = get_experience_cache()
+        for (key, _), gap in zip(chunk, verdicts):
+            cache.set(key, gap)
+        return verdicts
+
+    def _calculate_experience_score(self, experience_gap: str) -> float:
+        """Convert experience gap to numerical score"""
+        return EXPERIENCE_GAP_SCORES.get(experience_gap, 50)
+
+    def _calculate_keyword_score(self, resume_text: str, job_description: str) -> float:
+        """Calculate role-specific keyword match"""
+        matches = keyword_hits(resume_text) & keyword_hits(job_description)
+        return (len(matches) / len(KEYWORD_TERMS) * 100) if KEYWORD_TERMS else 50
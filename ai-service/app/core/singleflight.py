@@ -0,0 +1,87 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key share one in-flight provider call
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+import asyncio
+import logging
+import threading
+from app.core.metrics import singleflight_calls, singleflight_coalesced
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call:
+    """An in-flight blocking call that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Why single-flight?
+    ------------------
+    A cache only helps AFTER the first result lands. When many requests miss
+    at the same moment (a batch scoring one job, or several users opening the
+    same posting) they would each call the provider for identical input.
+
+    The first caller for a key becomes the leader and runs the call; callers
+    arriving while it is in flight wait for and share its result (or error).
+    Nothing is retained once the call finishes - caching stays the cache's job.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[str, "asyncio.Future[Any]"] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run fn once per key across concurrent threads"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            singleflight_coalesced.labels(group=self.name).inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        singleflight_calls.labels(group=self.name).inc()
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn once per key across concurrent coroutines"""
+        task = self._tasks.get(key)
+        if task is not None:
+            singleflight_coalesced.labels(group=self.name).inc()
+        else:
+            singleflight_calls.labels(group=self.name).inc()
+            # Own task so one caller's cancellation does not cancel the others
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed"""
+        return len(self._calls) + len(self._tasks)
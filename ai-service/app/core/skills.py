@@ -0,0 +1,230 @@
+"""
+Single-pass skill matcher
+Compiles the whole skill taxonomy into one regex so each document is scanned once
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+import bisect
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+_QUANTIFIERS = "?*+{"
+_METACHARS = ".^$*+?{}[]|()"
+
+
+class SkillMatch(NamedTuple):
+    """A single skill occurrence (offsets index into the lowercased text)"""
+    skill: str
+    start: int
+    end: int
+
+
+class _Term(NamedTuple):
+    """One alternative of a taxonomy pattern, split into literal prefix + regex remainder"""
+    skill: str
+    prefix: str
+    remainder: str
+    regex: "re.Pattern[str]"
+
+
+def _split_alternatives(body: str) -> List[str]:
+    """Split a regex body on top-level '|' (ignores escapes, groups and classes)"""
+    parts, depth, start, i, in_class = [], 0, 0, 0, False
+    while i < len(body):
+        char = body[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            parts.append(body[start:i])
+            start = i + 1
+        i += 1
+    parts.append(body[start:])
+    return parts
+
+
+def _closing_paren(pattern: str, open_idx: int) -> int:
+    """Index of the ')' closing the group opened at open_idx, or -1"""
+    depth, i, in_class = 0, open_idx, False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return -1
+
+
+def _literal_prefix(alternative: str) -> Tuple[str, str]:
+    """
+    Split an alternative into its guaranteed literal prefix and the regex remainder.
+    A literal directly followed by a quantifier is optional, so it stays in the remainder.
+    """
+    literals: List[Tuple[str, int]] = []  # (char, source index where the char starts)
+    i = 0
+    while i < len(alternative):
+        char = alternative[i]
+        if char == "\\":
+            if i + 1 >= len(alternative) or alternative[i + 1].isalnum():
+                break  # \b, \s, \d ... are not literals
+            literals.append((alternative[i + 1], i))
+            i += 2
+        elif char in _METACHARS:
+            break
+        else:
+            literals.append((char, i))
+            i += 1
+
+    if literals and i < len(alternative) and alternative[i] in _QUANTIFIERS:
+        literals.pop()
+
+    cut = literals[-1][1] + (2 if alternative[literals[-1][1]] == "\\" else 1) if literals else 0
+    return "".join(char for char, _ in literals).lower(), alternative[cut:]
+
+
+def _decompose(pattern: str) -> List[Tuple[str, str]]:
+    r"""
+    Turn a word-anchored taxonomy pattern into (literal prefix, remainder) terms.
+    "\b(?:a|b)S" becomes the terms "aS" and "bS", which match at exactly the same positions.
+    """
+    if not pattern.startswith(r"\b"):
+        raise ValueError(f"Skill pattern must start with \\b: {pattern!r}")
+    body = pattern[2:]
+    if len(_split_alternatives(body)) > 1:
+        raise ValueError(f"Skill pattern must wrap alternatives in a group: {pattern!r}")
+
+    alternatives = [body]
+    if body.startswith("(?:"):
+        close = _closing_paren(body, 0)
+        suffix = body[close + 1:]
+        # A quantified group cannot be distributed over its alternatives
+        if close != -1 and suffix[:1] not in tuple(_QUANTIFIERS):
+            alternatives = [alt + suffix for alt in _split_alternatives(body[3:close])]
+
+    return [_literal_prefix(alt) for alt in alternatives]
+
+
+class SkillMatcher:
+    """
+    Why a compiled matcher?
+    -----------------------
+    Running re.search once per taxonomy entry costs O(skills × text length).
+
+    The matcher compiles every pattern into ONE lookahead regex whose alternatives
+    are factored into a trie on their literal prefixes, so the regex engine walks
+    the text once and only descends into branches whose prefix actually matches.
+
+    Exactness:
+    ----------
+    Alternation picks a single winner per position, so when two terms could match
+    at the same spot ("ruby" vs "ruby on rails") the other candidates - known ahead
+    of time from prefix overlap - are re-checked individually. The resulting skill
+    set is identical to running every pattern with re.search.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]]):
+        self._terms: List[_Term] = []
+        for pattern, skill in patterns:
+            for prefix, remainder in _decompose(pattern):
+                regex = re.compile(r"\b" + re.escape(prefix) + remainder, re.IGNORECASE)
+                self._terms.append(_Term(skill, prefix, remainder, regex))
+
+        self._shadows = self._build_shadows()
+        self._scanner = re.compile(
+            r"\b(?=" + self._build_trie_regex(range(len(self._terms)), 0) + ")",
+            re.IGNORECASE,
+        )
+        logger.debug(f"Compiled skill matcher: {len(self._terms)} terms")
+
+    @property
+    def skills(self) -> Set[str]:
+        """Canonical skill names known to the matcher"""
+        return {term.skill for term in self._terms}
+
+    def _build_shadows(self) -> List[List[int]]:
+        """For each term, the other terms that could match at the same position"""
+        by_prefix: Dict[str, List[int]] = {}
+        for idx, term in enumerate(self._terms):
+            by_prefix.setdefault(term.prefix, []).append(idx)
+        ordered = sorted(by_prefix)
+
+        shadows: List[List[int]] = []
+        for idx, term in enumerate(self._terms):
+            candidates: List[int] = []
+            # Terms whose prefix is a prefix of ours (including the empty prefix)
+            for cut in range(len(term.prefix) + 1):
+                candidates.extend(by_prefix.get(term.prefix[:cut], ()))
+            # Terms whose prefix extends ours (a contiguous run in sorted order)
+            pos = bisect.bisect_right(ordered, term.prefix)
+            while pos < len(ordered) and ordered[pos].startswith(term.prefix):
+                candidates.extend(by_prefix[ordered[pos]])
+                pos += 1
+            shadows.append([
+                other for other in candidates
+                if other != idx and self._terms[other].skill != term.skill
+            ])
+        return shadows
+
+    def _build_trie_regex(self, indices: Iterable[int], depth: int) -> str:
+        """Regex alternation over the given terms, factored by prefix character at depth"""
+        branches: List[str] = []
+        children: Dict[str, List[int]] = {}
+        for idx in indices:
+            prefix = self._terms[idx].prefix
+            if len(prefix) == depth:
+                branches.append(f"(?P<t{idx}>{self._terms[idx].remainder})")
+            else:
+                children.setdefault(prefix[depth], []).append(idx)
+
+        # Longer prefixes first so more specific terms win the alternation
+        for char, members in children.items():
+            branches.insert(0, re.escape(char) + self._build_trie_regex(members, depth + 1))
+
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    def find_all(self, text: str) -> List[SkillMatch]:
+        """Every skill occurrence in text, in document order (one per skill per position)"""
+        text_lower = text.lower()
+        matches: List[SkillMatch] = []
+
+        for m in self._scanner.finditer(text_lower):
+            pos = m.start()
+            idx = int(m.lastgroup[1:])
+            term = self._terms[idx]
+            matches.append(SkillMatch(term.skill, pos, m.end(m.lastgroup)))
+
+            seen = {term.skill}
+            for other in self._shadows[idx]:
+                shadow = self._terms[other]
+                if shadow.skill in seen:
+                    continue
+                hit = shadow.regex.match(text_lower, pos)
+                if hit:
+                    seen.add(shadow.skill)
+                    matches.append(SkillMatch(shadow.skill, pos, hit.end()))
+
+        return matches
+
+    def extract(self, text: str) -> Set[str]:
+        """Set of canonical skill names found in text"""
+        return {match.skill for match in self.find_all(text)}
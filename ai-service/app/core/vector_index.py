@@ -0,0 +1,295 @@
+"""
+In-memory vector index for top-K candidate retrieval
+Exact brute-force search by default, optional IVF (inverted file) approximation
+"""
+
+from typing import Dict, List, Literal, Optional, Set, Tuple
+import logging
+import threading
+import numpy as np
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SearchMode = Literal["exact", "approximate"]
+
+
+class VectorIndex:
+    """
+    Why an index?
+    -------------
+    Finding the best resumes for a job used to mean scoring every pair.
+    Embeddings are already normalized-comparable, so retrieval is one
+    matrix-vector product over the corpus - milliseconds even at 100k docs.
+
+    Modes:
+    ------
+    - exact: cosine similarity against every row (normalized rows, one matmul)
+    - approximate: IVF - rows are clustered with k-means; a query only scans the
+      rows in its nprobe closest clusters. Built on demand in a background thread
+      (exact search answers until the first build is done), kept up to date on
+      upserts, rebuilt when the corpus has grown enough to skew the clusters.
+
+    Scores use the same 0-100 scale as EmbeddingsService.calculate_similarity.
+    """
+
+    def __init__(self, nprobe: int = 8):
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._kinds: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None  # capacity × d, normalized rows
+        self._kind_codes: Optional[np.ndarray] = None  # capacity, kind per row
+        self._kind_ids: Dict[str, int] = {}
+        self._nprobe = nprobe
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments: Optional[np.ndarray] = None
+        self._ivf_built_size = 0
+        self._ivf_build_lock = threading.Lock()
+        self._ivf_building = False
+        self._ivf_dirty: Optional[Set[int]] = None  # rows written while a build runs
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def upsert(self, doc_id: str, vector: np.ndarray, kind: str = "document") -> None:
+        """Insert or replace the vector stored under doc_id"""
+        vector = self._normalize(vector)
+        with self._lock:
+            if self._matrix is not None and vector.shape[0] != self._matrix.shape[1]:
+                raise ValueError(
+                    f"Vector size {vector.shape[0]} does not match index dimension {self._matrix.shape[1]}"
+                )
+
+            row = self._rows.get(doc_id)
+            if row is None:
+                row = len(self._ids)
+                self._grow(row + 1, vector.shape[0])
+                self._ids.append(doc_id)
+                self._kinds.append(kind)
+                self._rows[doc_id] = row
+            else:
+                self._kinds[row] = kind
+
+            self._matrix[row] = vector
+            self._kind_codes[row] = self._kind_ids.setdefault(kind, len(self._kind_ids))
+            if self._centroids is not None:
+                self._assignments[row] = self._nearest_centroid(vector[None, :])[0]
+            if self._ivf_dirty is not None:
+                self._ivf_dirty.add(row)
+
+    def add(self, doc_id: str, vector: np.ndarray, kind: str = "document") -> None:
+        """Insert a new vector (raises if doc_id already exists)"""
+        with self._lock:
+            if doc_id in self._rows:
+                raise ValueError(f"Document already indexed: {doc_id}")
+            self.upsert(doc_id, vector, kind)
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove doc_id; returns False if it was not indexed"""
+        with self._lock:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                return False
+
+            # Move the last row into the hole to keep rows contiguous
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._ids[row] = moved_id
+                self._kinds[row] = self._kinds[last]
+                self._matrix[row] = self._matrix[last]
+                self._kind_codes[row] = self._kind_codes[last]
+                if self._assignments is not None:
+                    self._assignments[row] = self._assignments[last]
+                if self._ivf_dirty is not None:
+                    self._ivf_dirty.add(row)
+                self._rows[moved_id] = row
+            self._ids.pop()
+            self._kinds.pop()
+            return True
+
+    def get_vector(self, doc_id: str) -> Optional[np.ndarray]:
+        """Normalized vector for doc_id"""
+        with self._lock:
+            row = self._rows.get(doc_id)
+            return None if row is None else self._matrix[row].copy()
+
+    def _grow(self, size: int, dim: int) -> None:
+        """Amortized doubling of the backing matrix"""
+        if self._matrix is None:
+            self._matrix = np.zeros((max(size, 1024), dim), dtype=np.float32)
+            self._kind_codes = np.zeros(self._matrix.shape[0], dtype=np.int16)
+            return
+        if size > self._matrix.shape[0]:
+            capacity = max(size, self._matrix.shape[0] * 2)
+            grown = np.zeros((capacity, dim), dtype=np.float32)
+            grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+            self._matrix = grown
+            codes = np.zeros(capacity, dtype=np.int16)
+            codes[:len(self._ids)] = self._kind_codes[:len(self._ids)]
+            self._kind_codes = codes
+            if self._assignments is not None:
+                assignments = np.zeros(capacity, dtype=np.int32)
+                assignments[:len(self._ids)] = self._assignments[:len(self._ids)]
+                self._assignments = assignments
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        kind: Optional[str] = None,
+        mode: SearchMode = "exact",
+        exclude: Optional[str] = None,
+    ) -> Tuple[List[Tuple[str, str, float]], SearchMode]:
+        """
+        Top-k (id, kind, score 0-100) most similar to query, and the mode that ran:
+        approximate falls back to exact below VECTOR_INDEX_IVF_MIN_SIZE and while
+        the first IVF build is still running
+        """
+        query = self._normalize(query)
+        with self._lock:
+            size = len(self._ids)
+            candidates = np.arange(size)
+            used: SearchMode = "exact"
+            if mode == "approximate" and size >= settings.VECTOR_INDEX_IVF_MIN_SIZE:
+                probed = self._ivf_candidates(query)
+                if probed is not None:
+                    candidates, used = probed, "approximate"
+            if size == 0 or k <= 0:
+                return [], used
+
+            if kind is not None:
+                if kind not in self._kind_ids:
+                    return [], used
+                candidates = candidates[self._kind_codes[candidates] == self._kind_ids[kind]]
+            if exclude is not None and exclude in self._rows:
+                candidates = candidates[candidates != self._rows[exclude]]
+            if candidates.size == 0:
+                return [], used
+
+            if candidates.size == size:
+                cosine = self._matrix[:size] @ query  # no filtering - skip the gather copy
+            else:
+                cosine = self._matrix[candidates] @ query
+            top = min(k, candidates.size)
+            best = np.argpartition(-cosine, top - 1)[:top]
+            best = best[np.argsort(-cosine[best])]
+            return [
+                (self._ids[candidates[i]], self._kinds[candidates[i]], float((cosine[i] + 1) / 2 * 100))
+                for i in best
+            ], used
+
+    def _nearest_centroid(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def _ivf_candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Rows in the nprobe clusters closest to query; None until the first IVF build finishes"""
+        size = len(self._ids)
+        if (self._centroids is None or size > 2 * self._ivf_built_size) and not self._ivf_building:
+            # k-means over the corpus takes seconds: never on the caller's (event loop) thread
+            self._ivf_building = True
+            threading.Thread(target=self._build_ivf_background, name="ivf-build", daemon=True).start()
+        if self._centroids is None:
+            return None
+        probes = np.argsort(-(self._centroids @ query))[:self._nprobe]
+        return np.nonzero(np.isin(self._assignments[:size], probes))[0]
+
+    def _build_ivf_background(self) -> None:
+        try:
+            self.build_ivf()
+        except Exception as e:
+            logger.error(f"IVF build failed: {e}")
+        finally:
+            self._ivf_building = False
+
+    def build_ivf(self, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0) -> None:
+        """
+        Cluster the corpus with spherical k-means (nlist defaults to √n). The index
+        lock is only held to snapshot the rows and to install the result, so
+        upserts and searches carry on meanwhile; rows written during the build
+        are re-assigned when it is installed.
+        """
+        with self._ivf_build_lock:
+            with self._lock:
+                size = len(self._ids)
+                if size == 0:
+                    return
+                data = self._matrix[:size]  # view: rows written meanwhile are in _ivf_dirty
+                self._ivf_dirty = set()
+
+            try:
+                nlist = min(nlist or max(1, int(np.sqrt(size))), size)
+                centroids = _spherical_kmeans(data, nlist, iterations, seed)
+                assignments = np.argmax(data @ centroids.T, axis=1).astype(np.int32)
+            except BaseException:
+                with self._lock:
+                    self._ivf_dirty = None
+                raise
+
+            with self._lock:
+                current = len(self._ids)
+                self._centroids = centroids
+                self._assignments = np.zeros(self._matrix.shape[0], dtype=np.int32)
+                kept = min(size, current)
+                self._assignments[:kept] = assignments[:kept]
+                stale = sorted({row for row in self._ivf_dirty if row < current} | set(range(size, current)))
+                if stale:
+                    self._assignments[stale] = self._nearest_centroid(self._matrix[stale])
+                self._ivf_dirty = None
+                self._ivf_built_size = size
+            logger.info(f"Built IVF index: {size} vectors in {nlist} lists")
+
+    def stats(self) -> Dict[str, object]:
+        """Return index statistics"""
+        with self._lock:
+            return {
+                "size": len(self._ids),
+                "dim": None if self._matrix is None else int(self._matrix.shape[1]),
+                "kinds": {kind: self._kinds.count(kind) for kind in set(self._kinds)},
+                "ivf_lists": None if self._centroids is None else int(self._centroids.shape[0]),
+                "ivf_building": self._ivf_building,
+                "nprobe": self._nprobe,
+            }
+
+
+def _cluster_sums(data: np.ndarray, assignments: np.ndarray, nlist: int, chunk: int = 16_384) -> np.ndarray:
+    """Sum of the rows in each cluster as one-hot × data products (bounded-size chunks)"""
+    sums = np.zeros((nlist, data.shape[1]), dtype=np.float32)
+    for start in range(0, len(data), chunk):
+        block = assignments[start:start + chunk]
+        onehot = np.zeros((nlist, len(block)), dtype=np.float32)
+        onehot[block, np.arange(len(block))] = 1.0
+        sums += onehot @ data[start:start + chunk]
+    return sums
+
+
+def _spherical_kmeans(data: np.ndarray, nlist: int, iterations: int, seed: int) -> np.ndarray:
+    """nlist unit-norm centroids for normalized rows; an empty cluster keeps its centroid"""
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(data @ centroids.T, axis=1)
+        sums = _cluster_sums(data, assignments, nlist)
+        norms = np.linalg.norm(sums, axis=1)
+        filled = norms > 0
+        centroids[filled] = sums[filled] / norms[filled, None]
+    return centroids
+
+
+# Global index instance
+_vector_index = VectorIndex(nprobe=settings.VECTOR_INDEX_NPROBE)
+
+
+def get_vector_index() -> VectorIndex:
+    """Get global vector index instance"""
+    return _vector_index
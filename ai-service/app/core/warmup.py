@@ -0,0 +1,140 @@
+"""
+Background warm-up and readiness
+Providers are built lazily; after startup this loads models and checks backends until ready
+"""
+
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+from app.config import settings
+from app.core.cpu_pool import get_cpu_pool
+from app.core.embedding_store import get_embedding_store
+from app.core.http import get_async_client, get_sync_session
+from app.core.metrics import component_ready, time_to_ready
+from app.core.profiles import get_profile_store
+from app.core.result_cache import get_experience_cache
+from app.core.scoring import ScoringEngine, extract_skills
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_http() -> None:
+    """Build the pooled HTTP clients (TLS context setup takes a few hundred ms)"""
+    get_async_client()
+    get_sync_session()
+
+
+def _warm_caches() -> None:
+    """Open the persistent embedding store, experience cache and profile store, run the skill matcher once"""
+    get_embedding_store()
+    get_experience_cache()
+    get_profile_store()
+    extract_skills("warm-up")
+
+
+def warm_up_steps(engine: ScoringEngine) -> Dict[str, Callable[[], None]]:
+    """Components to warm, by name"""
+    steps = {
+        "llm": engine.llm.warm_up,
+        "embeddings": engine.embeddings_service.warm_up,
+        "http": _warm_http,
+        "caches": _warm_caches,
+    }
+    pool = get_cpu_pool()
+    if pool is not None:
+        steps["cpu_pool"] = pool.warm_up
+    return steps
+
+
+class WarmUp:
+    """
+    Why background warm-up?
+    -----------------------
+    Building providers at startup imported the SDKs, loaded the local model and
+    probed Ollama before the app accepted a single connection - and aborted the
+    process if Ollama was briefly down, so containers flapped.
+
+    Startup now only reads configuration. This task warms every component in a
+    worker thread, retrying the failed ones every `retry_seconds` until all are
+    up. Requests arriving earlier still work (clients build on first use);
+    /health/ready turns 200 once everything is warm, /health/live only says the
+    process is serving.
+    """
+
+    def __init__(self, retry_seconds: float = 5.0):
+        self.retry_seconds = retry_seconds
+        self.started = time.monotonic()
+        self.ready_after: Optional[float] = None
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_after is not None
+
+    def start(self, steps: Dict[str, Callable[[], None]]) -> None:
+        """Begin warming in the background (returns immediately)"""
+        self.started = time.monotonic()
+        self.ready_after = None
+        self.components = {name: {"ready": False, "error": None} for name in steps}
+        for name in steps:
+            component_ready.labels(component=name).set(0)
+        self._task = asyncio.create_task(self._run(steps))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, steps: Dict[str, Callable[[], None]]) -> None:
+        pending = dict(steps)
+        while True:
+            names = list(pending)
+            outcomes = await asyncio.gather(
+                *(self._warm(name, pending[name]) for name in names)
+            )
+            for name, ok in zip(names, outcomes):
+                if ok:
+                    del pending[name]
+            if not pending:
+                break
+            logger.warning(f"Warm-up pending for {', '.join(pending)}; retrying in {self.retry_seconds}s")
+            await asyncio.sleep(self.retry_seconds)
+
+        self.ready_after = time.monotonic() - self.started
+        time_to_ready.set(self.ready_after)
+        logger.info(f"[OK] AI Service ready after {self.ready_after:.2f}s")
+
+    async def _warm(self, name: str, step: Callable[[], None]) -> bool:
+        start = time.monotonic()
+        try:
+            await asyncio.to_thread(step)
+        except Exception as e:
+            self.components[name] = {"ready": False, "error": str(e)}
+            logger.warning(f"Warm-up of {name} failed: {e}")
+            return False
+        self.components[name] = {"ready": True, "seconds": round(time.monotonic() - start, 3)}
+        component_ready.labels(component=name).set(1)
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness summary for /health/ready"""
+        return {
+            "ready": self.ready,
+            "uptime_seconds": round(time.monotonic() - self.started, 3),
+            "time_to_ready_seconds": None if self.ready_after is None else round(self.ready_after, 3),
+            "components": {name: dict(state) for name, state in self.components.items()},
+        }
+
+
+_warm_up = WarmUp(retry_seconds=settings.WARMUP_RETRY_SECONDS)
+
+
+def get_warm_up() -> WarmUp:
+    """Get global warm-up / readiness tracker"""
+    return _warm_up
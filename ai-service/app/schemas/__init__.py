@@ -1,4 +1,24 @@
 """Schemas package"""
-from .score import ScoreRequest, ScoreResponse, HealthResponse
+from .score import ScoreRequest, ScoreResponse, HealthResponse, ReadinessResponse
+from .profiles import ProfileRequest, ProfileResponse
+from .search import (
+    IndexDocumentRequest,
+    IndexDocumentResponse,
+    SearchRequest,
+    SearchHit,
+    SearchResponse,
+)
 
-__all__ = ["ScoreRequest", "ScoreResponse", "HealthResponse"]
+__all__ = [
+    "ScoreRequest",
+    "ScoreResponse",
+    "HealthResponse",
+    "ReadinessResponse",
+    "ProfileRequest",
+    "ProfileResponse",
+    "IndexDocumentRequest",
+    "IndexDocumentResponse",
+    "SearchRequest",
+    "SearchHit",
+    "SearchResponse",
+]
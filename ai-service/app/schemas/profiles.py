@@ -0,0 +1,40 @@
+"""
+Pydantic schemas for registered document profiles (scoring by id)
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+
+class ProfileRequest(BaseModel):
+    """Register (or update) a resume or job under the caller's id"""
+
+    id: str = Field(..., min_length=1, description="Caller's document id (e.g. resume or job id)")
+    kind: Literal["resume", "job"] = Field(..., description="Document type")
+    text: str = Field(..., min_length=1, description="Resume text or job description")
+    requirements: str = Field("", description="Additional job requirements (jobs only)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": "job-42",
+                "kind": "job",
+                "text": "Looking for experienced backend developer with Node.js...",
+                "requirements": "Node.js, PostgreSQL, Docker, AWS",
+            }
+        }
+
+
+class ProfileResponse(BaseModel):
+    """A registered profile's features"""
+
+    id: str
+    kind: str
+    content_hash: str
+    skills: List[str]
+    keywords: List[str]
+    embedding_model: str
+    registered_at: float
+    changed: Optional[bool] = Field(
+        None, description="On registration: False if the same content was already registered"
+    )
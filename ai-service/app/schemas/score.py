@@ -2,17 +2,29 @@
 Pydantic schemas for request/response validation
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Optional
 
 
 class ScoreRequest(BaseModel):
-    """Request model for scoring endpoint"""
+    """Request model for scoring endpoint (texts, or ids registered via /profiles)"""
 
-    resume_text: str = Field(..., min_length=1, description="Resume text content")
-    job_description: str = Field(..., min_length=1, description="Job description text")
+    resume_text: Optional[str] = Field(None, min_length=1, description="Resume text content")
+    resume_id: Optional[str] = Field(None, min_length=1, description="Registered resume profile id")
+    job_description: Optional[str] = Field(None, min_length=1, description="Job description text")
+    job_id: Optional[str] = Field(None, min_length=1, description="Registered job profile id")
     job_requirements: Optional[str] = Field(None, description="Additional job requirements")
 
+    @model_validator(mode="after")
+    def check_documents(self) -> "ScoreRequest":
+        if (self.resume_text is None) == (self.resume_id is None):
+            raise ValueError("Provide exactly one of resume_text or resume_id")
+        if (self.job_description is None) == (self.job_id is None):
+            raise ValueError("Provide exactly one of job_description or job_id")
+        if self.job_id is not None and self.job_requirements:
+            raise ValueError("job_requirements only apply to job_description (a job profile has its own)")
+        return self
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -50,3 +62,13 @@ class HealthResponse(BaseModel):
     status: str
     version: str
     service: str
+
+
+class ReadinessResponse(HealthResponse):
+    """Readiness probe response (503 while components are still warming up)"""
+
+    uptime_seconds: float
+    time_to_ready_seconds: Optional[float] = None
+    components: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict, description="Per-component state: ready, error, seconds"
+    )
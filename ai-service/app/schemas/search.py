@@ -0,0 +1,65 @@
+"""
+Pydantic schemas for the vector index and top-K search endpoints
+"""
+
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
+
+
+class IndexDocumentRequest(BaseModel):
+    """Add or replace a document in the vector index"""
+
+    id: str = Field(..., min_length=1, description="Caller's document id (e.g. resume or job id)")
+    text: str = Field(..., min_length=1, description="Document text to embed")
+    kind: Literal["resume", "job"] = Field("resume", description="Document type")
+
+
+class IndexDocumentResponse(BaseModel):
+    """Result of an index upsert"""
+
+    id: str
+    kind: str
+    indexed_documents: int
+
+
+class SearchRequest(BaseModel):
+    """Top-K similarity search by query text or by an indexed document id"""
+
+    query_text: Optional[str] = Field(None, min_length=1, description="Free text to search with")
+    query_id: Optional[str] = Field(None, description="Indexed document id to search with")
+    k: int = Field(10, ge=1, le=1000, description="Number of results")
+    kind: Optional[Literal["resume", "job"]] = Field(None, description="Only return this document type")
+    mode: Literal["exact", "approximate"] = Field("exact", description="Brute-force or IVF search")
+
+    @model_validator(mode="after")
+    def check_query(self) -> "SearchRequest":
+        if (self.query_text is None) == (self.query_id is None):
+            raise ValueError("Provide exactly one of query_text or query_id")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "query_id": "job-42",
+                "k": 20,
+                "kind": "resume",
+                "mode": "exact",
+            }
+        }
+
+
+class SearchHit(BaseModel):
+    """One search result"""
+
+    id: str
+    kind: str
+    score: float = Field(..., description="Semantic similarity 0-100")
+
+
+class SearchResponse(BaseModel):
+    """Search results, best first"""
+
+    results: List[SearchHit]
+    total_indexed: int
+    mode: str = Field(..., description="Mode that ran: approximate falls back to exact on small or unbuilt indexes")
+    took_ms: float
@@ -0,0 +1,34 @@
+"""
+Fit the IDF vector for hashed lexical embeddings (HASHED_EMBEDDING_IDF_PATH)
+
+Run from ai-service/:  python -m app.utils.fit_idf docs/*.txt --output data/idf.npy
+"""
+
+import argparse
+import numpy as np
+from app.config import settings
+from app.core.hashed_embeddings import HashedLexicalEncoder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("documents", nargs="+", help="Text files, one document each")
+    parser.add_argument("--output", required=True, help="Where to write the .npy IDF vector")
+    args = parser.parse_args()
+
+    texts = []
+    for path in args.documents:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            texts.append(f.read())
+    encoder = HashedLexicalEncoder(
+        settings.HASHED_EMBEDDING_DIM,
+        settings.HASHED_EMBEDDING_WORD_NGRAMS,
+        settings.HASHED_EMBEDDING_CHAR_MIN,
+        settings.HASHED_EMBEDDING_CHAR_MAX,
+    )
+    np.save(args.output, encoder.fit_idf(texts))
+    print(f"IDF over {len(texts)} documents written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Backend pool scaling: score_match throughput against 1, 2, 4 ... stub Ollama servers
+Each stub serves one generation at a time (like a single-GPU box), so throughput only
+grows if the pool spreads calls; --failing N makes N extra servers answer 503
+
+Run from ai-service/:
+  python -m benchmarks.backend_pool --servers 1 2 4 --pairs 120 --latency 0.02
+  python -m benchmarks.backend_pool --servers 2 --failing 1 --routing ewma
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from prometheus_client import REGISTRY
+
+from app.config import settings
+
+settings.EMBEDDING_PROVIDER = "hashed"
+settings.EMBEDDING_STORE_PATH = None
+settings.EXPERIENCE_CACHE_PATH = None
+settings.EXPERIENCE_MODE = "llm"  # every pair needs the LLM
+settings.CPU_POOL_WORKERS = 0
+settings.LLM_PROVIDER = "ollama"
+
+from app.core.embeddings import EmbeddingsService  # noqa: E402
+from app.core.llm_client import LLMClient  # noqa: E402
+from app.core.scoring import ScoringEngine  # noqa: E402
+from benchmarks.corpus import generate_corpus  # noqa: E402
+from benchmarks.suite import reset_caches, run_ops  # noqa: E402
+
+
+def start_stub(latency: float, failing: bool = False) -> ThreadingHTTPServer:
+    """Stub Ollama on a free localhost port; one /api/generate at a time"""
+    busy = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self._send(200, {"models": []})
+
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if failing:
+                self._send(503, {"error": "overloaded"})
+                return
+            with busy:
+                time.sleep(latency)
+            self._send(200, {"response": "Minor"})
+
+        def _send(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(servers: List[ThreadingHTTPServer], pairs: List, concurrency: int) -> Dict[str, Any]:
+    settings.OLLAMA_BASE_URL = ",".join(f"http://127.0.0.1:{s.server_address[1]}" for s in servers)
+    llm = LLMClient()
+    engine = ScoringEngine(llm=llm, embeddings_service=EmbeddingsService())
+    reset_caches()
+    result = await run_ops(
+        [lambda r=r, j=j: engine.score_match_async(r, j) for r, j in pairs], concurrency
+    )
+    result["endpoints"] = llm._pool.status()
+    return result
+
+
+def calls_to(url: str) -> float:
+    """LLM calls answered by one endpoint, from backend_requests_total"""
+    return sum(
+        REGISTRY.get_sample_value(
+            "backend_requests_total",
+            {"kind": "llm", "provider": "ollama", "endpoint": url, "outcome": outcome},
+        ) or 0
+        for outcome in ("ok", "error")
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--servers", type=int, nargs="+", default=[1, 2, 4], help="Healthy server counts to try")
+    parser.add_argument("--failing", type=int, default=0, help="Extra servers that always answer 503")
+    parser.add_argument("--pairs", type=int, default=120, help="Resume/job pairs per run")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds per generation on a stub")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent score_match calls")
+    parser.add_argument("--routing", choices=["least_outstanding", "ewma"], default=settings.BACKEND_ROUTING)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+    settings.BACKEND_ROUTING = args.routing
+    resumes, jobs = generate_corpus(args.pairs, 1)
+    pairs = [(resume, jobs[0]) for resume in resumes]
+
+    print(f"{'servers':>8} {'pairs/s':>9} {'p95 ms':>9}  calls per endpoint")
+    for count in args.servers:
+        servers = [start_stub(args.latency) for _ in range(count)]
+        servers += [start_stub(args.latency, failing=True) for _ in range(args.failing)]
+        result = asyncio.run(run(servers, pairs, args.concurrency))
+        calls = " ".join(
+            f"{calls_to(e['url']):.0f}{'' if e['healthy'] else ' (ejected)'}" for e in result["endpoints"]
+        )
+        print(f"{count:>8} {result['ops_per_sec']:>9.1f} {result['p95_ms']:>9.1f}  {calls}")
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
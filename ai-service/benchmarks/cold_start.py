@@ -0,0 +1,88 @@
+"""
+Cold start: fresh interpreter -> app startup -> first /score response -> /health/ready
+Spawned by benchmarks.suite; prints one JSON line of timings. Runs offline: hashed
+embeddings and a stub Ollama on localhost, caches and job store in a temp directory
+"""
+
+import time
+
+STARTED = time.perf_counter()
+
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import os  # noqa: E402
+import tempfile  # noqa: E402
+import threading  # noqa: E402
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # noqa: E402
+
+
+class _StubOllama(BaseHTTPRequestHandler):
+    """/api/tags for the readiness check, /api/generate answers every prompt with 'Minor'"""
+
+    def do_GET(self) -> None:
+        self._send({"models": []})
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send({"response": "Minor"})
+
+    def _send(self, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+async def measure() -> dict:
+    import httpx
+    import main
+    from benchmarks.corpus import generate_corpus
+
+    imported = time.perf_counter()
+    resumes, jobs = generate_corpus(1, 1)
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app):
+        started = time.perf_counter()
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.post("/score", json={"resume_text": resumes[0], "job_description": jobs[0]})
+            response.raise_for_status()
+            first_response = time.perf_counter()
+            first_response_at = time.time()
+            while (await client.get("/health/ready")).status_code != 200:
+                await asyncio.sleep(0.005)
+            ready = time.perf_counter()
+
+    return {
+        "import_ms": (imported - STARTED) * 1000,
+        "startup_ms": (started - STARTED) * 1000,
+        "first_response_ms": (first_response - STARTED) * 1000,
+        "ready_ms": (ready - STARTED) * 1000,
+        "first_response_at": first_response_at,
+    }
+
+
+def main() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    data_dir = tempfile.mkdtemp(prefix="cold-start-")
+    os.environ.update({
+        "DEBUG": "False",
+        "LLM_PROVIDER": "ollama",
+        "OLLAMA_BASE_URL": f"http://127.0.0.1:{server.server_address[1]}",
+        "EMBEDDING_PROVIDER": "hashed",
+        "EMBEDDING_STORE_PATH": os.path.join(data_dir, "embeddings"),
+        "EXPERIENCE_CACHE_PATH": os.path.join(data_dir, "experience.sqlite3"),
+        "BATCH_JOBS_DB_PATH": os.path.join(data_dir, "batch_jobs.sqlite3"),
+        "CPU_POOL_WORKERS": "0",
+    })
+    print(json.dumps(asyncio.run(measure())))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
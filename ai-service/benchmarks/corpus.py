@@ -0,0 +1,62 @@
+"""
+Seeded synthetic resume / job-description corpus
+Same seed -> same documents, so benchmark runs are comparable
+"""
+
+from typing import List, Tuple
+import random
+
+from app.core.scoring import SKILL_PATTERNS
+
+SKILLS = sorted({name for _, name in SKILL_PATTERNS})
+TITLES = ["Software Engineer", "Backend Developer", "Frontend Developer", "Data Engineer", "DevOps Engineer"]
+LEVELS = ["Junior", "", "Senior", "Lead", "Principal"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+FILLER = (
+    "designed built shipped maintained scalable reliable services teams customers platform "
+    "features performance latency migrations pipelines dashboards mentoring reviews on-call "
+    "stakeholders roadmap testing deployment observability incidents architecture"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(FILLER) for _ in range(words)).capitalize() + "."
+
+
+def generate_resume(rng: random.Random) -> str:
+    """One resume: title, (usually) stated years, skills, dated work history, filler prose"""
+    level = rng.choice(LEVELS)
+    years = rng.randint(0, 15)
+    skills = rng.sample(SKILLS, rng.randint(4, 14))
+    lines = [f"{level} {rng.choice(TITLES)}".strip()]
+    if rng.random() < 0.7:
+        lines.append(f"{years}+ years of experience with {', '.join(skills[:3])}.")
+    lines += [f"Skills: {', '.join(skills)}", "Experience:"]
+    end_year = 2025
+    for _ in range(rng.randint(1, 4)):
+        start_year = end_year - rng.randint(1, 4)
+        end = "Present" if end_year == 2025 else f"{rng.choice(MONTHS)} {end_year}"
+        lines.append(f"{rng.choice(COMPANIES)} - {rng.choice(MONTHS)} {start_year} - {end}")
+        lines.append(_sentence(rng, rng.randint(12, 30)))
+        end_year = start_year
+    lines.append(_sentence(rng, rng.randint(20, 60)))
+    return "\n".join(lines)
+
+
+def generate_job(rng: random.Random) -> str:
+    """One job description: level/title, (usually) required years, required skills, prose"""
+    level = rng.choice(LEVELS)
+    skills = rng.sample(SKILLS, rng.randint(3, 10))
+    required = f"{rng.randint(1, 10)}+ years of experience. " if rng.random() < 0.7 else ""
+    return "\n".join([
+        f"We are hiring a {level} {rng.choice(TITLES)}".replace("  ", " "),
+        f"Requirements: {required}Must know {', '.join(skills)}.",
+        _sentence(rng, rng.randint(20, 50)),
+    ])
+
+
+def generate_corpus(resumes: int, jobs: int, seed: int = 42) -> Tuple[List[str], List[str]]:
+    """(resumes, jobs) lists generated from one seed"""
+    rng = random.Random(seed)
+    return [generate_resume(rng) for _ in range(resumes)], [generate_job(rng) for _ in range(jobs)]
@@ -0,0 +1,94 @@
+"""
+In-process fake providers with configurable latency
+Stand-ins for LLMClient / EmbeddingsService so benchmarks need no Ollama or API key
+"""
+
+from typing import List
+import asyncio
+import hashlib
+import json
+import re
+import time
+import numpy as np
+
+from app.core.embeddings import EmbeddingsService
+from app.core.llm_client import LLMClient
+from app.core.scoring import EXPERIENCE_GAP_SCORES, ScoringEngine
+
+_VERDICTS = list(EXPERIENCE_GAP_SCORES)
+_PAIR_HEADER = re.compile(r"^Pair \d+$", re.MULTILINE)
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+class FakeLLMClient(LLMClient):
+    """Sleeps `latency` seconds per call and returns a verdict derived from the prompt"""
+
+    def __init__(self, latency: float = 0.0):
+        self.provider = "fake"
+        self.model = "fake-llm"
+        self.temperature = 0.0
+        self.max_tokens = 500
+        self.timeout = 30
+        self.latency = latency
+        self.calls = 0
+
+    def warm_up(self) -> None:
+        pass
+
+    def _respond(self, prompt: str) -> str:
+        self.calls += 1
+        blocks = _PAIR_HEADER.split(prompt)[1:]
+        if blocks:  # multi-pair prompt: JSON array, one verdict per pair
+            return json.dumps([_VERDICTS[_digest(block) % len(_VERDICTS)] for block in blocks])
+        return _VERDICTS[_digest(prompt) % len(_VERDICTS)]
+
+    def generate(self, prompt: str) -> str:
+        time.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def generate_async(self, prompt: str) -> str:
+        await asyncio.sleep(self.latency)
+        return self._respond(prompt)
+
+
+class FakeEmbeddingsService(EmbeddingsService):
+    """Sleeps `latency` seconds per provider call (single or batch); vectors are seeded by text"""
+
+    def __init__(self, latency: float = 0.0, dim: int = 384):
+        self.provider = "fake"
+        self.model = f"fake-{dim}"
+        self.client = None
+        self.persistent = False
+        self.latency = latency
+        self.dim = dim
+        self.calls = 0
+        self._init_batcher()
+
+    def _vector(self, text: str) -> np.ndarray:
+        return np.random.default_rng(_digest(text)).standard_normal(self.dim, dtype=np.float32)
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        return self._embed_batch([text])[0]
+
+    async def _embed_one_async(self, text: str) -> np.ndarray:
+        return (await self._embed_batch_async([text]))[0]
+
+    def _embed_batch(self, texts: List[str]) -> List[np.ndarray]:
+        self.calls += 1
+        time.sleep(self.latency)
+        return [self._vector(text) for text in texts]
+
+    async def _embed_batch_async(self, texts: List[str]) -> List[np.ndarray]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return [self._vector(text) for text in texts]
+
+
+def fake_engine(llm_latency: float = 0.0, embedding_latency: float = 0.0) -> ScoringEngine:
+    """ScoringEngine wired to the fake providers"""
+    return ScoringEngine(
+        llm=FakeLLMClient(llm_latency), embeddings_service=FakeEmbeddingsService(embedding_latency)
+    )
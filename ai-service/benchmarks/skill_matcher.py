@@ -0,0 +1,101 @@
+"""
+Micro-benchmark: per-document cost of skill extraction
+Compares the legacy per-pattern re.search loop against the compiled SkillMatcher
+at 65, 1,000 and 10,000 skills
+
+Run from ai-service/:  python -m benchmarks.skill_matcher
+"""
+
+from typing import Callable, List, Set, Tuple
+import argparse
+import random
+import re
+import string
+import time
+
+from app.core.scoring import SKILL_PATTERNS
+from app.core.skills import SkillMatcher
+
+TAXONOMY_SIZES = (65, 1_000, 10_000)
+
+
+def synthetic_taxonomy(size: int, seed: int = 42) -> List[Tuple[str, str]]:
+    """Real taxonomy padded with random word-anchored skills up to size entries"""
+    rng = random.Random(seed)
+    patterns = list(SKILL_PATTERNS)[:size]
+    seen = {name for _, name in patterns}
+    while len(patterns) < size:
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 12)))
+        if word in seen:
+            continue
+        seen.add(word)
+        if rng.random() < 0.2:
+            # Some multi-word / optional-suffix entries like the real taxonomy
+            patterns.append((rf"\b(?:{word}(?:\s*js)?|{word}\s+lang)\b", word))
+        else:
+            patterns.append((rf"\b(?:{word})\b", word))
+    return patterns
+
+
+def synthetic_document(patterns: List[Tuple[str, str]], chars: int = 4_000, seed: int = 7) -> str:
+    """Resume-sized text with filler words and a sprinkling of taxonomy skills"""
+    rng = random.Random(seed)
+    skills = [name for _, name in patterns]
+    words: List[str] = []
+    while sum(len(w) + 1 for w in words) < chars:
+        if rng.random() < 0.08:
+            words.append(rng.choice(skills))
+        else:
+            words.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))))
+    return " ".join(words)
+
+
+def legacy_extract(patterns: List[Tuple[str, str]]) -> Callable[[str], Set[str]]:
+    """The original extract_skills loop: one re.search per pattern"""
+    def extract(text: str) -> Set[str]:
+        text_lower = text.lower()
+        return {name for pattern, name in patterns if re.search(pattern, text_lower, re.IGNORECASE)}
+    return extract
+
+
+def time_per_doc(func: Callable[[str], Set[str]], text: str, min_seconds: float) -> float:
+    """Mean seconds per call, looping until min_seconds elapsed"""
+    func(text)  # warm-up (fills the re cache / compiles lazily)
+    runs, start = 0, time.perf_counter()
+    while True:
+        func(text)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chars", type=int, default=4_000, help="Document length in characters")
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="Timing budget per case")
+    args = parser.parse_args()
+
+    print(f"{'skills':>8} {'compile ms':>11} {'legacy µs/doc':>14} {'matcher µs/doc':>15} {'speedup':>8}")
+    for size in TAXONOMY_SIZES:
+        patterns = synthetic_taxonomy(size)
+        text = synthetic_document(patterns, chars=args.chars)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(patterns)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        legacy = legacy_extract(patterns)
+        if legacy(text) != matcher.extract(text):
+            raise AssertionError(f"Matcher diverges from legacy extraction at {size} skills")
+
+        legacy_us = time_per_doc(legacy, text, args.min_seconds) * 1e6
+        matcher_us = time_per_doc(matcher.extract, text, args.min_seconds) * 1e6
+        print(
+            f"{size:>8} {compile_ms:>11.1f} {legacy_us:>14.1f} "
+            f"{matcher_us:>15.1f} {legacy_us / matcher_us:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
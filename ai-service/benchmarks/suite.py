@@ -0,0 +1,322 @@
+"""
+Benchmark suite: skill extraction, score_match, score_batch, the HTTP endpoints and cold start
+Seeded synthetic corpus + in-process fake providers; results go to a JSON file that can
+be compared against a baseline recorded on the same machine (exit code 1 on regression)
+
+Run from ai-service/:
+  python -m benchmarks.suite --output benchmarks/baseline.json    # once, on this machine
+  python -m benchmarks.suite --baseline benchmarks/baseline.json
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+
+from app.config import settings
+
+# Benchmarks run in-process only: no disk tiers, no worker processes
+settings.EMBEDDING_STORE_PATH = None
+settings.EXPERIENCE_CACHE_PATH = None
+settings.PROFILE_STORE_PATH = None
+settings.CPU_POOL_WORKERS = 0
+
+from app.core.batch import BatchScoreRequest, score_batch  # noqa: E402
+from app.core.cache import get_cache  # noqa: E402
+from app.core.result_cache import get_experience_cache  # noqa: E402
+from app.core.score_cache import get_score_cache  # noqa: E402
+from app.core.scoring import (  # noqa: E402
+    ScoringEngine,
+    extract_skills,
+    parse_job_experience,
+    parse_resume_experience,
+)
+from benchmarks.corpus import generate_corpus  # noqa: E402
+from benchmarks.fakes import fake_engine  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None
+
+# Timings are only comparable between runs that agree on these (absolute numbers are machine-local)
+COMPARABLE_META = ("machine", "cpus", "python", "quick", "seed", "llm_latency", "embedding_latency", "experience_mode")
+
+BATCH_SIZES = ((1, 1), (10, 10), (100, 10), (500, 100))
+QUICK_BATCH_SIZES = ((1, 1), (10, 10), (100, 10))
+
+
+def peak_rss_mb(children: bool = False) -> Optional[float]:
+    """Peak resident set size of this process (or its largest child) so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def summarize(latencies: List[float], wall: float) -> Dict[str, Any]:
+    """ops/sec over wall time plus per-op latency percentiles (ms)"""
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": round(len(latencies) / wall, 2),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def reset_caches() -> None:
+    """Cold caches so every case pays for its own provider calls"""
+    get_cache().clear()
+    get_experience_cache().clear()
+    score_cache = get_score_cache()
+    if score_cache is not None:
+        score_cache.clear()
+    parse_resume_experience.cache_clear()
+    parse_job_experience.cache_clear()
+
+
+async def run_ops(ops: List[Callable[[], Awaitable[Any]]], concurrency: int = 1) -> Dict[str, Any]:
+    """Run async ops with bounded concurrency, timing each one"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def timed(op: Callable[[], Awaitable[Any]]) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await op()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(op) for op in ops))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def bench_extract_skills(documents: List[str], passes: int = 5) -> Dict[str, Any]:
+    latencies = []
+    start = time.perf_counter()
+    for document in documents * passes:
+        op_start = time.perf_counter()
+        extract_skills(document)
+        latencies.append(time.perf_counter() - op_start)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def bench_score_match(
+    engine: ScoringEngine, pairs: List[Tuple[str, str]], concurrency: int
+) -> Dict[str, Any]:
+    reset_caches()
+    return await run_ops(
+        [lambda r=r, j=j: engine.score_match_async(r, j) for r, j in pairs], concurrency
+    )
+
+
+async def bench_score_batch(
+    engine: ScoringEngine, resumes: List[str], jobs: List[str], repeats: int
+) -> Dict[str, Any]:
+    request = BatchScoreRequest(resumes=resumes, jobs=jobs)
+
+    async def once() -> None:
+        reset_caches()
+        await score_batch(engine, request)
+
+    result = await run_ops([once] * repeats)
+    result["pairs_per_sec"] = round(result["ops_per_sec"] * len(resumes) * len(jobs), 1)
+    return result
+
+
+async def bench_score_batch_profiles(
+    engine: ScoringEngine, resumes: List[str], jobs: List[str], repeats: int
+) -> Dict[str, Any]:
+    """score_batch by registered profile ids (registration itself is not timed)"""
+    for i, text in enumerate(resumes):
+        await engine.register_profile_async(f"resume-{i}", "resume", text)
+    for j, text in enumerate(jobs):
+        await engine.register_profile_async(f"job-{j}", "job", text)
+    request = BatchScoreRequest(
+        resume_ids=[f"resume-{i}" for i in range(len(resumes))],
+        job_ids=[f"job-{j}" for j in range(len(jobs))],
+    )
+
+    async def once() -> None:
+        reset_caches()
+        await score_batch(engine, request)
+
+    result = await run_ops([once] * repeats)
+    result["pairs_per_sec"] = round(result["ops_per_sec"] * len(resumes) * len(jobs), 1)
+    return result
+
+
+async def bench_http(engine: ScoringEngine, resumes: List[str], jobs: List[str], requests: int) -> Dict[str, Any]:
+    """/score (cold, then cached) and /batch-score through the real app via an in-process ASGI client"""
+    import httpx
+    from app.api import set_scoring_engine
+    from main import app
+
+    set_scoring_engine(engine)
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def post(path: str, payload: Dict[str, Any]) -> None:
+            response = await client.post(path, json=payload)
+            response.raise_for_status()
+
+        score_ops = [
+            lambda i=i: post("/score", {
+                "resume_text": resumes[i % len(resumes)], "job_description": jobs[i % len(jobs)]
+            })
+            for i in range(requests)
+        ]
+        reset_caches()
+        results["http_score"] = await run_ops(score_ops, concurrency=16)
+        # Same requests again: answered from the /score result cache
+        results["http_score_cached"] = await run_ops(score_ops, concurrency=16)
+
+        async def batch() -> None:
+            reset_caches()
+            await post("/batch-score", {"resumes": resumes[:10], "jobs": jobs[:10]})
+
+        results["http_batch_score_10x10"] = await run_ops([batch] * 5)
+    return results
+
+
+def bench_cold_start(runs: int) -> Dict[str, Any]:
+    """Fresh interpreter to first /score response (benchmarks.cold_start), per run"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    latencies, phases = [], []
+    start = time.perf_counter()
+    for _ in range(runs):
+        spawned = time.time()
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.cold_start"],
+            cwd=root, capture_output=True, text=True, check=True,
+        ).stdout
+        timings = json.loads(output.strip().splitlines()[-1])
+        latencies.append(timings.pop("first_response_at") - spawned)
+        phases.append(timings)
+    result = summarize(latencies, time.perf_counter() - start)
+    result["peak_rss_mb"] = peak_rss_mb(children=True)
+    for phase in ("import_ms", "startup_ms", "first_response_ms", "ready_ms"):
+        result[phase] = round(float(np.median([timings[phase] for timings in phases])), 1)
+    return result
+
+
+async def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    sizes = QUICK_BATCH_SIZES if args.quick else BATCH_SIZES
+    resumes, jobs = generate_corpus(max(m for m, _ in sizes), max(n for _, n in sizes), seed=args.seed)
+    engine = fake_engine(args.llm_latency, args.embedding_latency)
+    pairs = [(resumes[i % len(resumes)], jobs[i % len(jobs)]) for i in range(50 if args.quick else 200)]
+    results: Dict[str, Any] = {}
+
+    def selected(name: str) -> bool:
+        return not args.only or any(part in name for part in args.only)
+
+    def record(name: str, result: Dict[str, Any]) -> None:
+        results[name] = result
+        print(f"  {name:<28} {result['ops_per_sec']:>10.1f} ops/s  p95 {result['p95_ms']:>9.2f} ms", flush=True)
+
+    if selected("extract_skills"):
+        record("extract_skills", bench_extract_skills(resumes + jobs))
+    if selected("score_match"):
+        record("score_match", await bench_score_match(engine, pairs, concurrency=1))
+        record("score_match_concurrent_32", await bench_score_match(engine, pairs, concurrency=32))
+    for m, n in sizes:
+        name = f"score_batch_{m}x{n}"
+        if selected(name):
+            record(name, await bench_score_batch(engine, resumes[:m], jobs[:n], repeats=1 if m * n >= 10_000 else 3))
+    if selected("score_batch_profiles_100x10"):
+        record("score_batch_profiles_100x10", await bench_score_batch_profiles(engine, resumes[:100], jobs[:10], repeats=3))
+    if selected("http"):
+        for name, result in (await bench_http(engine, resumes, jobs, 50 if args.quick else 200)).items():
+            record(name, result)
+    if selected("cold_start"):
+        record("cold_start", bench_cold_start(3 if args.quick else 5))
+    return results
+
+
+def mismatched_meta(meta: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Run conditions in which the baseline differs from this run"""
+    base = baseline.get("meta", {})
+    return [f"{key}: {base.get(key)!r} -> {meta[key]!r}" for key in COMPARABLE_META if base.get(key) != meta[key]]
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Cases whose throughput dropped, or p95 rose, by more than tolerance"""
+    regressions = []
+    print(f"\n{'case':<28} {'ops/s':>10} {'baseline':>10} {'change':>8}")
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        change = result["ops_per_sec"] / base["ops_per_sec"] - 1
+        print(f"{name:<28} {result['ops_per_sec']:>10.1f} {base['ops_per_sec']:>10.1f} {change:>+7.0%}")
+        if change < -tolerance:
+            regressions.append(f"{name}: throughput {change:+.0%}")
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance) and result["p95_ms"] - base["p95_ms"] > 1:
+            regressions.append(f"{name}: p95 {base['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="benchmarks/results.json", help="Where to write results")
+    parser.add_argument("--baseline", help="Baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--quick", action="store_true", help="Skip the 500x100 batch and use fewer ops")
+    parser.add_argument("--only", nargs="*", help="Only cases whose name contains one of these")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus seed")
+    parser.add_argument("--llm-latency", type=float, default=0.02, help="Fake LLM seconds per call")
+    parser.add_argument("--embedding-latency", type=float, default=0.005, help="Fake embedding seconds per call")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    print(f"Running benchmarks (seed={args.seed}, llm={args.llm_latency}s, embedding={args.embedding_latency}s)")
+    results = asyncio.run(run_suite(args))
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.node(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "quick": args.quick,
+            "llm_latency": args.llm_latency,
+            "embedding_latency": args.embedding_latency,
+            "experience_mode": settings.EXPERIENCE_MODE,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        mismatched = mismatched_meta(report["meta"], baseline)
+        if mismatched:
+            print(
+                "\nBaseline was recorded under other conditions; record one here with "
+                f"--output {args.baseline}:\n  " + "\n  ".join(mismatched)
+            )
+            sys.exit(2)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
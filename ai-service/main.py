@@ -12,6 +12,10 @@ import logging
 import os
 from app.config import settings
 from app.core import ScoringEngine
+from app.core.batch_jobs import get_job_manager
+from app.core.cpu_pool import shutdown_cpu_pool
+from app.core.http import close_http_clients
+from app.core.warmup import get_warm_up, warm_up_steps
 from app.api import router, set_scoring_engine
 
 # Create logs directory if it doesn't exist
@@ -28,10 +32,12 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown"""
-    # Startup
+    # Startup - configuration only; models and backends warm up in the background
     try:
         scoring_engine = ScoringEngine()
         set_scoring_engine(scoring_engine)
+        get_warm_up().start(warm_up_steps(scoring_engine))
+        await get_job_manager().start(scoring_engine)
         logger.info("[OK] AI Service started successfully")
         logger.info(f"  LLM Provider: {settings.LLM_PROVIDER}")
         logger.info(f"  Embeddings Provider: {settings.EMBEDDING_PROVIDER}")
@@ -42,6 +48,10 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    await get_warm_up().stop()
+    await get_job_manager().stop()
+    await close_http_clients()
+    shutdown_cpu_pool()
     logger.info("AI Service shutting down")
 
 
@@ -80,6 +90,7 @@ async def root():
         "version": "1.0.0",
         "docs": "/docs",
         "health": "/health",
+        "ready": "/health/ready",
         "metrics": "/metrics",
     }
 
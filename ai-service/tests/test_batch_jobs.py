@@ -0,0 +1,80 @@
+"""
+Batch jobs shared by several workers: each process has its own BatchJobManager on the same SQLite file
+Run from ai-service/: python -m pytest tests
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.batch import BatchScoreItem, BatchScoreRequest
+from app.core.batch_jobs import BatchJobManager, BatchJobStore, LeaseLostError
+
+
+def _job(store: BatchJobStore) -> str:
+    return store.create(BatchScoreRequest(resumes=["python dev"], jobs=["python job"]))
+
+
+def test_only_one_worker_claims_a_queued_job(tmp_path):
+    db = str(tmp_path / "jobs.db")
+    first, second = BatchJobStore(db), BatchJobStore(db)
+    job_id = _job(first)
+
+    assert first.claim(job_id, "a", stale_before=time.time() - 60)
+    assert not second.claim(job_id, "b", stale_before=time.time() - 60)
+    assert second.claimable(time.time() - 60) == []
+
+
+def test_stale_claim_is_taken_over_and_old_owner_stops_writing(tmp_path):
+    db = str(tmp_path / "jobs.db")
+    first, second = BatchJobStore(db), BatchJobStore(db)
+    job_id = _job(first)
+    assert first.claim(job_id, "a", stale_before=time.time() - 60)
+
+    # "a" stopped heartbeating: with a lease that already ran out "b" may resume it
+    assert second.claimable(time.time() + 1) == [job_id]
+    assert second.claim(job_id, "b", stale_before=time.time() + 1)
+
+    item = BatchScoreItem(
+        resume_index=0, job_index=0, match_score=0.5, matched_skills=[], missing_skills=[], experience_gap="None"
+    )
+    with pytest.raises(LeaseLostError):
+        first.save_results(job_id, "a", [item])
+    assert not first.heartbeat(job_id, "a")
+    second.save_results(job_id, "b", [item])
+    assert second.completed_pairs(job_id) == {(0, 0)}
+
+
+def test_release_hands_running_jobs_back_to_the_queue(tmp_path):
+    store = BatchJobStore(str(tmp_path / "jobs.db"))
+    job_id = _job(store)
+    assert store.claim(job_id, "a", stale_before=time.time() - 60)
+
+    store.release("a")
+    assert store.get(job_id)["status"] == "queued"
+    assert store.claim(job_id, "b", stale_before=time.time() - 60)
+
+
+def test_sweep_resumes_a_job_whose_owner_died(tmp_path, monkeypatch):
+    from app.config import settings
+    from benchmarks.fakes import fake_engine
+
+    for name in ("EXPERIENCE_CACHE_PATH", "EMBEDDING_STORE_PATH"):
+        monkeypatch.setattr(settings, name, None)
+    store = BatchJobStore(str(tmp_path / "jobs.db"))
+    manager = BatchJobManager(store, workers=1, lease_seconds=0.2)
+
+    async def main():
+        await manager.start(fake_engine())
+        job_id = _job(store)
+        assert store.claim(job_id, "dead", stale_before=time.time() - 60)  # claimed, then never heartbeats
+        for _ in range(50):
+            await asyncio.sleep(0.05)
+            if (await manager.status(job_id)).status == "completed":
+                break
+        await manager.stop()
+        return await manager.status(job_id)
+
+    status = asyncio.run(main())
+    assert status.status == "completed" and status.completed == 1
@@ -0,0 +1,43 @@
+"""
+Embedding store shared by several workers: each process has its own _MatrixFile on the same files
+Run from ai-service/: python -m pytest tests
+"""
+
+import hashlib
+
+import numpy as np
+
+from app.core.embedding_store import _MatrixFile
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode()).digest()
+
+
+def test_worker_opened_before_the_first_write_sees_other_workers_rows(tmp_path):
+    reader = _MatrixFile(str(tmp_path), "hashed:test")  # no files yet, dim unknown
+    writer = _MatrixFile(str(tmp_path), "hashed:test")
+    assert reader.dim is None and reader.get(_digest("a")) is None
+
+    first = np.arange(4, dtype=np.float32)
+    assert writer.put(_digest("a"), first)
+    np.testing.assert_array_equal(reader.get(_digest("a")), first)
+    assert reader.dim == 4
+
+    second = np.full(4, 7.0, dtype=np.float32)
+    writer.put(_digest("b"), second)
+    np.testing.assert_array_equal(reader.get(_digest("b")), second)
+    np.testing.assert_array_equal(reader.get(_digest("a")), first)
+    assert len(reader) == 2
+
+
+def test_both_workers_append_to_the_same_store(tmp_path):
+    one = _MatrixFile(str(tmp_path), "hashed:test")
+    two = _MatrixFile(str(tmp_path), "hashed:test")
+    one.put(_digest("a"), np.ones(3, dtype=np.float32))
+    assert not two.put(_digest("a"), np.ones(3, dtype=np.float32))  # already stored by the other
+    two.put(_digest("b"), np.zeros(3, dtype=np.float32))
+
+    reopened = _MatrixFile(str(tmp_path), "hashed:test")
+    assert len(reopened) == 2
+    np.testing.assert_array_equal(one.get(_digest("b")), np.zeros(3, dtype=np.float32))
@@ -0,0 +1,79 @@
+"""
+Embeddings service: clients built once, cache accounting of store hits, store writes off the loop
+Run from ai-service/: python -m pytest tests
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.core.embeddings import EmbeddingsService
+
+
+def test_concurrent_first_use_loads_the_local_model_once(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_PROVIDER", "local")
+    loads = []
+
+    def load_model(self):
+        loads.append(threading.get_ident())
+        time.sleep(0.1)  # model load: long enough for the other thread to arrive
+        return object()
+
+    monkeypatch.setattr(EmbeddingsService, "_create_client", load_model)
+    service = EmbeddingsService()
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(service.client)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert all(client is clients[0] for client in clients)
+
+
+def test_store_hit_counts_as_one_cache_miss(tmp_path, monkeypatch):
+    from app.core import embedding_store
+    from app.core.cache import get_cache
+    from benchmarks.fakes import FakeEmbeddingsService
+
+    monkeypatch.setattr(settings, "EMBEDDING_STORE_PATH", str(tmp_path))
+    monkeypatch.setattr(embedding_store, "_embedding_store", None)
+    service = FakeEmbeddingsService()
+    service.persistent = True
+    vector = np.arange(4, dtype=np.float32)
+    embedding_store.get_embedding_store().put("stored text", service.model_key, vector)
+
+    before = get_cache().stats()
+    np.testing.assert_array_equal(service._lookup("stored text"), vector)
+    after = get_cache().stats()
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (0, 1)
+
+
+def test_async_paths_write_the_store_off_the_event_loop(tmp_path, monkeypatch):
+    import asyncio
+    from app.core import embedding_store
+    from benchmarks.fakes import FakeEmbeddingsService
+
+    monkeypatch.setattr(settings, "EMBEDDING_STORE_PATH", str(tmp_path))
+    monkeypatch.setattr(embedding_store, "_embedding_store", None)
+    writers = []
+    put = embedding_store.EmbeddingStore.put
+    monkeypatch.setattr(
+        embedding_store.EmbeddingStore,
+        "put",
+        lambda self, *args: (writers.append(threading.get_ident()), put(self, *args))[1],
+    )
+    service = FakeEmbeddingsService()
+    service.persistent = True
+
+    async def main():
+        await service.get_embedding_async("one text")
+        await service.get_embeddings_async(["two", "three"])
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(main())
+    assert len(writers) == 3 and loop_thread not in writers
+    assert embedding_store.get_embedding_store().get("three", service.model_key) is not None
@@ -0,0 +1,67 @@
+"""
+Micro-batcher: a lone caller is not delayed by the window, concurrent callers still share a call
+Run from ai-service/: python -m pytest tests
+"""
+
+import asyncio
+import threading
+import time
+
+from app.core.microbatch import MicroBatcher
+
+
+def _batcher(calls, delay: float = 0.0) -> MicroBatcher:
+    def fn(items):
+        calls.append(list(items))
+        time.sleep(delay)
+        return [item * 2 for item in items]
+
+    async def fn_async(items):
+        calls.append(list(items))
+        await asyncio.sleep(delay)
+        return [item * 2 for item in items]
+
+    return MicroBatcher("test", fn, fn_async, window=1.0, max_size=32)
+
+
+def test_lone_caller_skips_the_window():
+    calls = []
+    batcher = _batcher(calls)
+    start = time.monotonic()
+    assert batcher.submit(1) == 2
+    assert asyncio.run(batcher.submit_async(2)) == 4
+    assert time.monotonic() - start < 0.5
+    assert calls == [[1], [2]]
+
+
+def test_callers_arriving_during_a_call_share_the_next_one():
+    calls = []
+    batcher = _batcher(calls, delay=0.2)
+    results = {}
+
+    def call(item):
+        results[item] = batcher.submit(item)
+
+    first = threading.Thread(target=call, args=(0,))
+    first.start()
+    time.sleep(0.05)  # first call in flight: the next batch waits for company
+    others = [threading.Thread(target=call, args=(i,)) for i in range(1, 5)]
+    for thread in others:
+        thread.start()
+    for thread in [first] + others:
+        thread.join()
+
+    assert results == {i: i * 2 for i in range(5)}
+    assert calls[0] == [0] and sorted(calls[1]) == [1, 2, 3, 4]
+
+
+def test_async_callers_started_together_share_a_call():
+    calls = []
+    batcher = _batcher(calls)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit_async(i) for i in range(5)))
+
+    start = time.monotonic()
+    assert asyncio.run(main()) == [0, 2, 4, 6, 8]
+    assert calls == [[0, 1, 2, 3, 4]] and time.monotonic() - start < 0.5
@@ -0,0 +1,54 @@
+"""
+Profile store shared by several workers: each process has its own ProfileStore on the same SQLite file
+Run from ai-service/: python -m pytest tests
+"""
+
+import numpy as np
+import pytest
+
+from app.core.profiles import DocumentProfile, ProfileNotFoundError, ProfileStore
+
+
+def _profile(doc_id: str, text: str, kind: str = "resume") -> DocumentProfile:
+    return DocumentProfile(
+        id=doc_id,
+        kind=kind,
+        text=text,
+        requirements="",
+        skills=frozenset({"python"}),
+        keywords=frozenset(),
+        embedding=np.ones(4, dtype=np.float32),
+        embedding_model="hashed:test",
+        content_hash=text,
+        registered_at=0.0,
+    )
+
+
+def test_update_and_delete_by_another_worker_are_seen(tmp_path):
+    db = str(tmp_path / "profiles.db")
+    first, second = ProfileStore(db), ProfileStore(db)
+    first.put(_profile("r1", "old"))
+    assert second.get("r1").text == "old"  # now in second's memory tier
+
+    first.put(_profile("r1", "new"))
+    assert second.get("r1").text == "new"
+    assert second.get_many(["r1", "r1"], "resume")[1].text == "new"
+
+    assert first.remove("r1")
+    assert second.get("r1") is None
+    with pytest.raises(ProfileNotFoundError):
+        second.get_many(["r1"], "resume")
+    assert not second.remove("r1")
+
+
+def test_memory_tier_is_bounded(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles.db"), max_entries=2)
+    for i in range(5):
+        store.put(_profile(f"r{i}", f"text {i}"))
+    assert store.stats()["loaded"] == 2 and store.stats()["stored"] == 5
+    assert [p.text for p in store.get_many(["r0", "r4"], "resume")] == ["text 0", "text 4"]
+
+    memory_only = ProfileStore(max_entries=2)
+    for i in range(3):
+        memory_only.put(_profile(f"r{i}", f"text {i}"))
+    assert memory_only.get("r0") is None and memory_only.get("r2").text == "text 2"
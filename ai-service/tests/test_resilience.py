@@ -0,0 +1,100 @@
+"""
+Resilience layer: cancelled calls must not wedge the circuit breaker or leak hedged calls
+Run from ai-service/: python -m pytest tests
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.resilience import CircuitBreaker, CircuitOpenError, Resilience
+
+
+def _half_open(policy: Resilience) -> None:
+    """Trip the breaker with one failure and wait until it lets a trial through"""
+    async def down() -> None:
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(policy.call_async(down))
+    assert policy.breaker.state == CircuitBreaker.OPEN
+    time.sleep(policy.breaker.reset_seconds)
+
+
+def test_cancelled_half_open_trial_lets_the_next_call_through():
+    policy = Resilience("test", "trial", circuit_failures=1, circuit_reset_seconds=0.02)
+    _half_open(policy)
+
+    async def scenario() -> str:
+        async def hang() -> None:
+            await asyncio.sleep(10)
+
+        trial = asyncio.ensure_future(policy.call_async(hang))
+        await asyncio.sleep(0.01)
+        assert policy.breaker.state == CircuitBreaker.HALF_OPEN
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        async def up() -> str:
+            return "ok"
+
+        return await policy.call_async(up)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_trial_cancelled_while_queued_on_the_limiter():
+    policy = Resilience("test", "queued", max_concurrency=1, circuit_failures=1, circuit_reset_seconds=0.02)
+    _half_open(policy)
+
+    async def scenario() -> None:
+        policy.limiter.try_acquire()  # the only slot is busy
+        trial = asyncio.ensure_future(policy.call_async(asyncio.sleep, 0))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        policy.limiter.release()
+        await policy.call_async(asyncio.sleep, 0)
+
+    asyncio.run(scenario())
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_other_calls_are_rejected_while_the_trial_runs():
+    policy = Resilience("test", "busy", circuit_failures=1, circuit_reset_seconds=0.02)
+    _half_open(policy)
+
+    async def scenario() -> None:
+        trial = asyncio.ensure_future(policy.call_async(asyncio.sleep, 0.05))
+        await asyncio.sleep(0.01)
+        with pytest.raises(CircuitOpenError):
+            await policy.call_async(asyncio.sleep, 0)
+        await trial
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_the_caller_during_the_hedge_delay_cancels_the_primary():
+    policy = Resilience("test", "hedge", hedge_quantile=0.5, min_hedge_samples=1)
+    policy._latencies.append(0.05)
+    started = []
+
+    async def slow() -> None:
+        task = asyncio.current_task()
+        started.append(task)
+        await asyncio.sleep(10)
+
+    async def scenario() -> None:
+        caller = asyncio.ensure_future(policy.call_async(slow))
+        await asyncio.sleep(0.01)  # inside the hedge delay
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        assert started and started[0].cancelled()
+
+    asyncio.run(scenario())
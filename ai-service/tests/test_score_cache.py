@@ -0,0 +1,35 @@
+"""
+/score result cache: a cached result must be the one the request's own text would get
+Run from ai-service/: python -m pytest tests
+"""
+
+import asyncio
+import json
+
+from app.config import settings
+
+
+def test_whitespace_variants_share_a_result_that_matches_scoring_them(monkeypatch):
+    for name in ("EXPERIENCE_CACHE_PATH", "EMBEDDING_STORE_PATH", "SCORE_CACHE_PATH"):
+        monkeypatch.setattr(settings, name, None)
+    from app.api import set_scoring_engine
+    from app.api.routes import score_match
+    from app.core.score_cache import normalize_text
+    from app.schemas import ScoreRequest
+    from benchmarks.fakes import fake_engine
+
+    engine = fake_engine()
+    set_scoring_engine(engine)
+    clean = {"resume_text": "Senior Python dev\n5 years Docker", "job_description": "Need Python, 3+ years"}
+    messy = {**clean, "resume_text": "  Senior Python dev  \r\n5 years Docker\t\r\n"}
+    assert normalize_text(messy["resume_text"]) == clean["resume_text"]
+
+    async def score(body, cache_control=None):
+        response = await score_match(ScoreRequest(**body), None, cache_control)
+        return response.headers["x-cache"], json.loads(response.body)
+
+    _, fresh = asyncio.run(score(messy, "no-cache"))
+    cached, hit = asyncio.run(score(clean))
+    assert cached == "HIT" and hit == fresh
+    direct = asyncio.run(engine.score_match_async(clean["resume_text"], clean["job_description"]))
+    assert fresh["match_score"] == direct["match_score"]
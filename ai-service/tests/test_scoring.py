@@ -0,0 +1,67 @@
+"""
+ScoringEngine against the fake providers in benchmarks/fakes.py
+Run from ai-service/: python -m pytest tests
+"""
+
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.config import settings
+from benchmarks.fakes import fake_engine
+
+RESUME = "Senior Python developer, 6 years of experience with Docker and AWS"
+JOB = "Backend engineer: Python, Kubernetes, 3+ years of experience"
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    for name in ("EXPERIENCE_CACHE_PATH", "EMBEDDING_STORE_PATH"):
+        monkeypatch.setattr(settings, name, None)
+    return fake_engine()
+
+
+def _llm_stage_count(engine) -> float:
+    labels = {"stage": "llm", "provider": engine.llm.provider, "model": engine.llm.model}
+    return REGISTRY.get_sample_value("scoring_stage_latency_seconds_count", labels) or 0.0
+
+
+def test_llm_stage_times_only_pairs_that_reach_the_llm(engine, monkeypatch):
+    monkeypatch.setattr(settings, "EXPERIENCE_MODE", "heuristic")
+    before = _llm_stage_count(engine)
+    engine.score_match(RESUME, JOB)
+    asyncio.run(engine.score_match_async(RESUME, JOB))
+    assert _llm_stage_count(engine) == before and engine.llm.calls == 0
+
+    monkeypatch.setattr(settings, "EXPERIENCE_MODE", "llm")
+    asyncio.run(engine.score_match_async(RESUME, JOB))
+    assert _llm_stage_count(engine) == before + 1 and engine.llm.calls == 1
+
+
+def test_rank_counts_only_pairs_sent_to_the_llm(engine, monkeypatch):
+    from benchmarks.corpus import generate_corpus
+
+    resumes, jobs = generate_corpus(40, 1, seed=7)
+    monkeypatch.setattr(settings, "EXPERIENCE_MODE", "llm")
+    first = asyncio.run(engine.rank_candidates_async(resumes, jobs[0], top_n=5))
+    assert first["llm_calls"] > 0 and first["cached_verdicts"] == first["heuristic_verdicts"] == 0
+
+    again = asyncio.run(engine.rank_candidates_async(resumes, jobs[0], top_n=5))
+    assert again["llm_calls"] == 0 and again["cached_verdicts"] == first["llm_calls"]
+
+    monkeypatch.setattr(settings, "EXPERIENCE_MODE", "heuristic")
+    parsed = asyncio.run(engine.rank_candidates_async(resumes, jobs[0], top_n=5))
+    assert parsed["llm_calls"] == 0 and parsed["heuristic_verdicts"] > 0
+
+
+def test_batch_scores_match_single_pair_scores(engine, monkeypatch):
+    from benchmarks.corpus import generate_corpus
+
+    monkeypatch.setattr(settings, "EXPERIENCE_MODE", "heuristic")
+    resumes, jobs = generate_corpus(60, 8, seed=11)
+    matrix = asyncio.run(engine.score_matrix_async(resumes, jobs))
+    for r, resume in enumerate(resumes):
+        for j, job in enumerate(jobs):
+            single = asyncio.run(engine.score_match_async(resume, job))
+            assert matrix[r][j]["match_score"] == single["match_score"], (r, j)
@@ -0,0 +1,43 @@
+"""
+Vector index: approximate search reports the mode that ran and never builds IVF on the caller
+Run from ai-service/: python -m pytest tests
+"""
+
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.core.vector_index import VectorIndex
+
+
+def _index(size: int) -> VectorIndex:
+    rng = np.random.default_rng(0)
+    index = VectorIndex(nprobe=4)
+    for i, vector in enumerate(rng.standard_normal((size, 16), dtype=np.float32)):
+        index.upsert(f"d{i}", vector)
+    return index
+
+
+def test_small_index_answers_approximate_requests_exactly():
+    index = _index(10)
+    hits, mode = index.search(index.get_vector("d3"), k=1, mode="approximate")
+    assert mode == "exact" and hits[0][0] == "d3"
+
+
+def test_ivf_is_built_in_the_background(monkeypatch):
+    monkeypatch.setattr(settings, "VECTOR_INDEX_IVF_MIN_SIZE", 100)
+    index = _index(400)
+    query = index.get_vector("d3")
+
+    _, mode = index.search(query, k=1, mode="approximate")
+    assert mode == "exact"  # first request: build started, exact answer meanwhile
+
+    index.upsert("late", query)  # written while the build may still run
+    deadline = time.monotonic() + 10
+    while index.stats()["ivf_building"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    hits, mode = index.search(query, k=2, mode="approximate")
+    assert mode == "approximate"
+    assert {doc_id for doc_id, _, _ in hits} == {"d3", "late"}